@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+design_cache.py
+
+Cache for filter design results: A filter design method like ``Ellip.BSmin``
+only depends on a small subset of the entries in the filter dict. The keys that
+are read by a design method are recorded the first time the method is called,
+subsequent calls are looked up in a cache using a hash over the design class,
+the method and the values of the recorded keys. On a cache hit, the results
+written by the design method ('ba', 'zpk', 'sos' and e.g. the updated 'N',
+'W_PB' or 'F_C' for minimum order designs) are copied to the filter dict
+without running the design routine again.
+
+The results are stored in memory with a least-recently-used (LRU) strategy. When
+a cache directory is specified, the results are also pickled to disk so that
+the cache survives a restart of the program.
+
+The cache may be shared between the GUI thread and the design thread
+(``design_worker.DesignWorker``), its entries are protected by a lock. The
+design routines themselves run without holding the lock.
+
+Author: Christian Muenker
+"""
+
+from __future__ import division, unicode_literals, print_function, absolute_import
+import os
+import copy
+import time
+import hashlib
+import pickle
+import numbers
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_MISSING = '<missing>' # token for keys that are not in the filter dict
+
+#------------------------------------------------------------------------------
+def _update_hash(h, obj):
+    """
+    Feed a canonical byte representation of ``obj`` into the hash object ``h``.
+    Dicts are sorted by key, numpy arrays are hashed with dtype, shape and data.
+    """
+    if isinstance(obj, dict):
+        h.update(b'{')
+        for k in sorted(obj, key=str):
+            _update_hash(h, k)
+            h.update(b':')
+            _update_hash(h, obj[k])
+        h.update(b'}')
+    elif isinstance(obj, (list, tuple)):
+        h.update(b'[')
+        for x in obj:
+            _update_hash(h, x)
+            h.update(b',')
+        h.update(b']')
+    elif isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            _update_hash(h, obj.tolist())
+        else:
+            h.update("nd{0}{1}".format(obj.dtype.str, obj.shape).encode('utf-8'))
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (bool, np.bool_)):
+        h.update(b'b1' if obj else b'b0')
+    elif isinstance(obj, numbers.Integral):
+        h.update("i{0}".format(int(obj)).encode('utf-8'))
+    elif isinstance(obj, numbers.Real):
+        h.update("f{0!r}".format(float(obj)).encode('utf-8'))
+    elif isinstance(obj, numbers.Complex):
+        h.update("c{0!r}".format(complex(obj)).encode('utf-8'))
+    elif isinstance(obj, bytes):
+        h.update(b's' + obj)
+    elif hasattr(obj, 'encode'): # text
+        h.update(b's' + obj.encode('utf-8'))
+    elif obj is None:
+        h.update(b'n')
+    else:
+        h.update("o{0!r}".format(obj).encode('utf-8'))
+
+def canonical_hash(obj):
+    """
+    Return a hex digest of ``obj`` that only depends on its content, i.e.
+    equal dicts give the same hash independent of the order of their keys.
+    """
+    h = hashlib.sha1()
+    _update_hash(h, obj)
+    return h.hexdigest()
+
+#------------------------------------------------------------------------------
+class _RecordingDict(dict):
+    """
+    Deep copy of a filter dict that records the keys read and written by a
+    filter design method. Missing keys are created with the default factory
+    of the original dict (if there is one), just like with ``defaultdict``.
+    """
+    def __init__(self, fil_dict):
+        # entries that have not been calculated yet (lazy format conversions
+        # in fb.fil[0]) are results of the previous design, they are not copied
+        pending = fil_dict.pending_keys() if hasattr(fil_dict, 'pending_keys') else ()
+        dict.__init__(self, copy.deepcopy(
+            dict((k, fil_dict[k]) for k in fil_dict if k not in pending)))
+        self.default_factory = getattr(fil_dict, 'default_factory', None)
+        self.keys_read = set()
+        self.keys_written = set()
+
+    def __missing__(self, key):
+        if self.default_factory is None:
+            raise KeyError(key)
+        value = self.default_factory()
+        dict.__setitem__(self, key, value)
+        self.keys_written.add(key)
+        return value
+
+    def _read(self, key):
+        # keys read after they have been written don't depend on the input
+        if key not in self.keys_written:
+            self.keys_read.add(key)
+
+    def __getitem__(self, key):
+        self._read(key)
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        self._read(key)
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        self._read(key)
+        return dict.get(self, key, default)
+
+    def __setitem__(self, key, value):
+        self.keys_written.add(key)
+        dict.__setitem__(self, key, value)
+
+    def update(self, *args, **kwargs):
+        d = dict(*args, **kwargs)
+        self.keys_written.update(d)
+        dict.update(self, d)
+
+    def setdefault(self, key, default=None):
+        self._read(key)
+        if not dict.__contains__(self, key):
+            self.keys_written.add(key)
+        return dict.setdefault(self, key, default)
+
+#------------------------------------------------------------------------------
+class DesignCache(object):
+    """
+    LRU cache for the results of filter design methods.
+
+    Parameters
+    ----------
+
+    size : int (optional, default: 64)
+        Max. number of designs kept in memory. With ``size = 0``, the cache is
+        disabled.
+
+    cache_dir : string (optional, default: None)
+        Directory for the on-disk tier of the cache. When None, results are
+        only kept in memory.
+
+    Example
+    -------
+
+    >>> cache = DesignCache(size=32)
+    >>> cache.call(fil_inst, 'LPmin', fil_dict) # instead of fil_inst.LPmin(fil_dict)
+    """
+    def __init__(self, size=64, cache_dir=None):
+        self.size = int(size)
+        self.cache_dir = cache_dir
+        self.entries = OrderedDict() # {hash: {key: value} of design results}
+        # keys of the filter dict read by each design method {method_id: set}
+        self.keys_used = {}
+        self.hits = self.misses = 0
+        self.lock = threading.RLock() # lookup() calls _store()
+
+        if self.cache_dir:
+            try:
+                if not os.path.isdir(self.cache_dir):
+                    os.makedirs(self.cache_dir)
+                with open(self._index_file(), 'rb') as f:
+                    self.keys_used = pickle.load(f)
+            except (IOError, OSError, EOFError, pickle.UnpicklingError) as e:
+                logger.debug("No design cache index loaded from '%s': %s",
+                             self.cache_dir, e)
+
+#------------------------------------------------------------------------------
+    def _index_file(self):
+        return os.path.join(self.cache_dir, "keys_used.pkl")
+
+    def _entry_file(self, key):
+        return os.path.join(self.cache_dir, key + ".pkl")
+
+    def _method_id(self, fil_inst, method):
+        """
+        Identify the design method by module, version, class and method name,
+        a new version of the design module invalidates the old results.
+        """
+        mod = fil_inst.__class__.__module__
+        return "{0}:{1}:{2}.{3}".format(mod,
+                    getattr(__import__(mod, fromlist=['']), '__version__', ''),
+                    type(fil_inst).__name__, method)
+
+    def _key(self, method_id, fil_dict):
+        """ Hash over method and the values of all keys used by the method """
+        keys = sorted(self.keys_used[method_id], key=str)
+        # don't use fil_dict[k] for missing keys to keep defaultdicts unchanged
+        vals = [fil_dict[k] if k in fil_dict else _MISSING for k in keys]
+        return canonical_hash([method_id, keys, vals])
+
+#------------------------------------------------------------------------------
+    def clear(self):
+        """ Clear the memory tier of the cache (the disk tier is kept) """
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+    def lookup(self, key):
+        """ Return cached results for ``key`` or None, the entry becomes the newest one """
+        with self.lock:
+            if key in self.entries:
+                results = self.entries.pop(key)
+                self.entries[key] = results # move to the end = newest entry
+                return results
+            if self.cache_dir:
+                try:
+                    with open(self._entry_file(key), 'rb') as f:
+                        results = pickle.load(f)
+                    self._store(key, results, disk=False)
+                    return results
+                except (IOError, OSError, EOFError, pickle.UnpicklingError):
+                    pass
+            return None
+
+    def _store(self, key, results, disk=True):
+        with self.lock:
+            self.entries[key] = results
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False) # remove oldest entry
+        if disk and self.cache_dir:
+            try:
+                with open(self._entry_file(key), 'wb') as f:
+                    pickle.dump(results, f, pickle.HIGHEST_PROTOCOL)
+            except (IOError, OSError, pickle.PicklingError) as e:
+                logger.warning("Could not write design cache entry:\n%s", e)
+
+    def _store_keys_used(self):
+        if self.cache_dir:
+            try:
+                with open(self._index_file(), 'wb') as f:
+                    pickle.dump(self.keys_used, f, pickle.HIGHEST_PROTOCOL)
+            except (IOError, OSError, pickle.PicklingError) as e:
+                logger.warning("Could not write design cache index:\n%s", e)
+
+#------------------------------------------------------------------------------
+    def call(self, fil_inst, method, fil_dict):
+        """
+        Call ``getattr(fil_inst, method)(fil_dict)`` or copy the results from
+        the cache when the method has been called before with the same values
+        for all the keys of ``fil_dict`` that it reads.
+
+        Returns
+        -------
+
+        hit : bool
+            True when the results have been copied from the cache
+        """
+        if self.size <= 0:
+            getattr(fil_inst, method)(fil_dict)
+            return False
+
+        method_id = self._method_id(fil_inst, method)
+        with self.lock:
+            if method_id in self.keys_used:
+                key = self._key(method_id, fil_dict)
+                results = self.lookup(key)
+                if results is not None:
+                    for k in results:
+                        fil_dict[k] = copy.deepcopy(results[k])
+                    fil_dict['time_designed'] = time.time()
+                    self.hits += 1
+                    logger.debug("Design cache hit for %s", method_id)
+                    return True
+            self.misses += 1
+
+        rec_dict = _RecordingDict(fil_dict)
+        #------------------------------------------------------------------
+        getattr(fil_inst, method)(rec_dict)
+        #------------------------------------------------------------------
+        # results are all entries written by the design method and the ones that
+        # have been modified in place (e.g. nested dicts like 'wdg_fil')
+        changed = set(k for k in rec_dict.keys_read - rec_dict.keys_written
+                      if k in fil_dict and dict.__contains__(rec_dict, k) and
+                      canonical_hash(fil_dict[k]) != canonical_hash(dict.__getitem__(rec_dict, k)))
+        results = dict((k, dict.__getitem__(rec_dict, k))
+                       for k in rec_dict.keys_written | changed)
+
+        with self.lock:
+            keys_used = self.keys_used.get(method_id, set())
+            if not rec_dict.keys_read <= keys_used:
+                self.keys_used[method_id] = keys_used | rec_dict.keys_read
+                self._store_keys_used()
+            key = self._key(method_id, fil_dict) # hash over the values before the design
+
+        for k in results:
+            fil_dict[k] = results[k]
+        self._store(key, copy.deepcopy(results))
+
+        return False
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+design_engine.py
+
+Headless filter design: Filter design routines like ``Cheby1.LPmin`` or
+``Equiripple.BPman`` are called with a dictionary of specs without creating
+any widgets and without importing Qt. This allows running large numbers of
+filter designs e.g. on build servers or from scripts.
+
+The GUI uses the global instance ``filter_factory.fil_inst`` and the global
+dict ``fb.fil[0]``; the design engine creates a fresh filter design instance
+and a fresh filter dict for each design instead, the global state is not
+touched.
+
+Example
+-------
+
+>>> from pyfda.design_engine import design
+>>> fil_dict = design({'rt':'LP', 'fo':'min', 'F_PB':0.1, 'F_SB':0.15}, 'Cheby1')
+>>> b, a = fil_dict['ba']
+>>> N = fil_dict['N'] # calculated minimum order
+
+Author: Christian Muenker
+"""
+
+from __future__ import division, unicode_literals, print_function, absolute_import
+import copy
+import importlib
+import logging
+
+from . import filterbroker as fb
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------------------
+def fil_dict_from_specs(specs=None):
+    """
+    Create a new filter dictionary with the default entries of ``fb.fil_init``,
+    updated with the entries of ``specs``. Both dicts are copied, hence the
+    returned dictionary can be modified by the filter design routines without
+    side effects.
+
+    In contrast to ``fb.fil[0]`` (a ``defaultdict``), the returned dictionary is
+    a plain dict that can be pickled, e.g. for passing it to another process.
+
+    Parameters
+    ----------
+
+    specs : dict (optional, default: None)
+        Filter specifications like 'rt', 'fo', 'N', 'F_PB', 'A_SB', ...
+        Parameters of dynamic filter widgets can be passed as e.g.
+        ``{'wdg_fil':{'equiripple':{'grid_density':32}}}``.
+
+    Returns
+    -------
+
+    fil_dict : dict
+        Filter dictionary with all the keys of ``fb.fil_init``
+    """
+    fil_dict = copy.deepcopy(fb.fil_init)
+    if specs:
+        # don't trigger pending format conversions of fb.fil[0] (see
+        # filterbroker.FilterDict), they would be overwritten by the design
+        pending = specs.pending_keys() if hasattr(specs, 'pending_keys') else ()
+        fil_dict.update(copy.deepcopy(
+            dict((k, specs[k]) for k in specs if k not in pending)))
+    return fil_dict
+
+#------------------------------------------------------------------------------
+class DesignEngine(object):
+    """
+    Qt-free counterpart of ``FilterFactory``: find the filter design class,
+    instantiate it and call the design method constructed from the response
+    type and the filter order in the spec dict (e.g. 'LP' + 'min' -> 'LPmin').
+
+    Only the filter design classes (not the instances) are cached, each design
+    is performed with a new instance so that no state can leak from one design
+    to the next one.
+
+    Parameters
+    ----------
+
+    design_cache : instance of ``design_cache.DesignCache`` (optional, default: None)
+        Cache for design results; when None, all designs are calculated.
+    """
+    def __init__(self, design_cache=None):
+        self.fil_classes = {} # cache for filter design classes {fc: class}
+        self.design_cache = design_cache
+
+#------------------------------------------------------------------------------
+    def find_fil_class(self, fc):
+        """
+        Return the key of ``fb.fil_classes`` matching ``fc``. The comparison is
+        not case sensitive, i.e. 'cheby1' is found as 'Cheby1'. When no key
+        matches, ``fc`` is returned unchanged.
+        """
+        fc = str(fc)
+        if fc in fb.fil_classes:
+            return fc
+        for key in fb.fil_classes:
+            if key.lower() == fc.lower():
+                return key
+        return fc
+
+#------------------------------------------------------------------------------
+    def get_fil_class(self, fc, mod=None):
+        """
+        Import the module of the filter design class ``fc`` and return the class.
+
+        Parameters
+        ----------
+
+        fc : string
+            Name of the filter design class, e.g. 'Cheby1'
+
+        mod : string (optional, default = None)
+            Fully qualified name of the filter module. When not specified, it is
+            read from the global dict ``fb.fil_classes``
+
+        Returns
+        -------
+
+        fil_class : class
+            The filter design class
+        """
+        if fc in self.fil_classes and not mod:
+            return self.fil_classes[fc]
+
+        if not mod:
+            try:
+                mod = fb.fil_classes[fc]['mod']
+            except KeyError:
+                raise ValueError("Filter design class '{0}' is not in dict "
+                                 "'fb.fil_classes'.".format(fc))
+        try:
+            fc_module = importlib.import_module(mod)
+        except ImportError as e:
+            raise ValueError("Filter design module '{0}' could not be imported:\n{1}"
+                             .format(mod, e))
+
+        fil_class = getattr(fc_module, fc, None)
+        if fil_class is None:
+            raise ValueError("Unknown design class '{0}' in module '{1}'."
+                             .format(fc, mod))
+
+        self.fil_classes[fc] = fil_class
+        return fil_class
+
+#------------------------------------------------------------------------------
+    def design(self, specs, fc=None, mod=None):
+        """
+        Design a filter with the specifications passed in ``specs``.
+
+        Parameters
+        ----------
+
+        specs : dict
+            Filter specifications, missing entries are taken from ``fb.fil_init``.
+            The design method is selected by the keys 'rt' (e.g. 'LP') and
+            'fo' (e.g. 'min').
+
+        fc : string (optional, default: None)
+            Name of the filter design class (e.g. 'Cheby1'). When not specified,
+            ``specs['fc']`` is used.
+
+        mod : string (optional, default = None)
+            Fully qualified name of the filter module, see ``get_fil_class()``.
+
+        Returns
+        -------
+
+        fil_dict : dict
+            The filter dict with the design results, i.e. 'ba', 'zpk' and 'sos'
+            and the entries updated by the design method like 'N' or 'F_C' for
+            minimum order designs.
+        """
+        fil_dict = fil_dict_from_specs(specs)
+
+        fc = self.find_fil_class(fc if fc else fil_dict['fc'])
+        fil_inst = self.get_fil_class(fc, mod)()
+
+        rt = str(fil_dict['rt'])
+        fo = str(fil_dict['fo'])
+        # check in rt_dict of the instance whether the combination of response
+        # type and filter order is supported by the filter class
+        if rt not in fil_inst.rt_dict or fo not in fil_inst.rt_dict[rt]:
+            raise ValueError("Filter class '{0}' doesn't support response type '{1}' "
+                             "with filter order '{2}'.".format(fc, rt, fo))
+
+        method = rt + fo
+        if not hasattr(fil_inst, method):
+            raise ValueError("Method '{0}' doesn't exist in class '{1}'."
+                             .format(method, fc))
+
+        fil_dict['fc'] = fc
+        #------------------------------------------------------------------
+        if self.design_cache is not None:
+            self.design_cache.call(fil_inst, method, fil_dict)
+        else:
+            getattr(fil_inst, method)(fil_dict)
+        #------------------------------------------------------------------
+        logger.debug("DesignEngine.design(): %s.%s, N = %s", fc, method, fil_dict['N'])
+
+        return fil_dict
+
+#------------------------------------------------------------------------------
+design_engine = DesignEngine()
+# This *class instance* of DesignEngine can be accessed in other modules using
+# from pyfda.design_engine import design_engine
+
+def design(specs, fc=None, mod=None):
+    """
+    Design a filter with the module instance ``design_engine``, see
+    ``DesignEngine.design()``.
+    """
+    return design_engine.design(specs, fc=fc, mod=mod)
+
+###############################################################################
+
+if __name__ == '__main__':
+    fil_dict = design({'rt':'LP', 'fo':'min'}, 'Butter')
+    print("N =", fil_dict['N'], "\nba =", fil_dict['ba'])
@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""
+design_sweep.py
+
+Parameter sweeps over filter specifications: All combinations of the swept
+parameters (e.g. ``N``, ``F_PB``, ``F_SB``, ``A_SB`` or the window type) are
+designed with the headless design engine in a pool of worker processes. The
+results (coefficients and some figures of merit like filter order, pass band
+ripple and stop band attenuation) are returned as soon as they are available.
+
+Each worker process has its own filter design instances and filter dicts, there
+is no shared global state like ``filter_factory.fil_inst`` or ``fb.fil[0]``.
+
+Example
+-------
+
+>>> from pyfda.design_sweep import run_sweep
+>>> for res in run_sweep({'rt':'LP', 'fo':'man', 'F_PB':0.1}, 'Cheby1',
+...                      {'N':[4, 6, 8], 'F_SB':[0.15, 0.2]}):
+...     print(res['params'], res['N'], res['A_SB_dB'])
+
+The module can also be run from the command line, try
+
+    python -m pyfda.design_sweep --help
+
+Author: Christian Muenker
+"""
+
+from __future__ import division, unicode_literals, print_function, absolute_import
+import sys
+import copy
+import itertools
+import argparse
+import csv
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import scipy.signal as sig
+
+from .design_engine import DesignEngine
+
+logger = logging.getLogger(__name__)
+
+# Short names for swept parameters that are stored in nested dicts of fil_dict:
+SWEEP_ALIASES = {'win':          'wdg_fil.firwin.win',
+                 'alg':          'wdg_fil.firwin.alg',
+                 'grid_density': 'wdg_fil.equiripple.grid_density',
+                 'stages':       'wdg_fil.ma.stages'}
+
+#------------------------------------------------------------------------------
+def set_spec(specs, key, value):
+    """
+    Set ``specs[key] = value``. ``key`` may be an alias from ``SWEEP_ALIASES``
+    or a dotted path like 'wdg_fil.firwin.win' for nested dictionaries, missing
+    levels are created.
+    """
+    path = SWEEP_ALIASES.get(key, key).split('.')
+    for k in path[:-1]:
+        specs = specs.setdefault(k, {})
+    specs[path[-1]] = value
+
+#------------------------------------------------------------------------------
+def sweep_params(sweep):
+    """
+    Return a list with a dict for each combination (cartesian product) of
+    the swept parameters.
+
+    Parameters
+    ----------
+
+    sweep : dict
+        Dictionary with the names of the swept parameters as keys and a list
+        of parameter values each, e.g. ``{'N':[10, 20], 'win':['hann', 'hamming']}``
+
+    Returns
+    -------
+
+    params : list of dicts
+        e.g. ``[{'N':10, 'win':'hann'}, {'N':10, 'win':'hamming'}, ...]``
+    """
+    keys = sorted(sweep.keys())
+    return [dict(zip(keys, vals))
+            for vals in itertools.product(*[list(sweep[k]) for k in keys])]
+
+#------------------------------------------------------------------------------
+def _bands(fil_dict):
+    """
+    Return lists of (f_lo, f_hi) tuples for pass and stop band(s), frequencies
+    are normalized to f_S. Unknown response types return empty lists.
+    """
+    rt = str(fil_dict['rt'])
+    if rt == 'LP':
+        return [(0, fil_dict['F_PB'])], [(fil_dict['F_SB'], 0.5)]
+    elif rt == 'HP':
+        return [(fil_dict['F_PB'], 0.5)], [(0, fil_dict['F_SB'])]
+    elif rt == 'BP':
+        return ([(fil_dict['F_PB'], fil_dict['F_PB2'])],
+                [(0, fil_dict['F_SB']), (fil_dict['F_SB2'], 0.5)])
+    elif rt == 'BS':
+        return ([(0, fil_dict['F_PB']), (fil_dict['F_PB2'], 0.5)],
+                [(fil_dict['F_SB'], fil_dict['F_SB2'])])
+    else:
+        return [], []
+
+def design_metrics(fil_dict, N_FFT=2048):
+    """
+    Calculate figures of merit of a designed filter from its magnitude
+    response at ``N_FFT`` points between 0 and f_S/2.
+
+    Returns
+    -------
+
+    metrics : dict
+        'N' : filter order
+
+        'A_PB_dB' : max. pass band ripple in dB (max. / min. magnitude in the
+        pass band(s))
+
+        'A_SB_dB' : min. stop band attenuation in dB, relative to the max.
+        pass band magnitude
+
+    Values that cannot be determined for the response type are set to `nan`.
+    """
+    if len(fil_dict['sos']) > 0 and hasattr(sig, 'sosfreqz'):
+        w, H = sig.sosfreqz(fil_dict['sos'], worN=N_FFT)
+    else:
+        w, H = sig.freqz(fil_dict['ba'][0], fil_dict['ba'][1], worN=N_FFT)
+    F = w / (2 * np.pi)
+    H_abs = np.abs(H)
+
+    def band_mag(bands):
+        sel = np.zeros(len(F), dtype=bool)
+        for f_lo, f_hi in bands:
+            sel |= (F >= f_lo) & (F <= f_hi)
+        return H_abs[sel]
+
+    pb, sb = _bands(fil_dict)
+    H_pb = band_mag(pb)
+    H_sb = band_mag(sb)
+
+    olderr = np.seterr(divide='ignore')
+    if len(H_pb) > 0:
+        A_PB_dB = 20 * np.log10(H_pb.max() / H_pb.min())
+        H_ref = H_pb.max()
+    else:
+        A_PB_dB = np.nan
+        H_ref = H_abs.max()
+    if len(H_sb) > 0:
+        A_SB_dB = 20 * np.log10(H_ref / H_sb.max())
+    else:
+        A_SB_dB = np.nan
+    np.seterr(**olderr)
+
+    return {'N': fil_dict['N'], 'A_PB_dB': A_PB_dB, 'A_SB_dB': A_SB_dB}
+
+#------------------------------------------------------------------------------
+def _design_chunk(base_specs, fc, chunk, N_FFT):
+    """
+    Design all filters for the list of (idx, params) tuples in ``chunk``.
+    This function runs in the worker processes, exceptions are caught and
+    returned as error messages to keep the other designs running.
+    """
+    engine = DesignEngine()
+    results = []
+    for idx, params in chunk:
+        res = {'idx': idx, 'params': params, 'err': None}
+        try:
+            specs = copy.deepcopy(base_specs)
+            for k in params:
+                set_spec(specs, k, params[k])
+            fil_dict = engine.design(specs, fc)
+            res.update({'ba': fil_dict['ba'], 'zpk': fil_dict['zpk'],
+                        'sos': fil_dict['sos']})
+            res.update(design_metrics(fil_dict, N_FFT))
+        except Exception as e:
+            res['err'] = "{0}: {1}".format(type(e).__name__, e)
+        results.append(res)
+    return results
+
+def run_sweep(base_specs, fc, sweep, max_workers=None, chunksize=8, N_FFT=2048):
+    """
+    Design filters for all combinations of the parameters in ``sweep`` in a
+    pool of worker processes and yield the results as soon as they are ready
+    (not necessarily in the order of the parameter combinations, use the
+    'idx' entry for sorting).
+
+    Parameters
+    ----------
+
+    base_specs : dict
+        Filter specifications that are common for all designs, e.g. 'rt' and 'fo'.
+        Missing entries are taken from ``fb.fil_init``.
+
+    fc : string
+        Name of the filter design class, e.g. 'Equiripple'
+
+    sweep : dict
+        Swept parameters and their values, see ``sweep_params()``
+
+    max_workers : int (optional, default: None)
+        Number of worker processes, default is the number of cores. With
+        ``max_workers = 1``, all designs are run in the current process.
+
+    chunksize : int (optional, default: 8)
+        Number of designs passed to a worker process at once. Larger chunks
+        reduce the interprocess communication overhead.
+
+    N_FFT : int (optional, default: 2048)
+        Number of frequency points for ``design_metrics()``
+
+    Yields
+    ------
+
+    res : dict
+        'idx' : index of the parameter combination
+
+        'params' : dict with the swept parameters
+
+        'ba', 'zpk', 'sos' : filter design results
+
+        'N', 'A_PB_dB', 'A_SB_dB' : see ``design_metrics()``
+
+        'err' : error message when the design has failed, else None
+    """
+    params = list(enumerate(sweep_params(sweep)))
+    chunksize = max(int(chunksize), 1)
+    chunks = [params[i:i + chunksize] for i in range(0, len(params), chunksize)]
+
+    if max_workers == 1:
+        for chunk in chunks:
+            for res in _design_chunk(base_specs, fc, chunk, N_FFT):
+                yield res
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_design_chunk, base_specs, fc, chunk, N_FFT)
+                   for chunk in chunks]
+        for future in as_completed(futures):
+            for res in future.result():
+                yield res
+
+#------------------------------------------------------------------------------
+def _parse_value(txt):
+    """ Convert string to int or float if possible, else return the stripped string """
+    txt = txt.strip()
+    for typ in (int, float):
+        try:
+            return typ(txt)
+        except ValueError:
+            pass
+    return txt
+
+def _parse_sweep(txt):
+    """
+    Parse a sweep argument 'key=values' where values are either a comma
+    separated list 'v1,v2,...' or a range 'start:stop:step' (stop included).
+    """
+    key, vals = txt.split('=', 1)
+    if ':' in vals:
+        start, stop, step = [_parse_value(v) for v in vals.split(':')]
+        n = int(round((stop - start) / step)) + 1
+        vals = [start + i * step for i in range(n)]
+    else:
+        vals = [_parse_value(v) for v in vals.split(',')]
+    return key.strip(), vals
+
+def main(argv=None):
+    """
+    Command line interface for ``run_sweep()``, writing one CSV line per design.
+    """
+    parser = argparse.ArgumentParser(prog='python -m pyfda.design_sweep',
+        description="Parameter sweep for pyfda filter designs.")
+    parser.add_argument('fc', help="filter design class, e.g. 'Equiripple'")
+    parser.add_argument('--rt', default='LP', help="response type (default: LP)")
+    parser.add_argument('--fo', default='man', help="filter order 'man' or 'min'")
+    parser.add_argument('-s', '--sweep', action='append', default=[],
+        metavar='KEY=VALUES', help="swept parameter, e.g. 'N=10:50:10' or "
+                                   "'win=hann,hamming' (can be repeated)")
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+        help="fixed parameter, e.g. 'F_PB=0.1' (can be repeated)")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+        help="number of worker processes (default: number of cores)")
+    parser.add_argument('--chunksize', type=int, default=8,
+        help="designs per worker task (default: 8)")
+    parser.add_argument('--coeffs', action='store_true',
+        help="also write the coefficients b and a")
+    parser.add_argument('-o', '--out', default=None,
+        help="CSV output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    base_specs = {'rt': args.rt, 'fo': args.fo}
+    for txt in args.set:
+        key, val = txt.split('=', 1)
+        set_spec(base_specs, key.strip(), _parse_value(val))
+    sweep = dict(_parse_sweep(txt) for txt in args.sweep)
+    keys = sorted(sweep.keys())
+
+    f_out = open(args.out, 'w') if args.out else sys.stdout
+    try:
+        writer = csv.writer(f_out)
+        # 'order' is the resulting filter order, 'N' may also be a swept parameter
+        header = ['idx'] + keys + ['order', 'A_PB_dB', 'A_SB_dB', 'err']
+        if args.coeffs:
+            header += ['b', 'a']
+        writer.writerow(header)
+        for res in run_sweep(base_specs, args.fc, sweep, max_workers=args.workers,
+                             chunksize=args.chunksize):
+            row = [res['idx']] + [res['params'][k] for k in keys]
+            if res['err']:
+                row += ['', '', '', res['err']]
+            else:
+                row += [res['N'], res['A_PB_dB'], res['A_SB_dB'], '']
+            if args.coeffs:
+                if res['err']:
+                    row += ['', '']
+                else:
+                    row += [" ".join(str(c) for c in res['ba'][0]),
+                            " ".join(str(c) for c in res['ba'][1])]
+            writer.writerow(row)
+            f_out.flush()
+    finally:
+        if args.out:
+            f_out.close()
+
+###############################################################################
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+design_worker.py
+
+Filter design in a background thread: Large designs (e.g. a 2000 tap
+equiripple filter or a high order elliptic band stop) take seconds and would
+freeze the user interface when run in the GUI thread.
+
+The ``DesignWorker`` thread designs a copy of the filter dict with the
+headless design engine, i.e. without touching ``fb.fil[0]`` or the filter
+instance ``filter_factory.fil_inst`` with its widgets. The result is passed
+back via a signal and copied to ``fb.fil[0]`` in the GUI thread.
+
+There is at most one pending job: A job submitted while another one is still
+waiting replaces it, a job submitted while another one is running makes the
+result of the running job obsolete (a running scipy routine cannot be
+interrupted, its result is discarded instead).
+
+Author: Christian Muenker
+"""
+
+from __future__ import division, unicode_literals, print_function, absolute_import
+import logging
+
+from .compat import QtCore, pyqtSignal
+from .design_engine import DesignEngine, fil_dict_from_specs
+from .design_cache import canonical_hash
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------------------
+class DesignWorker(QtCore.QThread):
+    """
+    Thread for designing filters, jobs are submitted with ``submit()``.
+
+    Parameters
+    ----------
+
+    parent : QObject
+        Parent of the thread
+
+    design_cache : instance of ``design_cache.DesignCache`` (optional, default: None)
+        Cache for design results, see ``DesignEngine``
+    """
+    # emitted with job id and a dict with the entries of the filter dict that
+    # have been changed by the design (e.g. 'ba', 'zpk', 'sos', 'N'):
+    sigDesigned = pyqtSignal(int, object)
+    # emitted with job id and error message when the design has failed:
+    sigFailed = pyqtSignal(int, object)
+
+    def __init__(self, parent=None, design_cache=None):
+        super(DesignWorker, self).__init__(parent)
+        self.engine = DesignEngine(design_cache)
+        self.mutex = QtCore.QMutex()
+        self.job_available = QtCore.QWaitCondition()
+        self.job_id = 0     # id of the most recently submitted job
+        self.pending = None # (job_id, fil_dict) of the job waiting to be run
+        self.busy = False   # a job is being designed
+        self.abort = False  # stop the thread
+
+#------------------------------------------------------------------------------
+    def submit(self, fil_dict):
+        """
+        Submit a copy of ``fil_dict`` for designing, replacing a job that is
+        still waiting. The result of a running job becomes obsolete.
+
+        Returns
+        -------
+
+        job_id : int
+            Id of the job, passed with ``sigDesigned`` or ``sigFailed``
+        """
+        fil_dict = fil_dict_from_specs(fil_dict) # copy in the GUI thread
+        locker = QtCore.QMutexLocker(self.mutex)
+        self.job_id += 1
+        if self.pending is not None:
+            logger.debug("Design job %d superseded by job %d",
+                         self.pending[0], self.job_id)
+        self.pending = (self.job_id, fil_dict)
+        self.job_available.wakeOne()
+        del locker
+
+        if not self.isRunning():
+            self.start(QtCore.QThread.LowPriority)
+        return self.job_id
+
+    def cancel(self):
+        """
+        Remove the pending job and make the result of a running job obsolete.
+        """
+        locker = QtCore.QMutexLocker(self.mutex)
+        self.pending = None
+        self.job_id += 1
+        del locker
+
+    def is_current(self, job_id):
+        """ Return True when ``job_id`` is the most recently submitted job """
+        return job_id == self.job_id
+
+    def is_pending(self):
+        """ Return True when a job is waiting or being designed """
+        locker = QtCore.QMutexLocker(self.mutex)
+        pending = self.busy or self.pending is not None
+        del locker
+        return pending
+
+    def stop(self):
+        """ Stop the thread after the running job and wait for it """
+        self.mutex.lock()
+        self.abort = True
+        self.pending = None
+        self.job_available.wakeOne()
+        self.mutex.unlock()
+        self.wait()
+
+#------------------------------------------------------------------------------
+    def run(self):
+        """ Thread loop: wait for jobs and design them """
+        while True:
+            self.mutex.lock()
+            while self.pending is None and not self.abort:
+                self.job_available.wait(self.mutex)
+            if self.abort:
+                self.mutex.unlock()
+                return
+            job_id, fil_dict = self.pending
+            self.pending = None
+            self.busy = True
+            self.mutex.unlock()
+
+            try:
+                #--------------------------------------------------------------
+                designed = self.engine.design(fil_dict)
+                #--------------------------------------------------------------
+                # only pass changed entries, other entries of fb.fil[0] like
+                # display settings may have been modified in the meantime
+                result = (True, dict((k, v) for k, v in designed.items()
+                    if k not in fil_dict or canonical_hash(v) != canonical_hash(fil_dict[k])))
+            except Exception as e:
+                result = (False, "{0}: {1}".format(type(e).__name__, e))
+
+            self.mutex.lock()
+            self.busy = False
+            self.mutex.unlock()
+
+            if not self.is_current(job_id):
+                logger.debug("Discarding result of obsolete design job %d", job_id)
+            elif result[0]:
+                self.sigDesigned.emit(job_id, result[1])
+            else:
+                self.sigFailed.emit(job_id, result[1])
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    pass
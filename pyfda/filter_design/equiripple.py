@@ -19,6 +19,9 @@ Version info:
          first element controls whether the widget is visible and / or enabled.
          This dict is now called self.rt_dict. When present, the dict self.rt_dict_add
          is read and merged with the first one.
+    2.1: The class is no longer derived from QWidget, design routines can be
+         used without Qt (e.g. by `design_engine`). Widget parameters are read
+         from fil_dict['wdg_fil'], the widgets are only created in construct_UI
 
     
 Author: Christian Muenker 2014 - 2016
@@ -28,8 +31,6 @@ from __future__ import print_function, division, unicode_literals, absolute_impo
 import logging
 logger = logging.getLogger(__name__)
 
-from ..compat import QWidget, QLabel, QLineEdit, pyqtSignal, QVBoxLayout, QHBoxLayout
-
 import scipy.signal as sig
 import numpy as np
 
@@ -45,11 +46,11 @@ from pyfda.pyfda_lib import fil_save, remezord, round_odd, ceil_even
 #           IEEE SIGNAL PROCESSING LETTERS, VOL. 10, NO. 1, JANUARY 2003  
 
 
-__version__ = "2.0"
+__version__ = "2.1"
 
 filter_classes = {'Equiripple':'Equiripple'}
 
-class Equiripple(QWidget):
+class Equiripple(object):
 
     FRMT = 'ba' # output format of filter design routines 'zpk' / 'ba' / 'sos'
             # currently, only 'ba' is supported for equiripple routines
@@ -79,10 +80,7 @@ is estimated using Ichige's algorithm.
 ``scipy.signal.remez()``, ``pyfda_lib.remezord()``
     """
 
-    sigFiltChanged = pyqtSignal()
-
     def __init__(self):
-        QWidget.__init__(self)
 
         self.ft = 'FIR'
         
@@ -166,6 +164,8 @@ is estimated using Ichige's algorithm.
         
         self.hdl = ('df') # filter topologies
 
+        self.grid_density = 16 # default, overwritten by fil_dict['wdg_fil']
+
         #----------------------------------------------------------------------
 
     def construct_UI(self):
@@ -174,12 +174,21 @@ is estimated using Ichige's algorithm.
         names given in self.wdg :
         These subwidgets are instantiated dynamically when needed in 
         select_filter.py using the handle to the filter instance, fb.fil_inst.
+
+        Qt is only imported here, the design routines don't need it.
         """
+        from ..compat import QLabel, QLineEdit, QHBoxLayout
+        from ..pyfda_qt_lib import QDynWidget
+
+        # Widget containing all subwidgets (cmbBoxes, Labels, lineEdits)
+        self.wdg_fil = QDynWidget()
+        self.sigFiltChanged = self.wdg_fil.sigFiltChanged
+
 #        print("Constructing Equiripple UI")
-        self.lbl_remez_1 = QLabel("Grid Density", self)
+        self.lbl_remez_1 = QLabel("Grid Density", self.wdg_fil)
         self.lbl_remez_1.setObjectName('wdg_lbl_remez_1')
-        self.led_remez_1 = QLineEdit(self)
-        self.led_remez_1.setText("16")
+        self.led_remez_1 = QLineEdit(self.wdg_fil)
+        self.led_remez_1.setText(str(self.grid_density))
         self.led_remez_1.setObjectName('wdg_led_remez_1')
         self.led_remez_1.setToolTip("Number of frequency points for Remez algorithm. Increase the\n"
                                     "number to reduce frequency overshoot in the transition region.")
@@ -189,9 +198,6 @@ is estimated using Ichige's algorithm.
         self.layHWin.addWidget(self.lbl_remez_1)
         self.layHWin.addWidget(self.led_remez_1)
         self.layHWin.setContentsMargins(0,0,0,0)
-        # Widget containing all subwidgets (cmbBoxes, Labels, lineEdits)
-        self.wdg_fil = QWidget(self)
-        self.wdg_fil.setObjectName('wdg_fil')
         self.wdg_fil.setLayout(self.layHWin)
 
         #----------------------------------------------------------------------
@@ -259,6 +265,11 @@ is estimated using Ichige's algorithm.
         self.A_SB2 = fil_dict['A_SB2']
         
         self.alg = 'ichige'
+
+        # parameters of the dynamic widget, stored by _update_UI():
+        if 'wdg_fil' in fil_dict and 'equiripple' in fil_dict['wdg_fil']:
+            self.grid_density = fil_dict['wdg_fil']['equiripple'].get(
+                                        'grid_density', self.grid_density)
         
 
     def _save(self, fil_dict, arg):
@@ -376,7 +387,7 @@ is estimated using Ichige's algorithm.
 
 if __name__ == '__main__':
     import sys
-    from ..compat import QApplication, QFrame
+    from ..compat import QApplication, QFrame, QVBoxLayout
 
     app = QApplication(sys.argv)
     
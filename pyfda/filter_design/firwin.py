@@ -19,14 +19,14 @@ Version info:
          first element controls whether the widget is visible and / or enabled.
          This dict is now called self.rt_dict. When present, the dict self.rt_dict_add
          is read and merged with the first one.
+    2.1: The class is no longer derived from QWidget, design routines can be
+         used without Qt (e.g. by `design_engine`). Widget parameters are read
+         from fil_dict['wdg_fil'], the widgets are only created in construct_UI
 
 Author: Christian Muenker
 """
 from __future__ import print_function, division, unicode_literals
 
-from ..compat import (Qt, QWidget, QLabel, QLineEdit, pyqtSignal, QComboBox,
-                      QVBoxLayout, QGridLayout)
-
 import numpy as np
 import scipy.signal as sig
 from importlib import import_module
@@ -43,21 +43,17 @@ from .common import Common
 # TODO: Improve calculation of F_C and F_C2 using the weights
 # TODO: Automatic setting of density factor for remez calculation? 
 #       Automatic switching to Kaiser / Hermann?
-# TODO: Parameters for windows are not stored in fil_dict?
 
-__version__ = "2.0"
+__version__ = "2.1"
 
 filter_classes = {'Firwin':'Windowed FIR'}
 
-class Firwin(QWidget):
+class Firwin(object):
 
     FRMT = 'ba' # output format(s) of filter design routines 'zpk' / 'ba' / 'sos'
                 # currently, only 'ba' is supported for firwin routines
-    
-    sigFiltChanged = pyqtSignal()
 
     def __init__(self):
-        QWidget.__init__(self)
 
         self.ft = 'FIR'
                            
@@ -100,6 +96,10 @@ class Firwin(QWidget):
         self.wdg = True  # has additional dynamic widget 'wdg_fil'
         
         self.hdl = ('df') # filter topologies
+
+        # defaults, overwritten by fil_dict['wdg_fil']:
+        self.firWindow = self.fir_window_name = 'hann'
+        self.alg = 'ichige'
         
         #----------------------------------------------------------------------        
     def construct_UI(self):
@@ -108,10 +108,18 @@ class Firwin(QWidget):
         names given in self.wdg :
         These subwidgets are instantiated dynamically when needed in 
         select_filter.py using the handle to the filter object, fb.filObj .
+
+        Qt is only imported here, the design routines don't need it.
         """
+        from ..compat import QLabel, QLineEdit, QComboBox, QGridLayout
+        from ..pyfda_qt_lib import QDynWidget
+
+        # Widget containing all subwidgets (cmbBoxes, Labels, lineEdits)
+        self.wdg_fil = QDynWidget()
+        self.sigFiltChanged = self.wdg_fil.sigFiltChanged
 
         # Combobox for selecting the algorithm to estimate minimum filter order
-        self.cmb_firwin_alg = QComboBox(self)
+        self.cmb_firwin_alg = QComboBox(self.wdg_fil)
         self.cmb_firwin_alg.setObjectName('wdg_cmb_firwin_alg')
         self.cmb_firwin_alg.addItems(['ichige','kaiser','herrmann'])
         # Minimum size, can be changed in the upper hierarchy levels using layouts:
@@ -119,7 +127,7 @@ class Firwin(QWidget):
         self.cmb_firwin_alg.hide()
 
         # Combobox for selecting the window used for filter design
-        self.cmb_firwin_win = QComboBox(self)
+        self.cmb_firwin_win = QComboBox(self.wdg_fil)
         self.cmb_firwin_win.setObjectName('wdg_cmb_firwin_win')
 
         windows = ['Barthann','Bartlett','Blackman','Blackmanharris','Bohman',
@@ -137,17 +145,17 @@ class Firwin(QWidget):
         # Minimum size, can be changed in the upper hierarchy levels using layouts:
         self.cmb_firwin_win.setSizeAdjustPolicy(QComboBox.AdjustToContents)
 
-        self.lbl_firwin_1 = QLabel("a", self)
+        self.lbl_firwin_1 = QLabel("a", self.wdg_fil)
         self.lbl_firwin_1.setObjectName('wdg_lbl_firwin_1')
-        self.led_firwin_1 = QLineEdit(self)
+        self.led_firwin_1 = QLineEdit(self.wdg_fil)
         self.led_firwin_1.setText("0.5")
         self.led_firwin_1.setObjectName('wdg_led_firwin_1')
         self.lbl_firwin_1.setVisible(False)
         self.led_firwin_1.setVisible(False)
                
-        self.lbl_firwin_2 = QLabel("b", self)
+        self.lbl_firwin_2 = QLabel("b", self.wdg_fil)
         self.lbl_firwin_2.setObjectName('wdg_lbl_firwin_2')
-        self.led_firwin_2 = QLineEdit(self)
+        self.led_firwin_2 = QLineEdit(self.wdg_fil)
         self.led_firwin_2.setText("0.5")
         self.led_firwin_2.setObjectName('wdg_led_firwin_2')
         self.led_firwin_2.setVisible(False)
@@ -162,9 +170,6 @@ class Firwin(QWidget):
         self.layGWin.addWidget(self.lbl_firwin_2,1,2)
         self.layGWin.addWidget(self.led_firwin_2,1,3)
         self.layGWin.setContentsMargins(0,0,0,0)
-        # Widget containing all subwidgets (cmbBoxes, Labels, lineEdits)
-        self.wdg_fil = QWidget(self)
-        self.wdg_fil.setObjectName('wdg_fil')
         self.wdg_fil.setLayout(self.layGWin)
 
         #----------------------------------------------------------------------
@@ -229,6 +234,8 @@ class Firwin(QWidget):
         else:
             self.firWindow = self.fir_window_name
 
+        self._store_entries(fb.fil[0])
+
         self.sigFiltChanged.emit() # -> select_filter -> filter_specs
             
     def destruct_UI(self):
@@ -247,6 +254,8 @@ class Firwin(QWidget):
         and set UI elements accordingly. load_dict() is called upon 
         initialization and when the filter is loaded from disk.
         """
+        from ..compat import Qt
+
         win_idx = 0
         alg_idx = 0
         if 'wdg_fil' in fb.fil[0] and 'firwin' in fb.fil[0]['wdg_fil']:
@@ -276,14 +285,14 @@ class Firwin(QWidget):
         self.cmb_firwin_win.setCurrentIndex(win_idx) # set index for window and
         self.cmb_firwin_alg.setCurrentIndex(alg_idx) # and algorithm cmbBox
 
-    def _store_entries(self):
+    def _store_entries(self, fil_dict):
         """
         Store window and alg. selection and parameter settings (part of 
         self.firWindow, if any) in filter dictionary.
         """
-        if not 'wdg_fil' in fb.fil[0]:
-            fb.fil[0].update({'wdg_fil':{}})
-        fb.fil[0]['wdg_fil'].update({'firwin':
+        if not 'wdg_fil' in fil_dict:
+            fil_dict.update({'wdg_fil':{}})
+        fil_dict['wdg_fil'].update({'firwin':
                                         {'win':self.firWindow,
                                          'alg':self.alg}
                                  })
@@ -308,10 +317,17 @@ class Firwin(QWidget):
         self.A_SB  = fil_dict['A_SB']
         self.A_SB2 = fil_dict['A_SB2']
 
-#        self.alg = 'ichige' # algorithm for determining the minimum order
-#        self.alg = self.cmb_firwin_alg.currentText()
-#        print("===== firwin ====\n", self.alg)
-#        print(self.firWindow)
+        # parameters of the dynamic widget, stored by _store_entries():
+        if 'wdg_fil' in fil_dict and 'firwin' in fil_dict['wdg_fil']:
+            wdg_fil_par = fil_dict['wdg_fil']['firwin']
+            self.firWindow = wdg_fil_par.get('win', self.firWindow)
+            self.alg = wdg_fil_par.get('alg', self.alg)
+
+        if np.isscalar(self.firWindow): # window without parameters
+            self.fir_window_name = self.firWindow
+        else: # tuple with window name and parameter(s)
+            self.firWindow = tuple(self.firWindow)
+            self.fir_window_name = self.firWindow[0]
 
     def _save(self, fil_dict, arg):
         """
@@ -325,7 +341,11 @@ class Firwin(QWidget):
             fil_dict['N'] = self.N # yes, update filterbroker
         except AttributeError:
             pass
-#        self._store_entries()
+
+        # store window settings, they may have been changed by _firwin_ord()
+        self._store_entries(fil_dict)
+        if hasattr(self, 'wdg_fil'): # only when the UI has been constructed
+            self._load_dict()
         
         
     def _firwin_ord(self, F, W, A, alg):
@@ -333,11 +353,8 @@ class Firwin(QWidget):
         delta_f = abs(F[1] - F[0])
         delta_A = np.sqrt(A[0] * A[1])
         if self.fir_window_name == 'kaiser':
-            N, beta = sig.kaiserord(fb.fil[0]['A_SB'], delta_f)
-            self.led_firwin_1.setText(str(beta))
-            fb.fil[0]['wdg_fil'][1] = beta
-            self.firWindow[1] = beta
-            self._load_dict()
+            N, beta = sig.kaiserord(self.A_SB, delta_f)
+            self.firWindow = (self.fir_window_name, beta) # stored by _save()
             return N
         
         if self.firWindow == 'hann':
@@ -419,7 +436,7 @@ class Firwin(QWidget):
 
 if __name__ == '__main__':
     import sys 
-    from ..compat import QApplication, QFrame
+    from ..compat import QApplication, QFrame, QVBoxLayout
 
     app = QApplication(sys.argv)
     
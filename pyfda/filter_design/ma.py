@@ -21,6 +21,9 @@ Version info:
          first element controls whether the widget is visible and / or enabled.
          This dict is now called self.rt_dict. When present, the dict self.rt_dict_add
          is read and merged with the first one.
+    2.1: The class is no longer derived from QWidget, design routines can be
+         used without Qt (e.g. by `design_engine`). Widget parameters are read
+         from fil_dict['wdg_fil'], the widgets are only created in construct_UI
 
 Author: Christian Muenker 2014 - 2016
 """
@@ -29,19 +32,16 @@ from __future__ import print_function, division, unicode_literals, absolute_impo
 import logging
 logger = logging.getLogger(__name__)
 
-from ..compat import (QWidget, QLabel, QLineEdit, pyqtSignal, QCheckBox,
-                      QVBoxLayout, QHBoxLayout)
-
 import numpy as np
 
 import pyfda.filterbroker as fb
 from pyfda.pyfda_lib import fil_save, fil_convert, ceil_even, ceil_odd, floor_odd
 
-__version__ = "2.0"
+__version__ = "2.1"
 
 filter_classes = {'MA':'Moving Average'}   
          
-class MA(QWidget):
+class MA(object):
         
     FRMT = ('zpk', 'ba') # output format(s) of filter design routines 'zpk' / 'ba' / 'sos'
 
@@ -65,12 +65,8 @@ near ``f_S/2`` (highpass).
 ``ma.calc_ma()``
     """
 
-    sigFiltChanged = pyqtSignal()
-
     def __init__(self):
-        QWidget.__init__(self)       
 
-        
         self.ft = 'FIR'
 
         self.rt_dicts = ()
@@ -132,6 +128,11 @@ near ``f_S/2`` (highpass).
         self.wdg = True # has additional dynamic widget 'wdg_fil'
         
         self.hdl = ('ma', 'cic', 'df')  # filter topologies
+
+        # defaults, overwritten by fil_dict['wdg_fil']:
+        self.delays = None # None: derive from filter order N
+        self.stages = 1
+        self.normalize = True
         #----------------------------------------------------------------------
 
     def construct_UI(self):
@@ -140,11 +141,19 @@ near ``f_S/2`` (highpass).
         names given in self.wdg :
         These subwidgets are instantiated dynamically when needed in 
         select_filter.py using the handle to the filter instance, fb.fil_inst.
+
+        Qt is only imported here, the design routines don't need it.
         """
+        from ..compat import QLabel, QLineEdit, QCheckBox, QHBoxLayout
+        from ..pyfda_qt_lib import QDynWidget
 
-        self.lbl_delays = QLabel("<b><i>M =</ i></ b>", self)
+        # Widget containing all subwidgets (cmbBoxes, Labels, lineEdits)
+        self.wdg_fil = QDynWidget()
+        self.sigFiltChanged = self.wdg_fil.sigFiltChanged
+
+        self.lbl_delays = QLabel("<b><i>M =</ i></ b>", self.wdg_fil)
         self.lbl_delays.setObjectName('wdg_lbl_ma_0')
-        self.led_delays = QLineEdit(self)
+        self.led_delays = QLineEdit(self.wdg_fil)
         try:
             self.led_delays.setText(str(fb.fil[0]['N']))
         except KeyError:
@@ -152,16 +161,16 @@ near ``f_S/2`` (highpass).
         self.led_delays.setObjectName('wdg_led_ma_0')
         self.led_delays.setToolTip("Set number of delays per stage")
 
-        self.lbl_stages = QLabel("<b>Stages =</ b>", self)
+        self.lbl_stages = QLabel("<b>Stages =</ b>", self.wdg_fil)
         self.lbl_stages.setObjectName('wdg_lbl_ma_1')
-        self.led_stages = QLineEdit(self)
-        self.led_stages.setText("1")
+        self.led_stages = QLineEdit(self.wdg_fil)
+        self.led_stages.setText(str(self.stages))
         
         self.led_stages.setObjectName('wdg_led_ma_1')
         self.led_stages.setToolTip("Set number of stages ")
         
-        self.chk_norm = QCheckBox("Normalize", self)
-        self.chk_norm.setChecked(True)
+        self.chk_norm = QCheckBox("Normalize", self.wdg_fil)
+        self.chk_norm.setChecked(self.normalize)
         self.chk_norm.setObjectName('wdg_chk_ma_2')
         self.chk_norm.setToolTip("Normalize to| H_max = 1|")
         
@@ -175,9 +184,6 @@ near ``f_S/2`` (highpass).
         self.layHWin.addStretch(1)        
         self.layHWin.addWidget(self.chk_norm)
         self.layHWin.setContentsMargins(0,0,0,0)
-        # Widget containing all subwidgets (cmbBoxes, Labels, lineEdits)
-        self.wdg_fil = QWidget(self)
-        self.wdg_fil.setObjectName('wdg_fil')
         self.wdg_fil.setLayout(self.layHWin)
 
         #----------------------------------------------------------------------
@@ -220,24 +226,26 @@ near ``f_S/2`` (highpass).
         self.led_delays.setText(str(self.delays))        
         self.stages = int(abs(round(float(self.led_stages.text()))))
         self.led_stages.setText(str(self.stages))
+        self.normalize = self.chk_norm.isChecked()
         
-        self._store_entries()
+        self._store_entries(fb.fil[0])
 
-    def _store_entries(self):
+    def _store_entries(self, fil_dict):
 
         """
         Store parameter settings in filter dictionary. Called from _update_UI()
         and _save()
         """
-        if not 'wdg_fil' in fb.fil[0]:
-            fb.fil[0].update({'wdg_fil':{}})
-        fb.fil[0]['wdg_fil'].update({'ma':
+        if not 'wdg_fil' in fil_dict:
+            fil_dict.update({'wdg_fil':{}})
+        fil_dict['wdg_fil'].update({'ma':
                                         {'delays':self.delays,
                                          'stages':self.stages,
-                                         'normalize':self.chk_norm.isChecked()}
+                                         'normalize':self.normalize}
                                     })
-                                    
-        self.sigFiltChanged.emit() # -> select_filter -> filter_specs
+
+        if hasattr(self, 'wdg_fil'): # only when the UI has been constructed
+            self.sigFiltChanged.emit() # -> select_filter -> filter_specs
 
 
     def destruct_UI(self):
@@ -257,6 +265,15 @@ near ``f_S/2`` (highpass).
         # N is total order, L is number of taps per stage
         self.F_SB  = fil_dict['F_SB']
         self.A_SB  = fil_dict['A_SB']
+
+        # parameters of the dynamic widget, stored by _store_entries():
+        if 'wdg_fil' in fil_dict and 'ma' in fil_dict['wdg_fil']:
+            wdg_fil_par = fil_dict['wdg_fil']['ma']
+            self.delays = wdg_fil_par.get('delays', self.delays)
+            self.stages = wdg_fil_par.get('stages', self.stages)
+            self.normalize = wdg_fil_par.get('normalize', self.normalize)
+        if self.delays is None: # nothing specified, derive delays from order
+            self.delays = max(int(fil_dict['N']) // self.stages, 1)
         
 
     def _save(self, fil_dict):
@@ -276,9 +293,10 @@ near ``f_S/2`` (highpass).
         # always update filter dict and LineEdit, in case the design algorithm 
         # has changed the number of delays:
         fil_dict['N'] = self.delays * self.stages # updated filter order
-        self.led_delays.setText(str(self.delays)) # updated number of delays
+        if hasattr(self, 'wdg_fil'):
+            self.led_delays.setText(str(self.delays)) # updated number of delays
         
-        self._store_entries()
+        self._store_entries(fil_dict)
         
         
     def calc_ma(self, fil_dict, rt='LP'):
@@ -340,7 +358,7 @@ near ``f_S/2`` (highpass).
         z = np.repeat(z0, self.stages)
         
         # normalize filter to |H_max| = 1 if checked:
-        if self.chk_norm.isChecked():
+        if self.normalize:
             b = b / (norm ** self.stages)
             k = 1./norm ** self.stages
         p = np.zeros(len(z))
@@ -385,7 +403,7 @@ near ``f_S/2`` (highpass).
 
 if __name__ == '__main__':
     import sys
-    from ..compat import QApplication, QFrame
+    from ..compat import QApplication, QFrame, QVBoxLayout
    
     app = QApplication(sys.argv)
     
@@ -31,7 +31,8 @@ class FilterFactory(object):
         #--------------------------------------
         # return error codes for class instantiation and method 
         self.err_code = 0
-
+        # optional cache for design results (design_cache.DesignCache instance)
+        self.design_cache = None
 
     def create_fil_inst(self, fc, mod = None):
         # TODO: need to pass both module and class name for more flexibility
@@ -205,7 +206,10 @@ class FilterFactory(object):
         else: # everything ok so far, try calling method with the filter dict as argument
             try:
                 #------------------------------------------------------------------
-                getattr(fil_inst, method)(fil_dict)
+                if self.design_cache is not None:
+                    self.design_cache.call(fil_inst, method, fil_dict)
+                else:
+                    getattr(fil_inst, method)(fil_dict)
                 #------------------------------------------------------------------
             except Exception as e:
                 err_string = "\nError calling method '{0}' of class '{1}':\n{2}"\
@@ -11,14 +11,15 @@ Author: Christian Muenker
 """
 
 from __future__ import division, unicode_literals, print_function, absolute_import
+import sys, platform
 from collections import defaultdict
 from .frozendict import freeze_hierarchical
-from .compat import QSysInfo
+from .design_cache import canonical_hash
 #import importlib
-#import logging
+import logging
 #import six
 
-#logger = logging.getLogger(__name__)
+logger = logging.getLogger(__name__)
 # Project base directory
 base_dir = ""
 
@@ -211,13 +212,152 @@ fil_init = {'rt':'LP', 'ft':'FIR', 'fc':'equiripple', 'fo':'man',
             }
 
 
+#------------------------------------------------------------------------------
+class FilterDict(defaultdict):
+    """
+    Filter dictionary that records which keys have been changed: Widgets
+    declare the keys they depend on (``fil_keys``), the set of changed keys is
+    passed with the signals so that widgets that are not affected by a change
+    can skip updating. A key is only recorded as changed when the new value
+    differs from the old one (compared via ``canonical_hash``).
+
+    Modifications of nested objects in place (e.g.
+    ``fil[0]['q_coeff']['frmt'] = 'hex'``) are not detected, use
+    ``mark_changed()`` or assign a new object instead.
+
+    Entries can also be calculated lazily on first access (see ``set_lazy()``),
+    this is used by ``pyfda_lib.fil_convert()`` for the conversion between
+    'ba', 'zpk' and 'sos' formats. Copying the dict or accessing its values
+    resolves pending entries.
+    """
+    def __init__(self, *args, **kwargs):
+        self._lazy = {} # {key: FilterState} for entries not calculated yet
+        super(FilterDict, self).__init__(*args, **kwargs)
+        self.changed_keys = set(self.keys())
+
+    def __getitem__(self, key):
+        if key in self._lazy:
+            self._resolve(key)
+        return super(FilterDict, self).__getitem__(key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __iter__(self):
+        # overriding __iter__ makes dict(fil) and fil.copy() use __getitem__,
+        # resolving pending entries
+        return super(FilterDict, self).__iter__()
+
+    def values(self):
+        self.resolve_all()
+        return super(FilterDict, self).values()
+
+    def items(self):
+        self.resolve_all()
+        return super(FilterDict, self).items()
+
+    def __setitem__(self, key, value):
+        if key in self._lazy:
+            del self._lazy[key]
+            self.changed_keys.add(key)
+        # entries calculated lazily from this entry are invalidated:
+        for state in set(self._lazy.values()):
+            if key in state.src:
+                state.set_source(key, value)
+        if key not in self or canonical_hash(value) != canonical_hash(dict.__getitem__(self, key)):
+            self.changed_keys.add(key)
+        super(FilterDict, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._lazy.pop(key, None)
+        self.changed_keys.add(key)
+        super(FilterDict, self).__delitem__(key)
+
+    def __missing__(self, key):
+        self.changed_keys.add(key) # key is created with the default value
+        return super(FilterDict, self).__missing__(key)
+
+    def update(self, *args, **kwargs):
+        for k, v in dict(*args, **kwargs).items():
+            self[k] = v
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *args):
+        if key in self:
+            self.changed_keys.add(key)
+            if key in self._lazy:
+                self._resolve(key)
+        return super(FilterDict, self).pop(key, *args)
+
+    def clear(self):
+        self._lazy.clear()
+        self.changed_keys.update(self.keys())
+        super(FilterDict, self).clear()
+
+    def set_lazy(self, key, state):
+        """
+        Calculate the entry ``key`` with ``state.get(key)`` on first access.
+        ``state`` is a ``pyfda_lib.FilterState`` instance, the old value is
+        kept when the calculation fails.
+        """
+        if key not in self:
+            super(FilterDict, self).__setitem__(key, None)
+        self._lazy[key] = state
+        self.changed_keys.add(key)
+
+    def pending_keys(self):
+        """ Return the set of keys whose values have not been calculated yet """
+        return set(self._lazy)
+
+    def _resolve(self, key):
+        state = self._lazy.pop(key)
+        try:
+            super(FilterDict, self).__setitem__(key, state.get(key))
+        except Exception as e:
+            logger.error(e)
+
+    def resolve_all(self):
+        """ Calculate all pending entries """
+        for key in list(self._lazy):
+            self._resolve(key)
+
+    def mark_changed(self, *keys):
+        """ Record ``keys`` as changed, e.g. after modifying nested objects """
+        self.changed_keys.update(keys)
+
+    def pop_changes(self):
+        """
+        Return the set of keys changed since the last call and reset it.
+        """
+        changed = self.changed_keys
+        self.changed_keys = set()
+        return changed
+
+def is_affected(fil_keys, changed):
+    """
+    Return True when a widget depending on the keys ``fil_keys`` of the filter
+    dict needs to be updated after the keys ``changed`` have been modified.
+    ``None`` for ``fil_keys`` (depends on everything) or for ``changed``
+    (unknown changes) always returns True.
+    """
+    return fil_keys is None or changed is None or bool(set(fil_keys) & set(changed))
+
+def fil_default():
+    """ Default value for missing keys of the filter dict """
+    return 0.123
+
 fil = [None] * 10 # create empty list with length 10 for multiple filter designs
 # This functionality is not implemented yet, currently only fil[0] is used
 
 # define fil[0] as a dict with "built-in" default. The argument defines the default
-# factory that is called when a key is missing. Here, lambda simply returns a float.
+# factory that is called when a key is missing, here it simply returns a float.
 # When e.g. list is given as the default_factory, an empty list is returned.
-fil[0] = defaultdict(lambda: 0.123) 
+# A module level function is used instead of a lambda to keep fil[0] picklable.
+fil[0] = FilterDict(fil_default)
 
 # Now, copy each key-value pair into the defaultdict
 for k in fil_init:
@@ -225,22 +365,23 @@ for k in fil_init:
     
 
 """
-Find out which OS and which OS version the application runs under
+Find out which OS and which OS version the application runs under. This is
+determined without Qt (QSysInfo) so that filterbroker can also be imported by
+the headless design engine.
 """
-if hasattr(QSysInfo, "WindowsVersion"):
+if sys.platform.startswith("win"):
     OS = "WIN"
-    OS_ver = QSysInfo.WindowsVersion
+    OS_ver = platform.release()
     cr = "\r\n" # Windows: carriage return + line feed
-elif hasattr(QSysInfo, "MacintoshVersion"):
+elif sys.platform == "darwin":
     OS = "MAC"
-    OS_ver = QSysInfo.MacintoshVersion
+    OS_ver = platform.mac_ver()[0]
     cr = "\r" # Mac: carriage return only
 else:
     OS = "UNIX"
-    OS_ver = None
-    #TODO: Add some info about unix version
+    OS_ver = platform.release()
     cr = "\n" # *nix: line feed only
-print(OS, OS_ver)       
+logger.info("OS: %s %s", OS, OS_ver)       
 
 
 
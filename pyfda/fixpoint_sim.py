@@ -0,0 +1,522 @@
+# -*- coding: utf-8 -*-
+"""
+fixpoint_sim.py
+
+Bit-true fixpoint simulation of filters with numpy, independent of MyHDL:
+All signals are represented by integers with a known number of fractional
+bits, quantization and overflow behaviour are specified by the same
+dictionaries as for ``pyfda_fix_lib.Fixed`` (``'WI'``, ``'WF'``, ``'quant'``
+and ``'ovfl'``).
+
+The following structures are modeled:
+
+- ``FixFIR``: direct form FIR filter
+- ``FixIIR``: direct form I IIR filter (``a[0] = 1`` is implied)
+- ``FixSOS``: cascade of direct form I second-order sections
+
+The signal flow of one filter (section) is
+
+    x -> q_in -> [* b_k, * a_k] -> q_mul -> q_acc (sum) -> q_out -> y
+
+- ``q_in``: quantization of the (float) input signal
+- ``q_coeff``: quantization of the coefficients
+- ``q_mul``: requantization of each product (optional, default: full precision)
+- ``q_acc``: accumulator format (optional, default: full precision), products
+  are requantized to ``q_acc['WF']`` fractional bits, overflows are handled
+  for the sum of all products
+- ``q_out``: requantization of the accumulator for the output and the
+  feedback path
+
+Blocks of samples are processed at once: products and sums of the non-recursive
+part are calculated with vectorized integer arithmetics, only the recursive
+part of IIR filters is calculated sample by sample. The filter state is kept
+between calls of ``process()`` so that long signals can be processed in blocks.
+
+All integer arithmetics is exact using int64, the constructor raises a
+``ValueError`` when the word lengths could exceed 62 bits.
+
+With the settings returned by ``hdl_df1_q()``, ``FixIIR`` and ``FixSOS``
+yield the same results as the hardware description
+``hdl_generation.filter_iir_hdl`` bit by bit, the same applies to ``FixFIR``
+with ``hdl_fir_q()`` and ``hdl_generation.filter_fir_hdl``.
+
+``verify_sos()`` checks the sections of a cascade independently of each other
+in a pool of worker processes, see ``design_sweep`` for the same approach
+with filter designs.
+
+Example
+-------
+
+>>> from pyfda.fixpoint_sim import FixIIR
+>>> flt = FixIIR(b, a, q_coeff={'WI':1, 'WF':14, 'quant':'round', 'ovfl':'sat'},
+...              q_in={'WI':0, 'WF':15}, q_out={'WI':0, 'WF':15, 'ovfl':'sat'})
+>>> y = flt.process(x) # quantized output as floats
+>>> flt.overflows()    # number of overflows for each quantizer
+
+Author: Christian Muenker
+"""
+
+from __future__ import division, unicode_literals, print_function, absolute_import
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.signal as sig
+
+from .pyfda_fix_lib import Fixed
+
+logger = logging.getLogger(__name__)
+
+MAX_BITS = 62 # max. number of bits for int64 arithmetics (incl. sign)
+
+#------------------------------------------------------------------------------
+def _fixed(q_obj):
+    """ Return a `Fixed` instance for the quantization dict `q_obj` (or None) """
+    if q_obj is None:
+        return None
+    return Fixed(dict(q_obj)) # copy, setQobj() adds missing keys to the dict
+
+def quantize(x, Q):
+    """
+    Quantize the float array `x` with the `Fixed` instance `Q`, returning an
+    int64 array in units of the LSB 2**-Q.WF.
+    """
+    return np.asarray(Q.fix(np.asarray(x, dtype=float) * 2.**-Q.WI), dtype=np.int64)
+
+def _count_overflows(Q, n_neg, n_pos):
+    Q.N_over_neg += n_neg
+    Q.N_over_pos += n_pos
+    Q.N_over = Q.N_over_neg + Q.N_over_pos
+
+def requant(x, WF_in, Q, ovfl=True):
+    """
+    Requantize the int64 array `x` with `WF_in` fractional bits to the format
+    of the `Fixed` instance `Q` with exact integer arithmetics. Quantization
+    modes are the same as in `Fixed.fix()` ('round' and 'rint' round half to
+    even like `np.round()`), overflows are counted in `Q`.
+
+    When `ovfl = False`, only the fractional bits are requantized.
+    """
+    x = np.asarray(x, dtype=np.int64)
+    shift = WF_in - Q.WF
+    if shift > 0:
+        if Q.quant == 'floor':
+            x = x >> shift
+        elif Q.quant == 'ceil':
+            x = -((-x) >> shift)
+        elif Q.quant == 'fix':
+            x = np.where(x >= 0, x >> shift, -((-x) >> shift))
+        elif Q.quant in {'round', 'rint'}:
+            q = x >> shift
+            r = x - (q << shift)
+            half = 1 << (shift - 1)
+            x = q + ((r > half) | ((r == half) & (q & 1 == 1)))
+        else:
+            raise ValueError('Requantization type "{0}" is not supported for '
+                             'removing fractional bits!'.format(Q.quant))
+    elif shift < 0:
+        x = x << -shift
+
+    if ovfl and Q.ovfl != 'none':
+        MSB = 1 << (Q.W - 1)
+        over_neg = x < -MSB
+        over_pos = x >= MSB
+        _count_overflows(Q, np.count_nonzero(over_neg), np.count_nonzero(over_pos))
+        if Q.ovfl == 'sat':
+            x = np.clip(x, -MSB, MSB - 1)
+        elif Q.ovfl == 'wrap':
+            x = ((x + MSB) & (2 * MSB - 1)) - MSB
+        else:
+            raise ValueError('Unknown overflow type "{0}"!'.format(Q.ovfl))
+    return x
+
+def _requant_scalar(WF_in, Q, ovfl=True):
+    """
+    Return a function that requantizes a Python integer like `requant()`,
+    used for the sample-by-sample recursion of IIR filters.
+    """
+    shift = WF_in - Q.WF
+    if shift > 0:
+        half = 1 << (shift - 1)
+        if Q.quant == 'floor':
+            quant = lambda x: x >> shift
+        elif Q.quant == 'ceil':
+            quant = lambda x: -((-x) >> shift)
+        elif Q.quant == 'fix':
+            quant = lambda x: x >> shift if x >= 0 else -((-x) >> shift)
+        elif Q.quant in {'round', 'rint'}:
+            def quant(x):
+                q = x >> shift
+                r = x - (q << shift)
+                return q + 1 if r > half or (r == half and q & 1) else q
+        else:
+            raise ValueError('Requantization type "{0}" is not supported for '
+                             'removing fractional bits!'.format(Q.quant))
+    elif shift < 0:
+        quant = lambda x: x << -shift
+    else:
+        quant = None
+
+    if not ovfl or Q.ovfl == 'none':
+        return quant if quant is not None else (lambda x: x)
+    if Q.ovfl not in {'sat', 'wrap'}:
+        raise ValueError('Unknown overflow type "{0}"!'.format(Q.ovfl))
+
+    MSB = 1 << (Q.W - 1)
+    mask = 2 * MSB - 1
+    sat = Q.ovfl == 'sat'
+
+    def requant_ovfl(x):
+        if quant is not None:
+            x = quant(x)
+        if x >= MSB:
+            _count_overflows(Q, 0, 1)
+            return MSB - 1 if sat else ((x + MSB) & mask) - MSB
+        elif x < -MSB:
+            _count_overflows(Q, 1, 0)
+            return -MSB if sat else ((x + MSB) & mask) - MSB
+        return x
+    return requant_ovfl
+
+def hdl_df1_q(W):
+    """
+    Return a dict with the quantization settings ('q_coeff', 'q_coeff_a',
+    'q_in', 'q_out') of the direct form I hardware description
+    ``hdl_generation.filter_iir_hdl`` with word length `W` of the interface:
+    Coefficients and input have `W-1` fractional bits, numerator coefficients
+    are rounded, denominator coefficients are floored (see
+    ``FilterIIR._convert_coefficients``) without limiting their range. The
+    input is truncated like in the testbench, products and accumulator have
+    full precision and the output is floored to `W-1` fractional bits with one
+    integer bit ('yacc[2W:W-1]').
+    """
+    return {'q_coeff':   {'WI':0, 'WF':W-1, 'quant':'round', 'ovfl':'none'},
+            'q_coeff_a': {'WI':0, 'WF':W-1, 'quant':'floor', 'ovfl':'none'},
+            'q_in':      {'WI':0, 'WF':W-1, 'quant':'fix', 'ovfl':'sat'},
+            'q_out':     {'WI':1, 'WF':W-1, 'quant':'floor', 'ovfl':'wrap'}}
+
+def hdl_fir_q(W):
+    """
+    Return a dict with the quantization settings ('q_coeff', 'q_in', 'q_out')
+    of the FIR hardware description ``hdl_generation.filter_fir_hdl`` with
+    word length `W` of the interface, use it with ``FixFIR(b, **hdl_fir_q(W))``.
+    The output is floored to `W-1` fractional bits and wraps around
+    ('acc[2W-1:W-1]'), the results don't depend on the selected structure.
+    """
+    q = hdl_df1_q(W)
+    del q['q_coeff_a']
+    q['q_out'] = {'WI':0, 'WF':W-1, 'quant':'floor', 'ovfl':'wrap'}
+    return q
+
+#------------------------------------------------------------------------------
+class FixIIR(object):
+    """
+    Bit-true model of a direct form I IIR filter, see the module docstring.
+
+    Parameters
+    ----------
+
+    b, a : array_like
+        numerator and denominator coefficients (float), `a[0]` is ignored
+        and assumed to be 1.
+
+    q_coeff, q_in, q_out : dict
+        quantization of coefficients, input and output / feedback signal
+
+    q_mul, q_acc : dict (optional, default: None)
+        requantization of the products and accumulator format, full
+        precision is used when None
+
+    q_coeff_a : dict (optional, default: None)
+        quantization of the denominator coefficients, `q_coeff` is used
+        when None
+    """
+    def __init__(self, b, a, q_coeff, q_in, q_out, q_mul=None, q_acc=None,
+                 q_coeff_a=None):
+        self.Q_in = _fixed(q_in)
+        self.Q_coeff = _fixed(q_coeff)
+        self.Q_coeff_a = _fixed(q_coeff_a) if q_coeff_a is not None else self.Q_coeff
+        self.Q_mul = _fixed(q_mul)
+        self.Q_acc = _fixed(q_acc)
+        self.Q_out = _fixed(q_out)
+
+        self.b = np.atleast_1d(b).astype(float)
+        self.a = np.atleast_1d(a).astype(float)
+        # integer coefficients in units of 2**-WF
+        self.b_int = quantize(self.b, self.Q_coeff)
+        self.a_int = quantize(self.a[1:], self.Q_coeff_a)
+        self.b_q = self.b_int * 2.**-self.Q_coeff.WF # quantized coefficients
+        self.a_q = np.r_[1., self.a_int * 2.**-self.Q_coeff_a.WF]
+
+        self.set_input_format(self.Q_in.W, self.Q_in.WF)
+        self.reset()
+
+    def set_input_format(self, W_x, WF_x):
+        """
+        Set word length `W_x` and number of fractional bits `WF_x` of the integer
+        input signal for `process_int()`, e.g. for the sections of `FixSOS`.
+        """
+        self.W_x, self.WF_x = W_x, WF_x
+        WF_c, WF_a, WF_y = self.Q_coeff.WF, self.Q_coeff_a.WF, self.Q_out.WF
+        # fractional bits of the products
+        self.WF_b_prod = WF_x + WF_c if self.Q_mul is None else self.Q_mul.WF
+        self.WF_a_prod = WF_y + WF_a if self.Q_mul is None else self.Q_mul.WF
+        # fractional bits of the accumulator
+        self.WF_acc = (max(self.WF_b_prod, self.WF_a_prod) if self.Q_acc is None
+                       else self.Q_acc.WF)
+
+        # check that the int64 arithmetics cannot overflow, the coefficients
+        # may need more than W bits when overflows are not handled
+        W_b = int(np.max(np.abs(self.b_int), initial=0)).bit_length() + 1
+        W_a = int(np.max(np.abs(self.a_int), initial=0)).bit_length() + 1
+        n_bits_sum = int(np.ceil(np.log2(len(self.b_int) + len(self.a_int) + 1)))
+        W_prod = max(W_x + W_b, self.Q_out.W + W_a)
+        W_acc = (W_prod + max(self.WF_acc - min(self.WF_b_prod, self.WF_a_prod), 0)
+                 + n_bits_sum)
+        if max(W_prod, W_acc) > MAX_BITS:
+            raise ValueError("Word lengths of {0} bits exceed the max. of {1} bits "
+                             "for int64 arithmetics!".format(max(W_prod, W_acc), MAX_BITS))
+
+    def reset(self):
+        """ Reset the filter state (delayed inputs and outputs) and the overflow counters """
+        self.x_hist = np.zeros(len(self.b_int) - 1, dtype=np.int64)
+        self.y_hist = [0] * len(self.a_int) # y[n-1], y[n-2], ...
+        for Q in (self.Q_in, self.Q_coeff, self.Q_coeff_a, self.Q_mul,
+                  self.Q_acc, self.Q_out):
+            if Q is not None:
+                Q.resetN()
+
+    def overflows(self):
+        """ Return a dict with the number of overflows for each quantizer """
+        return dict((k, int(Q.N_over)) for k, Q in
+                    (('in', self.Q_in), ('mul', self.Q_mul), ('acc', self.Q_acc),
+                     ('out', self.Q_out)) if Q is not None)
+
+#------------------------------------------------------------------------------
+    def process(self, x, to_float=True):
+        """
+        Quantize the float array `x` with `q_in` and filter it.
+
+        Returns
+        -------
+
+        y : ndarray
+            output signal as float (`to_float = True`, default) or as
+            integer in units of the output LSB 2**-q_out['WF']
+        """
+        y_int = self.process_int(quantize(x, self.Q_in))
+        return y_int * 2.**-self.Q_out.WF if to_float else y_int
+
+    def process_int(self, x_int):
+        """
+        Filter the integer input signal `x_int` (in units of 2**-WF_x, see
+        `set_input_format()`) and return the integer output signal.
+        """
+        x_int = np.asarray(x_int, dtype=np.int64).ravel()
+        N = len(x_int)
+        M = len(self.x_hist)
+        x_ext = np.concatenate((self.x_hist, x_int))
+
+        # non-recursive part: sum of the products b_k * x[n-k] in the accumulator
+        acc = np.zeros(N, dtype=np.int64)
+        for k, b_k in enumerate(self.b_int):
+            prod = b_k * x_ext[M - k: M - k + N]
+            if self.Q_mul is not None:
+                prod = requant(prod, self.WF_x + self.Q_coeff.WF, self.Q_mul)
+            acc += requant(prod, self.WF_b_prod, self.Q_acc, ovfl=False) \
+                if self.Q_acc is not None else prod << (self.WF_acc - self.WF_b_prod)
+        if M > 0:
+            self.x_hist = x_ext[N:].copy()
+
+        if len(self.a_int) == 0: # FIR: no recursion, handle accumulator in one go
+            if self.Q_acc is not None:
+                acc = requant(acc, self.WF_acc, self.Q_acc, ovfl=True)
+            return requant(acc, self.WF_acc, self.Q_out)
+
+        return self._recursion(acc)
+
+    def _recursion(self, acc):
+        """ Recursive part of the filter, sample by sample with Python integers """
+        WF_prod = self.Q_out.WF + self.Q_coeff_a.WF
+        q_mul = (_requant_scalar(WF_prod, self.Q_mul)
+                 if self.Q_mul is not None else None)
+        shift_acc = self.WF_acc - self.WF_a_prod
+        q_acc_a = (_requant_scalar(self.WF_a_prod, self.Q_acc, ovfl=False)
+                   if self.Q_acc is not None else None)
+        q_acc = (_requant_scalar(self.WF_acc, self.Q_acc)
+                 if self.Q_acc is not None else None)
+        q_out = _requant_scalar(self.WF_acc, self.Q_out)
+
+        a_int = [int(a_k) for a_k in self.a_int]
+        y_hist = list(self.y_hist)
+        y = np.empty(len(acc), dtype=np.int64)
+        for n, acc_n in enumerate(acc.tolist()):
+            for a_k, y_k in zip(a_int, y_hist):
+                prod = a_k * y_k
+                if q_mul is not None:
+                    prod = q_mul(prod)
+                if q_acc_a is not None:
+                    acc_n -= q_acc_a(prod)
+                else:
+                    acc_n -= prod << shift_acc
+            if q_acc is not None:
+                acc_n = q_acc(acc_n)
+            y_n = q_out(acc_n)
+            y_hist = [y_n] + y_hist[:-1]
+            y[n] = y_n
+        self.y_hist = y_hist
+        return y
+
+#------------------------------------------------------------------------------
+class FixFIR(FixIIR):
+    """
+    Bit-true model of a direct form FIR filter with coefficients `b`, the
+    other parameters are the same as for `FixIIR`. All samples of a block
+    are calculated with vectorized operations.
+    """
+    def __init__(self, b, q_coeff, q_in, q_out, q_mul=None, q_acc=None):
+        super(FixFIR, self).__init__(b, [1.], q_coeff, q_in, q_out,
+                                     q_mul=q_mul, q_acc=q_acc)
+
+#------------------------------------------------------------------------------
+class FixSOS(object):
+    """
+    Bit-true model of a cascade of direct form I second-order sections,
+    `sos` is an array with shape (n_sections, 6) as used by scipy. All sections
+    use the same quantization settings (see `FixIIR`), the output of
+    each section (quantized with `q_out`) is the input of the next section.
+    """
+    def __init__(self, sos, q_coeff, q_in, q_out, q_mul=None, q_acc=None,
+                 q_coeff_a=None):
+        self.sos = np.atleast_2d(sos)
+        self.sections = [FixIIR(s[:3], s[3:], q_coeff, q_in, q_out, q_mul=q_mul,
+                                q_acc=q_acc, q_coeff_a=q_coeff_a) for s in self.sos]
+        self.Q_in = self.sections[0].Q_in
+        self.Q_out = self.sections[-1].Q_out
+        for s in self.sections[1:]:
+            s.set_input_format(self.Q_out.W, self.Q_out.WF)
+
+    def reset(self):
+        """ Reset the state of all sections and the overflow counters """
+        for s in self.sections:
+            s.reset()
+
+    def overflows(self):
+        """ Return a list with the overflow counts of each section, see `FixIIR.overflows()` """
+        return [s.overflows() for s in self.sections]
+
+    def process(self, x, to_float=True):
+        """ Quantize the float array `x` with `q_in` and filter it, see `FixIIR.process()` """
+        y_int = self.process_int(quantize(x, self.Q_in))
+        return y_int * 2.**-self.Q_out.WF if to_float else y_int
+
+    def process_int(self, x_int):
+        """ Filter the integer signal `x_int` (in units of 2**-q_in['WF']) """
+        for s in self.sections:
+            x_int = s.process_int(x_int)
+        return x_int
+
+#------------------------------------------------------------------------------
+def _verify_section(idx, sos_sec, x, q, N_FFT):
+    """
+    Simulate section `idx` with the float input signal `x` and compare it to
+    the floating point filter. This function runs in the worker processes.
+    """
+    q = dict(q)
+    if idx > 0: # the input of the following sections has the output format
+        q['q_in'] = q['q_out']
+    flt = FixIIR(sos_sec[:3], sos_sec[3:], **q)
+    x_q = flt.Q_in.fix(np.asarray(x) * 2.**-flt.Q_in.WI) * 2.**-flt.Q_in.WF
+    y = flt.process(x_q)
+    y_ref = sig.lfilter(sos_sec[:3], sos_sec[3:], x_q) # same input, float coeffs
+
+    P_err = np.sum((y - y_ref)**2)
+    olderr = np.seterr(divide='ignore')
+    SNR = 10 * np.log10(np.sum(y_ref**2) / P_err) if P_err > 0 else np.inf
+    np.seterr(**olderr)
+
+    w, H = sig.freqz(sos_sec[:3], sos_sec[3:], worN=N_FFT)
+    H_q = sig.freqz(flt.b_q, flt.a_q, worN=N_FFT)[1]
+    return {'idx': idx, 'SNR_dB': float(SNR), 'overflows': flt.overflows(),
+            'H_dev': float(np.max(np.abs(H_q - H)) / np.max(np.abs(H))),
+            'b_q': flt.b_q, 'a_q': flt.a_q}
+
+def verify_sos(sos, q, x=None, x_stages=None, max_workers=None, N_FFT=512):
+    """
+    Verify a cascade of fixpoint second-order sections section by section:
+    The input signals of all sections (inter-stage signals) are recorded with
+    a floating point simulation of the cascade (or passed in `x_stages`, e.g.
+    from an HDL simulation), then each section is simulated bit-true in a
+    pool of worker processes.
+
+    Parameters
+    ----------
+
+    sos : array_like
+        second-order sections with shape (n_sections, 6)
+
+    q : dict
+        quantization settings with the keys 'q_coeff', 'q_in', 'q_out' and
+        optionally 'q_mul', 'q_acc', 'q_coeff_a', see `FixIIR`. The input of
+        the sections after the first one is quantized with 'q_out'.
+
+    x : array_like (optional, default: None)
+        input signal of the cascade, uniform white noise with 10000 samples
+        in the range -0.5 ... 0.5 when None
+
+    x_stages : list of array_like (optional, default: None)
+        recorded input signals of all sections, `x` is not used when given
+
+    max_workers : int (optional, default: None)
+        Number of worker processes, default is the number of cores. With
+        ``max_workers = 1``, all sections are simulated in the current process.
+
+    N_FFT : int (optional, default: 512)
+        number of frequency points for comparing the frequency responses
+
+    Returns
+    -------
+
+    results : list of dicts, one per section with the keys
+
+        'idx' : index of the section
+
+        'SNR_dB' : ratio of output signal and quantization noise in dB,
+        compared to the float section with the same (quantized) input
+
+        'overflows' : overflow counts, see `FixIIR.overflows()`
+
+        'H_dev' : max. deviation of the frequency response with quantized
+        coefficients, relative to the max. magnitude of the section
+
+        'b_q', 'a_q' : quantized coefficients
+    """
+    sos = np.atleast_2d(sos).astype(float)
+    if x_stages is None:
+        if x is None:
+            x = np.random.uniform(-0.5, 0.5, 10000)
+        x_stages = [np.asarray(x, dtype=float)]
+        for sec in sos[:-1]: # record the inter-stage signals
+            x_stages.append(sig.lfilter(sec[:3], sec[3:], x_stages[-1]))
+    if len(x_stages) != len(sos):
+        raise ValueError("Number of inter-stage signals ({0}) and sections ({1}) "
+                         "differ!".format(len(x_stages), len(sos)))
+
+    if max_workers == 1:
+        return [_verify_section(i, sos[i], x_stages[i], q, N_FFT)
+                for i in range(len(sos))]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_verify_section, i, sos[i], x_stages[i], q, N_FFT)
+                   for i in range(len(sos))]
+        return [f.result() for f in futures]
+
+###############################################################################
+
+if __name__ == '__main__':
+    import scipy.signal as sig
+    b, a = sig.ellip(2, 0.5, 40, 0.2)
+    flt = FixIIR(b, a, **hdl_df1_q(16))
+    x = np.random.uniform(-0.5, 0.5, 1000)
+    y = flt.process(x)
+    print(np.max(np.abs(y - sig.lfilter(flt.b_q, flt.a_q, x))), flt.overflows())
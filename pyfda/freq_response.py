@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""
+freq_response.py
+
+Shared frequency response of the current filter: The plot widgets and the
+filter info widget all need the frequency response H(e^jW) of the same
+filter at the same frequency grid. Instead of calling ``sig.freqz()`` in each
+widget, the response is calculated once by the module instance ``freq_resp``
+and handed out as read-only arrays. Magnitude, unwrapped phase and group
+delay are derived on demand from the same response and cached as well.
+
+Responses are identified by a hash over the coefficients, the number of
+frequency points and the frequency range (whole / half unit circle), so a
+new design automatically yields a new response.
+
+When second-order sections are available (IIR designs with ``FRMT = 'sos'``),
+the response is evaluated section by section: H is the product of the
+section responses, phase and group delay are the sums of the section phases
+and group delays. The polynomial form [b, a] of high order filters (e.g. an
+order 60 elliptic band stop) is numerically unreliable, the cascade form
+is not.
+
+For zoomed views, ``get()`` accepts a frequency span: the response is then
+evaluated at ``N_FFT`` points within the span only, using the chirp-Z
+transform (see ``czt_poly()``) instead of evaluating a much denser grid around
+the whole unit circle.
+
+Example
+-------
+
+>>> from pyfda.freq_response import freq_resp
+>>> resp = freq_resp.get(fb.fil[0]['ba'], N_FFT=2048, whole=True)
+>>> plt.plot(resp.W, resp.H_abs)
+
+Author: Christian Muenker
+"""
+
+from __future__ import division, unicode_literals, print_function, absolute_import
+import logging
+from collections import OrderedDict
+
+import numpy as np
+import scipy.signal as sig
+
+from .design_cache import canonical_hash
+from .pyfda_lib import grpdelay
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------------------
+def _read_only(arr):
+    """ Make numpy array ``arr`` read-only and return it """
+    arr.flags.writeable = False
+    return arr
+
+def czt_poly(c, W_start, W_stop, N):
+    """
+    Evaluate the polynomial ``sum_n c[n] exp(-j W n)`` at ``N`` equidistant
+    frequencies ``W = W_start ... W_stop`` (including both end points) using the
+    chirp-Z transform (Bluestein's algorithm). This costs O(M log M) with
+    M >= len(c) + N - 1 instead of O(len(c) * N) for the direct evaluation.
+
+    The substitution ``n k = (n^2 + k^2 - (k-n)^2) / 2`` turns the sum into a
+    convolution of the modulated coefficients with a chirp, calculated via FFT.
+
+    Returns
+    -------
+
+    W : ndarray
+        the frequencies
+
+    P : ndarray (complex)
+        the values of the polynomial at W
+    """
+    c = np.atleast_1d(c).astype(complex)
+    L = len(c)
+    W = np.linspace(W_start, W_stop, N)
+    if L * N < 4096: # direct evaluation is faster for short polynomials
+        return W, np.polyval(c[::-1], np.exp(-1j * W))
+
+    dW = W[1] - W[0] if N > 1 else 0.
+    M = int(2 ** np.ceil(np.log2(L + N - 1))) # FFT length
+    n = np.arange(L)
+    y = np.zeros(M, dtype=complex)
+    y[:L] = c * np.exp(-1j * (W_start * n + dW * n**2 / 2.))
+    m = np.arange(-(L - 1), N)
+    v = np.zeros(M, dtype=complex)
+    v[m % M] = np.exp(0.5j * dW * m**2) # chirp for indices -(L-1) ... N-1
+    k = np.arange(N)
+    P = np.fft.ifft(np.fft.fft(y) * np.fft.fft(v))[:N] * np.exp(-0.5j * dW * k**2)
+    return W, P
+
+def _sos_freqz(sos, worN, whole=False):
+    """
+    Return the frequencies ``w`` and an array ``H_sec`` with the frequency
+    response of each section in ``sos`` (one row per section).
+    """
+    sos = np.atleast_2d(sos)
+    H_sec = []
+    for sec in sos:
+        w, H = sig.freqz(sec[:3], sec[3:], worN=worN, whole=whole)
+        H_sec.append(H)
+    return w, np.array(H_sec)
+
+def freqz_cascade(sos, worN=512, whole=False):
+    """
+    Frequency response of a cascade of second-order sections, evaluated section
+    by section. Parameters and return values are the same as for ``sig.freqz``,
+    with ``sos`` being an array of shape (n_sections, 6).
+    """
+    w, H_sec = _sos_freqz(sos, worN, whole)
+    return w, np.prod(H_sec, axis=0)
+
+#------------------------------------------------------------------------------
+class Response(object):
+    """
+    Frequency response of a filter at ``N_FFT`` frequency points, either from
+    0 ... 2 pi (``whole = True``) or 0 ... pi (``whole = False``). When ``sos``
+    is not empty, the response is evaluated as a cascade of second-order
+    sections and ``ba`` is not used.
+
+    When ``span = (W_start, W_stop)`` is given, the response is calculated at
+    ``N_FFT`` points from W_start to W_stop (including both end points)
+    instead, ``whole`` is ignored.
+
+    With ``verbose = True``, warnings are printed when the group delay is
+    singular.
+
+    All arrays are read-only, use e.g. ``np.copy(resp.H)`` or arithmetic
+    operations that create new arrays when modifications are needed.
+
+    Attributes
+    ----------
+
+    W : ndarray
+        angular frequencies (normalized to f_S / 2 pi)
+
+    H : ndarray (complex)
+        complex frequency response H(e^jW)
+
+    H_abs : ndarray
+        magnitude response abs(H), calculated on first access
+
+    phi : ndarray
+        unwrapped phase in rad, calculated on first access. nan and inf values
+        of H are replaced by finite values before calculating the phase.
+
+    tau_g : ndarray
+        group delay in samples, calculated on first access
+    """
+    def __init__(self, ba, N_FFT, whole, sos=None, span=None, verbose=False):
+        self.ba = ba
+        self.N_FFT = N_FFT
+        self.whole = whole
+        self.span = span
+        self.verbose = verbose # print warnings when the group delay is singular
+        if sos is not None and len(sos) > 0:
+            self.sos = np.atleast_2d(sos)
+            if span is None:
+                [W, self.H_sec] = _sos_freqz(self.sos, N_FFT, whole)
+            else: # sections are short, evaluate them directly on the span
+                W = np.linspace(span[0], span[1], N_FFT)
+                self.H_sec = _sos_freqz(self.sos, W)[1]
+            H = np.prod(self.H_sec, axis=0)
+        else:
+            self.sos = None
+            if span is None:
+                [W, H] = sig.freqz(ba[0], ba[1], worN=N_FFT, whole=whole)
+            else:
+                W, B = czt_poly(ba[0], span[0], span[1], N_FFT)
+                H = B / czt_poly(ba[1], span[0], span[1], N_FFT)[1]
+        self.W = _read_only(W)
+        self.H = _read_only(H)
+        self._H_abs = self._phi = self._tau_g = None
+
+    @property
+    def H_abs(self):
+        if self._H_abs is None:
+            self._H_abs = _read_only(np.abs(self.H))
+        return self._H_abs
+
+    @property
+    def phi(self):
+        if self._phi is None:
+            # replace nan and inf by finite values, otherwise np.unwrap yields
+            # an array full of nans
+            if self.sos is None:
+                self._phi = _read_only(np.unwrap(np.angle(np.nan_to_num(self.H))))
+            else: # sum of the unwrapped phases of all sections
+                self._phi = _read_only(np.sum(np.unwrap(
+                    np.angle(np.nan_to_num(self.H_sec)), axis=1), axis=0))
+        return self._phi
+
+    @property
+    def tau_g(self):
+        if self._tau_g is None:
+            # for whole = False, grpdelay evaluates 2 * N_FFT points around the
+            # whole unit circle, the first N_FFT points form the same grid as W
+            if self.sos is None:
+                tau_g = self._grpdelay(self.ba[0], self.ba[1])
+            else: # sum of the group delays of all sections
+                tau_g = 0
+                for sec in self.sos:
+                    tau_g = tau_g + self._grpdelay(sec[:3], sec[3:])
+            self._tau_g = _read_only(tau_g[:self.N_FFT])
+        return self._tau_g
+
+    def _grpdelay(self, b, a):
+        """ Group delay of b / a on the frequency grid of the response """
+        if self.span is None:
+            return grpdelay(b, a, self.N_FFT, whole=self.whole, verbose=self.verbose)[1]
+        # same algorithm as in pyfda_lib.grpdelay, evaluated on the span
+        b, a = np.atleast_1d(b), np.atleast_1d(a)
+        c = np.convolve(b, a[::-1])
+        num = czt_poly(c * np.arange(c.size), self.span[0], self.span[1], self.N_FFT)[1]
+        den = czt_poly(c, self.span[0], self.span[1], self.N_FFT)[1]
+        singular = np.absolute(den) < 100 * np.spacing(1)
+        gd = np.zeros(self.N_FFT)
+        gd[~singular] = np.real(num[~singular] / den[~singular]) - a.size + 1
+        return gd
+
+#------------------------------------------------------------------------------
+class FreqResponse(object):
+    """
+    LRU cache for the frequency responses of filters.
+
+    Parameters
+    ----------
+
+    size : int (optional, default: 8)
+        Max. number of responses kept in memory
+    """
+    def __init__(self, size=8):
+        self.size = size
+        self.responses = OrderedDict() # {hash: Response}
+
+    def get(self, ba, N_FFT=2048, whole=True, sos=None, span=None, verbose=False):
+        """
+        Return the ``Response`` instance for the coefficients ``ba = [b, a]``
+        or the second-order sections ``sos``; it is calculated only when it is
+        not in the cache yet.
+
+        Parameters
+        ----------
+
+        ba : list or tuple of array_like
+            numerator and denominator coefficients [b, a]
+
+        N_FFT : int (optional, default: 2048)
+            number of frequency points
+
+        whole : bool (optional, default: True)
+            Calculate the response from 0 ... 2 pi when True, else from 0 ... pi
+
+        sos : array_like (optional, default: None)
+            second-order sections; when not empty, the response is evaluated
+            as a cascade of the sections instead of using ``ba``
+
+        span : tuple of two floats (optional, default: None)
+            (W_start, W_stop): calculate the response at N_FFT points in this
+            range of angular frequencies only, e.g. for a zoomed view.
+            Each span is cached as a separate response.
+
+        verbose : bool (optional, default: False)
+            print warnings when the group delay is singular. The warnings are
+            only printed when the group delay is calculated, hence responses
+            with and without warnings are cached separately.
+
+        Returns
+        -------
+
+        resp : instance of ``Response``
+        """
+        ba = (np.atleast_1d(ba[0]), np.atleast_1d(ba[1]))
+        N_FFT = int(N_FFT)
+        if span is not None:
+            span = (float(span[0]), float(span[1]))
+        if sos is not None and len(sos) > 0:
+            sos = np.atleast_2d(sos)
+            key = canonical_hash(['sos', sos, N_FFT, bool(whole), span, bool(verbose)])
+        else:
+            sos = None
+            key = canonical_hash(['ba', ba, N_FFT, bool(whole), span, bool(verbose)])
+        if key in self.responses:
+            resp = self.responses.pop(key)
+        else:
+            logger.debug("Calculating frequency response with %d points", N_FFT)
+            resp = Response(ba, N_FFT, bool(whole), sos=sos, span=span,
+                            verbose=bool(verbose))
+            while len(self.responses) >= self.size:
+                self.responses.popitem(last=False)
+        self.responses[key] = resp # (re-)insert as newest entry
+        return resp
+
+    def clear(self):
+        """ Remove all responses from the cache """
+        self.responses.clear()
+
+#------------------------------------------------------------------------------
+freq_resp = FreqResponse()
+# This *class instance* of FreqResponse can be accessed in other modules using
+# from pyfda.freq_response import freq_resp
+
+###############################################################################
+
+if __name__ == '__main__':
+    resp = freq_resp.get(sig.butter(4, 0.3), N_FFT=8, whole=False)
+    print(resp.H_abs, resp.tau_g)
@@ -111,19 +111,34 @@ class FrozenDict(frozenset):
             [in]  >>> FrozenDict(original)
             [out] >>> FrozenDict({'x': 3, 'y': 4, 'z': 5})
             [in]  >>> dict(FrozenDict(original))
-            [out] >>> {'x': 3, 'y': 4, 'z': 5}   '''
+            [out] >>> {'x': 3, 'y': 4, 'z': 5}
 
-    __slots__ = ()
+        Besides the set of Items, the key-value pairs are stored in an internal
+        dict `_d` which makes lookups O(1) - searching the Item in the set
+        would require creating new frozensets for every access. `_d` must not
+        be modified, it is not accessible via the public interface.   '''
+
+    __slots__ = ('_d',)
     def __new__(cls, orig={}, **kw):
         if kw:
             d = dict(orig, **kw)
-            items = map(Item, d.items())
         else:
             try:
-                items = map(Item, orig.items())
+                d = dict(orig.items())
             except AttributeError:
-                items = map(Item, orig)
-        return frozenset.__new__(cls, items)
+                d = dict(orig)
+        self = frozenset.__new__(cls, map(Item, d.items()))
+        object.__setattr__(self, '_d', d)
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError("'FrozenDict' object is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("'FrozenDict' object is read-only")
+
+    def __reduce__(self):
+        return (self.__class__, (self._d,))
 
     def __repr__(self):
         cls = self.__class__.__name__
@@ -132,39 +147,28 @@ class FrozenDict(frozenset):
         return '%s({%s})' % (cls, _repr)
 
     def __getitem__(self, key):
-        if key not in self:
-            raise KeyError(key)
-        diff = self.difference
-        item = diff(diff({key}))
-        key, value = set(item).pop()
-        return value
+        return self._d[key]
 
     def get(self, key, default=None):
-        if key not in self:
-            return default
-        return self[key]
+        return self._d.get(key, default)
+
+    def __contains__(self, key):
+        return key in self._d
 
     def __iter__(self):
-        items = frozenset.__iter__(self)
-        return map(lambda i: i.key, items)
+        return iter(self._d)
 
     def keys(self):
-        items = frozenset.__iter__(self)
-        return map(lambda i: i.key, items)
+        return self._d.keys()
 
     def values(self):
-        items = frozenset.__iter__(self)
-        return map(lambda i: i.value, items)
+        return self._d.values()
 
     def items(self):
-        items = frozenset.__iter__(self)
-        return map(tuple, items)
+        return self._d.items()
 
     def copy(self):
-        cls = self.__class__
-        items = frozenset.copy(self)
-        dupl = frozenset.__new__(cls, items)
-        return dupl
+        return self.__class__(self._d)
 
     @classmethod
     def fromkeys(cls, keys, value):
@@ -189,48 +193,44 @@ class FrozenDict(frozenset):
 
 
 
+def _rebuild_class(cls, subcls):
+    """
+    Return a new class with the name, bases and members of `cls`, extended by
+    the members defined in its subclass `subcls`. The descriptors for the
+    slots of `cls` and for ``__dict__`` / ``__weakref__`` of `subcls` are
+    recreated by ``type()``, copying them would make ``type()`` fail.
+    """
+    ns = dict(cls.__dict__)
+    ns.update((k, v) for k, v in subcls.__dict__.items() if k != '__doc__')
+    for k in tuple(cls.__slots__) + ('__dict__', '__weakref__'):
+        ns.pop(k, None)
+    return type(cls.__name__, cls.__bases__, ns)
+
+
 if version == 2:
     #Here are the Python2 modifications
     class Python2(FrozenDict):
-        def __iter__(self):
-            items = frozenset.__iter__(self)
-            for i in items:
-                yield i.key
-
         def iterkeys(self):
-            items = frozenset.__iter__(self)
-            for i in items:
-                yield i.key
+            return self._d.iterkeys()
 
         def itervalues(self):
-            items = frozenset.__iter__(self)
-            for i in items:
-                yield i.value
+            return self._d.itervalues()
 
         def iteritems(self):
-            items = frozenset.__iter__(self)
-            for i in items:
-                yield (i.key, i.value)
+            return self._d.iteritems()
 
         def has_key(self, key):
-            return key in self
+            return key in self._d
 
         def viewkeys(self):
-            return dict(self).viewkeys()
+            return self._d.viewkeys()
 
         def viewvalues(self):
-            return dict(self).viewvalues()
+            return self._d.viewvalues()
 
         def viewitems(self):
-            return dict(self).viewitems()
+            return self._d.viewitems()
 
     #If this is Python2, rebuild the class
     #from scratch rather than use a subclass
-    py3 = FrozenDict.__dict__
-    py3 = {k: py3[k] for k in py3}
-    py2 = {}
-    py2.update(py3)
-    dct = Python2.__dict__
-    py2.update({k: dct[k] for k in dct})
-
-    FrozenDict = type('FrozenDict', (frozenset,), py2)
\ No newline at end of file
+    FrozenDict = _rebuild_class(FrozenDict, Python2)
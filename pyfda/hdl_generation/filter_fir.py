@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+FIR Hardware Filter Generation
+==============================
+
+Object that encapsulates the design and configuration of an FIR filter, the
+hardware description is ``filter_fir_hdl``. Conversion to Verilog / VHDL,
+simulation of the frequency response and plotting are inherited from
+``FilterIIR``.
+
+How to use this module
+-----------------------
+
+   >>> flt = FilterFIR(b, word_format=(16, 0, 15), structure='transposed')
+   >>> flt.hdl_target = 'vhdl'
+   >>> flt.convert()
+
+Author: Christian Muenker
+"""
+
+from __future__ import division, unicode_literals, print_function, absolute_import
+import logging
+logger = logging.getLogger(__name__)
+
+import numpy as np
+from numpy import pi
+from scipy import signal
+
+from .filter_iir import FilterIIR
+from .filter_fir_hdl import filter_fir_hdl
+from .fir_arch import FIR_STRUCTURES, symmetry
+from .hdl_estimate import estimate_fir
+
+#------------------------------------------------------------------------------
+class FilterFIR(FilterIIR):
+    def __init__(self, b, word_format=(24,0), sample_rate=1,
+                 structure='direct', use_symmetry=True, csd=False):
+        """
+        Generate the HDL of an FIR filter with the coefficients `b`, the
+        coefficients are passed as floating-point values and converted to
+        fixed-point using the format defined in `word_format` (see `FilterIIR`).
+
+        Arguments
+        ---------
+          b: array_like
+              the filter coefficients
+
+          word_format: tuple (WL, IWL, FWL)
+              fixed-point word format
+
+          structure: str
+              'direct', 'transposed' or 'tree' (pipelined adder tree)
+
+          use_symmetry: bool
+              halve the number of multipliers for (anti)symmetric coefficients
+
+          csd: bool
+              use CSD shift-add networks instead of multipliers
+        """
+        if structure not in FIR_STRUCTURES:
+            raise ValueError("Unknown FIR structure '{0}', use one of {1}"
+                             .format(structure, FIR_STRUCTURES))
+        w = word_format
+        self.word_format = w
+        self.max = int(2**(w[0]-1))
+        self.min = int(-1*self.max)
+
+        # properties that are set/configured
+        self._sample_rate = 1
+        self._clock_frequency = 20
+        self._shared_multiplier = False
+        self.structure = structure
+        self.use_symmetry = use_symmetry
+        self.csd = csd
+
+        self.Nfft = 1024
+
+        # conversion attributes
+        self.hdl_name = 'name'
+        self.hdl_directory = 'directory'
+        self.hdl_target = 'verilog' # or 'vhdl'
+
+        # create the fixed-point (integer) version of the coefficients
+        self._convert_coefficients(b)
+
+        # used by the RTL simulation to generate freq response
+        self.yfavg, self.xfavg, self.pfavg = None, None, None
+
+        self.reset_model()
+        self.first_pass = True
+
+    def _convert_coefficients(self, b):
+        """ Convert the coefficients to fixed-point (integer) """
+        if len(self.word_format) == 2 and self.word_format[1] != 0:
+            raise NotImplementedError
+        elif (len(self.word_format) == 3 and
+              self.word_format[1] != 0 and
+              self.word_format[2] != self.word_format[1]-1):
+            raise NotImplementedError
+
+        self.is_sos = False
+        self.n_section = 1
+        self.b = np.atleast_1d(np.asarray(b, dtype=float))
+        self.a = np.ones(1)
+
+        # fixed-point coefficients, rounded like the numerator of FilterIIR
+        self.fxb = np.round(self.b * self.max)/self.max
+        self.w, self.h = signal.freqz(self.fxb)
+        self.hz = (self.w/(2*pi) * self._sample_rate)
+
+        # Create the integer version
+        self.fxb = tuple(map(int, self.fxb*self.max))
+        self.fxa = (self.max,)
+
+        self.symmetry = symmetry(self.fxb) if self.use_symmetry else 0
+        logger.debug("FIR with {0} taps: {1}".format(len(self.fxb), self.estimate()))
+
+    def estimate(self):
+        """Estimate hardware resources and timing, see `FilterIIR.estimate`
+        """
+        return estimate_fir(self.fxb, self.word_format[0], self.structure,
+                            use_symmetry=self.use_symmetry, csd=self.csd)
+
+    def hdl_options(self):
+        """Architecture options that change the generated HDL
+        """
+        return {'structure': self.structure, 'use_symmetry': bool(self.use_symmetry),
+                'csd': bool(self.csd)}
+
+    def reset_model(self):
+        """Reset the state of the floating-point golden model
+        """
+        self.zi_model = np.zeros(max(len(self.b) - 1, 0))
+
+    def filter_model(self, x):
+        """Floating-point FIR filter model
+        Filters a block of samples `x` (scalar or array) with the
+        floating-point coefficients, the filter state is kept between calls.
+        """
+        if len(self.b) == 1:
+            y = self.b[0] * np.atleast_1d(x)
+        else:
+            y, self.zi_model = signal.lfilter(self.b, 1., np.atleast_1d(x),
+                                              zi=self.zi_model)
+        return y if np.ndim(x) else y[0]
+
+    def get_hdl(self, clock, reset, sigin, sigout):
+        return filter_fir_hdl(clock, reset, sigin, sigout, coefficients=self.fxb,
+                              structure=self.structure,
+                              use_symmetry=self.use_symmetry, csd=self.csd)
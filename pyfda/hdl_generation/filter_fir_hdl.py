@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Hardware description of FIR filters with selectable structure: direct form,
+transposed form and direct form with pipelined adder tree, see ``fir_arch``.
+
+Symmetric and antisymmetric coefficients are exploited by adding /
+subtracting the taps with the same coefficient before the multiplication
+(direct form and adder tree) or by using each product twice (transposed form),
+halving the number of multipliers. Optionally, the constant multipliers are
+replaced by canonical signed digit (CSD) shift-add networks.
+
+The interfaces and the fixed-point format are the same as for
+``filter_iir_hdl``: input, output and coefficients have `W-1` fractional
+bits, products and sums are calculated with full precision and the output
+is floored to `W-1` fractional bits and wraps around on overflow.
+
+Author: Christian Muenker
+"""
+
+from __future__ import division, unicode_literals, print_function, absolute_import
+import logging
+logger = logging.getLogger(__name__)
+
+from myhdl import Signal, always_seq, always_comb, intbv
+
+from .fir_arch import (FIR_STRUCTURES, symmetry, fold_taps, csd_terms,
+                       adder_tree, tree_levels)
+
+#------------------------------------------------------------------------------
+# building blocks, each generator drives exactly one signal
+#------------------------------------------------------------------------------
+def _delay(clock, reset, d, q, enable):
+    """ register `q` <- `d`, enabled by `enable` """
+    @always_seq(clock.posedge, reset=reset)
+    def rtl_delay():
+        if enable:
+            q.next = d
+    return rtl_delay
+
+def _pipe(clock, reset, d, q):
+    """ pipeline register `q` <- `d` """
+    @always_seq(clock.posedge, reset=reset)
+    def rtl_pipe():
+        q.next = d
+    return rtl_pipe
+
+def _add(a, b, s, sign=1):
+    """ combinatorial adder / subtractor `s` = `a` +/- `b` """
+    if sign > 0:
+        @always_comb
+        def rtl_add():
+            s.next = a + b
+        return rtl_add
+    else:
+        @always_comb
+        def rtl_sub():
+            s.next = a - b
+        return rtl_sub
+
+def _add_reg(clock, reset, a, b, s):
+    """ registered adder `s` <- `a` + `b` """
+    @always_seq(clock.posedge, reset=reset)
+    def rtl_add_reg():
+        s.next = a + b
+    return rtl_add_reg
+
+def _mult(x, p, c, WF, csd, dmax):
+    """
+    Multiplication `p` = `c` * `x` with the constant integer `c`, either with
+    a multiplier or with a CSD shift-add network
+    """
+    if not csd:
+        @always_comb
+        def rtl_mult():
+            p.next = c * x
+        return rtl_mult
+
+    gens = []
+    terms = csd_terms(c, WF)
+    t = [Signal(intbv(0, min=-dmax, max=dmax)) for _ in terms] # shifted inputs
+    for (shift, _), ti in zip(terms, t):
+        gens.append(_shift(x, ti, shift))
+    if terms[0][1] > 0:
+        s = t[0]
+    else:
+        s = Signal(intbv(0, min=-dmax, max=dmax))
+        gens.append(_neg(t[0], s))
+    for (_, sign), ti in zip(terms[1:], t[1:]):
+        s_next = Signal(intbv(0, min=-dmax, max=dmax))
+        gens.append(_add(s, ti, s_next, sign))
+        s = s_next
+    gens.append(_assign(s, p))
+    return gens
+
+def _shift(x, t, shift):
+    @always_comb
+    def rtl_shift():
+        t.next = x << shift
+    return rtl_shift
+
+def _neg(a, s):
+    @always_comb
+    def rtl_neg():
+        s.next = -a
+    return rtl_neg
+
+def _assign(a, s):
+    @always_comb
+    def rtl_assign():
+        s.next = a
+    return rtl_assign
+
+def _sum_tree(clock, reset, terms, acc, dmax, pipelined):
+    """
+    Balanced adder tree `acc` = sum(`terms`), with a register stage after
+    each level when `pipelined` is True
+    """
+    gens = []
+    for level in adder_tree(len(terms)):
+        outs = []
+        for pair in level:
+            if len(pair) == 1 and not pipelined:
+                outs.append(terms[pair[0]]) # pass on to the next level
+                continue
+            s = Signal(intbv(0, min=-dmax, max=dmax))
+            if len(pair) == 1:
+                gens.append(_pipe(clock, reset, terms[pair[0]], s))
+            elif pipelined:
+                gens.append(_add_reg(clock, reset, terms[pair[0]], terms[pair[1]], s))
+            else:
+                gens.append(_add(terms[pair[0]], terms[pair[1]], s))
+            outs.append(s)
+        terms = outs
+    gens.append(_assign(terms[0], acc))
+    return gens
+
+#------------------------------------------------------------------------------
+def filter_fir_hdl(clock, reset, sigin, sigout, coefficients=None,
+                   structure='direct', use_symmetry=True, csd=False):
+    """ Hardware description of an FIR filter
+
+    Ports
+    -----
+      clock: system global synchronous clock
+      reset: system global reset
+      sigin: digital input signal
+      sigout: digital output signal
+
+    Parameters
+    ----------
+      coefficients: tuple of int
+          coefficients in fixed-point format, scaled by 2**(W-1)
+
+      structure: str
+          'direct', 'transposed' or 'tree' (direct form with pipelined
+          adder tree)
+
+      use_symmetry: bool
+          share multipliers for taps with the same (or negated) coefficients
+          of (anti)symmetric filters
+
+      csd: bool
+          use CSD shift-add networks instead of multipliers
+    """
+    b = coefficients
+    try:
+        assert sigin.word_format == sigout.word_format
+        w = sigin.word_format
+        assert isinstance(w, tuple), "Fixed-Point format (W) should be a 2-element tuple"
+        assert structure in FIR_STRUCTURES,\
+            "Unknown FIR structure '{0}'".format(structure)
+        assert isinstance(b, tuple) and len(b) > 0,\
+            "Coefficients should be a tuple, but are b = {0}".format(b)
+        assert False not in [isinstance(bi, int) for bi in b],\
+            "All b coefficients must be type int (fixed-point)"
+    except AssertionError as e:
+        logger.warn(e)
+        return None
+
+    W = w[0]
+    N = len(b)
+    sym = symmetry(b) if use_symmetry else 0
+    taps = fold_taps(b, sym)
+
+    # full width based on operations
+    dmax = 2**(2*W + tree_levels(N) + 1)
+    # the input and output word lengths are the same size, these are used to
+    # determine the slice of the full precision accumulator
+    ql, qu = W-1, 2*W-1
+
+    # locally reference the interface signals
+    x, xdv = sigin.data, sigin.data_valid
+    y, ydv = sigout.data, sigout.data_valid
+
+    acc = Signal(intbv(0, min=-dmax, max=dmax))
+    dv_out = xdv
+    gens = []
+
+    if structure == 'transposed':
+        # one product per folded tap, each product is used for both taps
+        prods = [Signal(intbv(0, min=-dmax, max=dmax)) for _ in taps]
+        term = [None] * N # (product, sign) at each tap position
+        for (c, k1, k2), p in zip(taps, prods):
+            gens.append(_mult(x, p, c, W-1, csd, dmax))
+            term[k1] = (p, 1)
+            if k2 is not None:
+                term[k2] = (p, sym)
+        # chain of registers z[k] = b[k] * x + z[k+1], enabled by data valid
+        z_next = None
+        for k in range(N-1, 0, -1):
+            if term[k] is None and z_next is None:
+                continue
+            z = Signal(intbv(0, min=-dmax, max=dmax))
+            if term[k] is None:
+                gens.append(_delay(clock, reset, z_next, z, xdv))
+            else:
+                if z_next is None:
+                    s = term[k][0]
+                    if term[k][1] < 0:
+                        s = Signal(intbv(0, min=-dmax, max=dmax))
+                        gens.append(_neg(term[k][0], s))
+                else:
+                    s = Signal(intbv(0, min=-dmax, max=dmax))
+                    gens.append(_add(z_next, term[k][0], s, term[k][1]))
+                gens.append(_delay(clock, reset, s, z, xdv))
+            z_next = z
+        if term[0] is None:
+            gens.append(_assign(z_next, acc))
+        elif z_next is None:
+            gens.append(_assign(term[0][0], acc))
+        else:
+            gens.append(_add(z_next, term[0][0], acc, term[0][1]))
+    else:
+        # tapped delay line, tap 0 is the current input sample
+        xd = [x] + [Signal(intbv(0, min=-2**(W-1), max=2**(W-1))) for _ in range(N-1)]
+        for k in range(1, N):
+            gens.append(_delay(clock, reset, xd[k-1], xd[k], xdv))
+
+        prods = []
+        for c, k1, k2 in taps:
+            if k2 is None:
+                u = xd[k1]
+            else: # pre-adder for taps with the same coefficient
+                u = Signal(intbv(0, min=-2**W, max=2**W))
+                gens.append(_add(xd[k1], xd[k2], u, sym))
+            p = Signal(intbv(0, min=-dmax, max=dmax))
+            gens.append(_mult(u, p, c, W-1, csd, dmax))
+            if structure == 'tree': # register the products
+                p_reg = Signal(intbv(0, min=-dmax, max=dmax))
+                gens.append(_pipe(clock, reset, p, p_reg))
+                p = p_reg
+            prods.append(p)
+        if not prods: # all coefficients are zero
+            prods = [Signal(intbv(0, min=-dmax, max=dmax))]
+
+        pipelined = structure == 'tree'
+        gens.append(_sum_tree(clock, reset, prods, acc, dmax, pipelined))
+        if pipelined: # pipeline the data valid signal with the same latency
+            dv = [Signal(bool(0)) for _ in range(tree_levels(len(prods)) + 1)]
+            for k in range(len(dv)):
+                gens.append(_pipe(clock, reset, xdv if k == 0 else dv[k-1], dv[k]))
+            dv_out = dv[-1]
+
+    @always_seq(clock.posedge, reset=reset)
+    def rtl_output():
+        ydv.next = dv_out
+        if dv_out:
+            y.next = acc[qu:ql].signed()
+
+    gens.append(rtl_output)
+    return gens
@@ -30,6 +30,7 @@ http://dsp.stackexchange.com/questions/1605/designing-butterworth-filter-in-matl
 """
 
 import os
+import time
 
 import logging
 logger = logging.getLogger(__name__)
@@ -46,6 +47,8 @@ from scipy import signal
 
 from .filter_intf import FilterInterface
 from .filter_iir_hdl import filter_iir_hdl, filter_iir_sos_hdl
+from .hdl_estimate import estimate_iir
+from .hdl_cache import hdl_cache, add_fingerprint, snapshot, changed_files
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -106,22 +109,16 @@ class FilterIIR(object):
         # used by the RTL simulation to generate freq response
         self.yfavg, self.xfavg, self.pfavg = None, None, None
 
-        # golden model - direct-form I IIR filter using floating-point
-        # coefficients
-        self.iir_sections = [None for _ in range(self.n_section)]
-
+        # golden model - cascade of second-order sections using floating-point
+        # coefficients, evaluated block by block with `signal.sosfilt`
         # @todo: fix this, the default format of `b` and `a` should be
         # @todo: an 2D array.
         if self.n_section == 1:
             b, a = [self.b], [self.a]
         else:
             b, a = self.b, self.a
-
-        # @todo: determine the section used type 1, 2, 3, 4 ...
-        # @todo: _iir_section = _iir_type_one_section if self.form_type == 1 else _iir_type_two_section
-        for ii in range(self.n_section):
-            # @todo: assign the structure type
-            self.iir_sections[ii] = IIRTypeOneSection(b[ii], a[ii])
+        self.sos_model = np.hstack((np.atleast_2d(b), np.atleast_2d(a))).astype(float)
+        self.reset_model()
 
         self.first_pass = True
 
@@ -172,11 +169,12 @@ class FilterIIR(object):
             self.w, self.h = signal.freqz(self.fxb, self.fxa)
             self.hz = (self.w/(2*pi) * self._sample_rate)
         else:
-            self.w = [None for _ in range(self.n_section)]
-            self.h = [None for _ in range(self.n_section)]
-            for ii in range(self.n_section):
-                self.w[ii], self.h[ii] = signal.freqz(self.fxb[ii], self.fxa[ii])
-            self.w, self.h = np.array(self.w), np.array(self.h)
+            # evaluate all sections at once at the frequencies of signal.freqz,
+            # zm contains the powers z^0, z^-1, z^-2 for each frequency
+            w = pi * np.arange(512) / 512.
+            zm = np.exp(-1j * np.outer(np.arange(3), w))
+            self.h = np.dot(self.fxb, zm) / np.dot(self.fxa, zm)
+            self.w = np.tile(w, (self.n_section, 1))
             self.hz = (self.w/(2*pi) * self._sample_rate)
 
         # Create the integer version
@@ -196,17 +194,30 @@ class FilterIIR(object):
         # @todo: check the frequencies to make sure shared is valid
         self._shared_multiplier = val
 
-    def filter_model(self, x):
-        """Floating-point IIR filter models
-        The "iir_sections" are assigned based on the settings, when
-        the filter is simulated an all floating-point simulation is
-        compared to the HDL.
+    def estimate(self):
+        """Estimate hardware resources and timing of the HDL description
+        from the fixed-point coefficients without generating any HDL, see
+        `hdl_estimate`.
+        """
+        return estimate_iir(self.fxb, self.fxa, self.word_format[0],
+                            shared_multiplier=self._shared_multiplier)
+
+    def reset_model(self):
+        """Reset the state of the floating-point golden model
         """
-        for ii in range(self.n_section):
-            x = self.iir_sections[ii].process(x)
-        y = x
+        self.zi_model = np.zeros((self.sos_model.shape[0], 2))
 
-        return y
+    def filter_model(self, x):
+        """Floating-point IIR filter model
+        The golden model filters a block of samples `x` (scalar or array)
+        with the floating-point coefficients. The filter state is kept
+        between calls, consecutive blocks yield the same result as one long
+        block. When the filter is simulated, the all floating-point
+        simulation is compared to the HDL.
+        """
+        y, self.zi_model = signal.sosfilt(self.sos_model, np.atleast_1d(x),
+                                          zi=self.zi_model)
+        return y if np.ndim(x) else y[0]
 
     def get_hdl(self, clock, reset, sigin, sigout):
         if self.is_sos:
@@ -219,9 +230,32 @@ class FilterIIR(object):
                                  shared_multiplier=self._shared_multiplier)
         return hdl
 
-    def convert(self):
+    def hdl_options(self):
+        """Architecture options that change the generated HDL
+        """
+        return {'shared_multiplier': bool(self._shared_multiplier)}
+
+    def fingerprint(self):
+        """Fingerprint of the generated HDL, see `hdl_cache`: hash over the
+        integer coefficients, word format, architecture options, target
+        language and name of the design.
+        """
+        return hdl_cache.fingerprint(type(self).__name__, self.fxb, self.fxa,
+                                     tuple(self.word_format), self.hdl_options(),
+                                     self.hdl_target.lower(), self.hdl_name)
+
+    def convert(self, use_cache=True):
         """Convert the HDL description to Verilog and VHDL.
+        When the design has been converted with the same fingerprint before,
+        the files are copied from `hdl_cache` instead. The fingerprint is
+        written as a header comment into each generated file and returned.
         """
+        key = self.fingerprint()
+        if use_cache and hdl_cache.restore(key, self.hdl_directory):
+            logger.info("HDL unchanged (fingerprint {0}), files restored "
+                        "from cache".format(key))
+            return key
+
         w = self.word_format
         imax = 2**(w[0]-1)
 
@@ -231,19 +265,10 @@ class FilterIIR(object):
             sigin.data, sigin.data_valid = x, xdv
             sigout = FilterInterface(word_format=(len(y), 0, len(y)-1))
             sigout.data, sigout.data_valid = y, ydv
-
-            if self.is_sos:
-                iir_hdl = filter_iir_sos_hdl
-            else:
-                iir_hdl = filter_iir_hdl
-
-            iir = iir_hdl(clock, reset, sigin, sigout,
-                          coefficients=(self.fxb, self.fxa),
-                          shared_multiplier=self._shared_multiplier)
-            return iir
+            return self.get_hdl(clock, reset, sigin, sigout)
 
         clock = Signal(False)
-        reset = ResetSignal(0, active=1, async=False)
+        reset = ResetSignal(0, active=1, isasync=False)
         x = Signal(intbv(0, min=-imax, max=imax))
         y = Signal(intbv(0, min=-imax, max=imax))
         xdv, ydv = Signal(bool(0)), Signal(bool(0))
@@ -257,26 +282,69 @@ class FilterIIR(object):
 
         tofunc.name = self.hdl_name
         tofunc.directory = self.hdl_directory
+        before = snapshot(self.hdl_directory)
         tofunc(filter_iir_top, clock, reset, x, xdv, y, ydv)
 
-    def simulate_freqz(self, num_loops=3, Nfft=1024):
+        files = changed_files(self.hdl_directory, before)
+        for f in files:
+            add_fingerprint(f, key)
+        if files:
+            hdl_cache.store(key, files)
+        return key
+
+    def simulate_freqz(self, num_loops=3, Nfft=1024, trace=True, duty_cycle=None):
         """ simulate the discrete frequency response
         This function will invoke an HDL simulation and capture the
         inputs and outputs of the filter.  The response can be compared
         to the frequency response (signal.freqz) of the coefficients.
+
+        Arguments
+        ---------
+          num_loops: int
+              number of simulated frames with `Nfft` samples each, the FFTs
+              of the frames are averaged
+
+          Nfft: int
+              number of samples per frame
+
+          trace: bool
+              write all signals to `filter_iir_sim.vcd` (default). For fast
+              simulations with many frames, switch tracing off.
+
+          duty_cycle: float or None
+              fraction of clock cycles with valid input data, up to 1 (one
+              sample per clock) for the architecture without shared
+              multiplier. The shared multiplier needs 7 clock cycles per
+              sample. When None, the ratio of sample rate and clock frequency
+              is used (default).
+
+        Returns
+        -------
+          A dict with the number of simulated samples, the wall-clock time
+          of the simulation and the time per sample, also stored in
+          `self.sim_stats`.
         """
         self.Nfft = Nfft
         w = self.word_format[0]
         clock = Signal(bool(0))
-        reset = ResetSignal(0, active=1, async=False)
+        reset = ResetSignal(0, active=1, isasync=False)
         sigin = FilterInterface(word_format=self.word_format)
         sigout = FilterInterface(word_format=self.word_format)
         xf = Signal(0.0)    # floating point version
 
-        # determine the sample rate to clock frequency
-        fs = self._sample_rate
-        fc = self._clock_frequency
-        fscnt_max = fc//fs
+        # determine the number of clock cycles per sample, either from the
+        # sample rate to clock frequency or from the data-valid duty cycle
+        if duty_cycle is None:
+            fs = self._sample_rate
+            fc = self._clock_frequency
+            fscnt_max = fc//fs
+        else:
+            if not 0 < duty_cycle <= 1:
+                raise ValueError('duty cycle must be in the range (0, 1]')
+            if self._shared_multiplier and duty_cycle > 1/7.:
+                raise ValueError('the shared multiplier needs 7 clock cycles '
+                                 'per sample, max. duty cycle is 1/7')
+            fscnt_max = int(round(1./duty_cycle)) - 1
         cnt = Signal(fscnt_max)
 
         def _test_stim():
@@ -307,20 +375,29 @@ class FilterIIR(object):
             def tbstim():
                 ysave = np.zeros(Nfft)
                 xsave = np.zeros(Nfft)
-                psave = np.zeros(Nfft)
+                xfsave = np.zeros(Nfft)
+                xfifo = [] # inputs that have been consumed by the filter
 
                 self.yfavg = np.zeros(Nfft)
                 self.xfavg = np.zeros(Nfft)
                 self.pfavg = np.zeros(Nfft)
+                self.reset_model()
 
                 for ii in range(num_loops):
-                    for jj in range(Nfft):
-                        yield sigin.data_valid.posedge
-                        xsave[jj] = float(sigin.data)/self.max
-                        yield sigout.data_valid.posedge
-                        ysave[jj] = float(sigout.data)/self.max
-                        # grab the response from the floating-point model
-                        psave[jj] = self.filter_model(float(xf))
+                    jj = 0
+                    while jj < Nfft:
+                        # sample the interfaces at each clock edge, this also
+                        # works when data valid is high all the time
+                        yield clock.posedge
+                        if sigin.data_valid:
+                            xfifo.append((float(sigin.data)/self.max, float(xf)))
+                        if sigout.data_valid and xfifo:
+                            xsave[jj], xfsave[jj] = xfifo.pop(0)
+                            ysave[jj] = float(sigout.data)/self.max
+                            jj += 1
+
+                    # response of the floating-point model for the whole frame
+                    psave = self.filter_model(xfsave)
 
                     # remove any zeros
                     xsave[xsave == 0] = 1e-19
@@ -336,13 +413,26 @@ class FilterIIR(object):
 
             return (tbdut, tbclk, tbdv, tbrandom, tbstim,)
 
-        traceSignals.name = 'filter_iir_sim'
-        if os.path.isfile(traceSignals.name+'.vcd'):
-            os.remove(traceSignals.name+'.vcd')
-        gens = traceSignals(_test_stim)
+        if trace:
+            traceSignals.name = 'filter_iir_sim'
+            if os.path.isfile(traceSignals.name+'.vcd'):
+                os.remove(traceSignals.name+'.vcd')
+            gens = traceSignals(_test_stim)
+        else:
+            gens = _test_stim()
+
+        t_start = time.time()
         Simulation(gens).run()
+        t_sim = time.time() - t_start
 
-        return None
+        n_samples = num_loops * Nfft
+        self.sim_stats = {'samples': n_samples, 'time': t_sim,
+                          'time_per_sample': t_sim / n_samples,
+                          'clocks_per_sample': fscnt_max + 1}
+        logger.info("Simulated {0} samples in {1:.3g} s ({2:.3g} ms per sample, "
+                    "{3} clock cycles per sample)".format(n_samples, t_sim,
+                    1000. * t_sim / n_samples, fscnt_max + 1))
+        return self.sim_stats
 
     def plot_response(self, ax):
         # Plot the designed filter response
@@ -373,38 +463,3 @@ class FilterIIR(object):
         ax.set_xlabel('Frequency Normalized Radians')
         ax.legend(('Ideal', 'Quant. Coeff.',
                       'Fixed-P. Sim', 'Floating-P. Sim'))
-
-
-# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-class IIRTypeOneSection(object):
-    def __init__(self, b, a):
-        self.b, self.a = b, a
-        self._fbd = [0. for _ in range(2)]
-        self._ffd = [0. for _ in range(2)]
-
-    def process(self, x):
-        y = x*self.b[0] + \
-            self._ffd[0]*self.b[1] + \
-            self._ffd[1]*self.b[2] - \
-            self._fbd[0]*self.a[1] - \
-            self._fbd[1]*self.a[2]
-
-        self._ffd[1] = self._ffd[0]
-        self._ffd[0] = x
-
-        self._fbd[1] = self._fbd[0]
-        self._fbd[0] = y
-
-        return y
-
-
-# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-class IIRTypeTwoSection(object):
-    def __init__(self, b, a):
-        self.b = b
-        self.a = a
-
-    def process(self, x):
-        # @todo: finish type two ...
-        y = 0
-        return y
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+fir_arch.py
+
+Architecture helpers for the FIR hardware description ``filter_fir_hdl``,
+independent of MyHDL: detection of coefficient symmetry and folding of the
+taps, decomposition of constant coefficients into canonical signed digit
+(CSD) shift-add terms and the layout of adder trees.
+
+The structures of ``filter_fir_hdl`` are
+
+- ``'direct'``: tapped delay line, the products are summed by a combinatorial
+  adder tree, the result is registered.
+- ``'transposed'``: all products use the current input sample, the partial
+  sums are passed along a chain of registers. The critical path consists of
+  one multiplier and one adder, independent of the filter length.
+- ``'tree'``: tapped delay line like ``'direct'`` with registered products and
+  one register stage after each level of the adder tree (pipelined adder tree).
+
+Author: Christian Muenker
+"""
+
+from __future__ import division, unicode_literals, print_function, absolute_import
+import logging
+
+import numpy as np
+
+from pyfda.pyfda_fix_lib import dec2csd
+
+logger = logging.getLogger(__name__)
+
+FIR_STRUCTURES = ('direct', 'transposed', 'tree')
+
+#------------------------------------------------------------------------------
+def symmetry(c):
+    """
+    Return the symmetry of the integer coefficients `c`: 1 for symmetric
+    (``c[k] == c[N-1-k]``), -1 for antisymmetric (``c[k] == -c[N-1-k]``) and
+    0 for coefficients without symmetry. A single coefficient is not
+    considered as symmetric.
+    """
+    c = np.asarray(c)
+    if len(c) < 2:
+        return 0
+    if np.array_equal(c, c[::-1]):
+        return 1
+    if np.array_equal(c, -c[::-1]):
+        return -1
+    return 0
+
+def fold_taps(c, sym):
+    """
+    Fold the taps of a filter with symmetric (``sym = 1``) or antisymmetric
+    (``sym = -1``) coefficients `c`: Pairs of taps with the same coefficient
+    are added (or subtracted) before the multiplication, which halves the
+    number of multipliers.
+
+    Returns
+    -------
+
+    taps : list of tuples
+        ``(coeff, k1, k2)`` for each multiplier: the coefficient and the
+        indices of the delay line taps. `k2` is None for unpaired taps (the
+        center tap of symmetric filters with odd length or all taps when
+        ``sym = 0``). Taps with zero coefficients are omitted.
+    """
+    c = [int(v) for v in c]
+    N = len(c)
+    if sym == 0:
+        return [(c[k], k, None) for k in range(N) if c[k] != 0]
+    taps = [(c[k], k, N-1-k) for k in range(N//2) if c[k] != 0]
+    if N % 2 and c[N//2] != 0: # center tap, always 0 for antisymmetric filters
+        taps.append((c[N//2], N//2, None))
+    return taps
+
+#------------------------------------------------------------------------------
+def csd_terms(c, WF):
+    """
+    Decompose the integer coefficient `c` (scaled by ``2**WF``) into canonical
+    signed digits with ``pyfda_fix_lib.dec2csd``.
+
+    Returns
+    -------
+
+    terms : list of tuples
+        ``(shift, sign)`` with ``c == sum(sign << shift)``, i.e. the product
+        ``c * x`` can be calculated by adding / subtracting shifted versions of
+        ``x``. The list is empty for ``c == 0``.
+    """
+    csd = dec2csd(c * 2.**-WF, WF)
+    int_part, _, frac_part = csd.partition('.')
+    digits = int_part + frac_part
+    # exponent of the last digit is -len(frac_part), scaled by 2**WF
+    shift_0 = WF - len(frac_part)
+    terms = []
+    for i, d in enumerate(reversed(digits)):
+        if d in '+-':
+            terms.append((shift_0 + i, 1 if d == '+' else -1))
+    if sum(s << sh for sh, s in terms) != c:
+        raise ValueError("CSD representation '{0}' does not match coefficient {1}"
+                         .format(csd, c))
+    return terms
+
+def n_adders_csd(c, WF):
+    """ Number of adders / subtractors for the shift-add multiplication with `c` """
+    return max(len(csd_terms(c, WF)) - 1, 0)
+
+#------------------------------------------------------------------------------
+def tree_levels(n):
+    """ Number of adder levels of a balanced tree with `n` inputs """
+    return int(np.ceil(np.log2(n))) if n > 1 else 0
+
+def adder_tree(n):
+    """
+    Layout of a balanced adder tree with `n` inputs.
+
+    Returns
+    -------
+
+    levels : list of lists
+        one list per level with the index pairs of the inputs (referring to
+        the outputs of the previous level) for each adder. An odd element
+        is passed to the next level as a single index ``(i,)``.
+    """
+    levels = []
+    while n > 1:
+        level = [(i, i+1) for i in range(0, n-1, 2)]
+        if n % 2:
+            level.append((n-1,))
+        levels.append(level)
+        n = len(level)
+    return levels
+
+#------------------------------------------------------------------------------
+def latency(structure, n_products):
+    """
+    Latency of the FIR structure in clock cycles from a valid input sample to
+    the corresponding valid output sample with `n_products` multipliers.
+    """
+    if structure == 'tree': # products, adder levels, output register
+        return tree_levels(n_products) + 2
+    elif structure in FIR_STRUCTURES:
+        return 1
+    raise ValueError("Unknown FIR structure '{0}'".format(structure))
+
+###############################################################################
+
+if __name__ == '__main__':
+    print(csd_terms(-93, 7), adder_tree(5))
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+hdl_cache.py
+
+Cache for generated HDL files: The conversion of a filter to Verilog / VHDL
+with MyHDL only depends on the integer coefficients, the word format, the
+architecture options, the target language and the name of the design. These
+are hashed to a fingerprint (see ``design_cache.canonical_hash``), which is
+written as a header comment into each generated file::
+
+    // pyfda fingerprint: 3f0a...   (Verilog)
+    -- pyfda fingerprint: 3f0a...   (VHDL)
+
+When a filter is converted again with the same fingerprint, the files are
+restored from the cache (or left untouched when they are still up to date)
+instead of re-elaborating the design. Files with a different fingerprint in
+the header are stale, i.e. they have been generated for other settings.
+
+Author: Christian Muenker
+"""
+
+from __future__ import division, unicode_literals, print_function, absolute_import
+import os
+import io
+import logging
+from collections import OrderedDict
+
+from pyfda.design_cache import canonical_hash
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_TAG = "pyfda fingerprint:"
+# comment syntax of the HDL files with fingerprint header
+COMMENTS = {'.v': '//', '.sv': '//', '.vhd': '--', '.vhdl': '--'}
+
+#------------------------------------------------------------------------------
+def _comment(path):
+    return COMMENTS.get(os.path.splitext(path)[1].lower())
+
+def add_fingerprint(path, key):
+    """
+    Write the fingerprint `key` as a header comment into the HDL file `path`,
+    files of unknown types are not modified.
+    """
+    comment = _comment(path)
+    if comment is None:
+        return
+    with io.open(path, 'r', encoding='utf-8') as f:
+        txt = f.read()
+    with io.open(path, 'w', encoding='utf-8') as f:
+        f.write("{0} {1} {2}\n".format(comment, FINGERPRINT_TAG, key) + txt)
+
+def read_fingerprint(path):
+    """
+    Return the fingerprint from the header of the HDL file `path` or None
+    when the file doesn't exist or has no fingerprint.
+    """
+    comment = _comment(path)
+    if comment is None or not os.path.isfile(path):
+        return None
+    with io.open(path, 'r', encoding='utf-8') as f:
+        line = f.readline().strip()
+    prefix = "{0} {1}".format(comment, FINGERPRINT_TAG)
+    if line.startswith(prefix):
+        return line[len(prefix):].strip()
+    return None
+
+def is_stale(path, key):
+    """ True when the HDL file `path` has not been generated with fingerprint `key` """
+    return read_fingerprint(path) != key
+
+def snapshot(directory):
+    """ Return a dict {file name: (mtime, size)} of the files in `directory` """
+    if not os.path.isdir(directory):
+        return {}
+    snap = {}
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            st = os.stat(path)
+            snap[name] = (getattr(st, "st_mtime_ns", st.st_mtime), st.st_size)
+    return snap
+
+def changed_files(directory, before):
+    """
+    Return the paths of the files in `directory` that have been created or
+    modified since `before = snapshot(directory)`.
+    """
+    after = snapshot(directory)
+    return sorted(os.path.join(directory, name) for name in after
+                  if before.get(name) != after[name])
+
+#------------------------------------------------------------------------------
+class HDLCache(object):
+    """
+    LRU cache for the contents of generated HDL files.
+
+    Parameters
+    ----------
+
+    size : int (optional, default: 16)
+        Max. number of conversions kept in memory. With ``size = 0``, the
+        cache is disabled.
+    """
+    def __init__(self, size=16):
+        self.size = int(size)
+        self.entries = OrderedDict() # {fingerprint: {file name: content}}
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def fingerprint(*args):
+        """ Return the fingerprint (hex digest) over all arguments """
+        return canonical_hash(list(args))
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+    def store(self, key, paths):
+        """ Store the contents of the generated files `paths` under `key` """
+        if self.size <= 0:
+            return
+        files = {}
+        for path in paths:
+            with io.open(path, 'r', encoding='utf-8') as f:
+                files[os.path.basename(path)] = f.read()
+        self.entries.pop(key, None)
+        self.entries[key] = files
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False) # remove oldest entry
+
+    def restore(self, key, directory):
+        """
+        Copy the files generated with fingerprint `key` to `directory`, files
+        that already carry this fingerprint are not rewritten.
+
+        Returns
+        -------
+
+        hit : bool
+            False when `key` is not in the cache, the files have to be
+            generated then.
+        """
+        if key not in self.entries:
+            self.misses += 1
+            return False
+        files = self.entries.pop(key)
+        self.entries[key] = files # move to the end = newest entry
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        for name, content in files.items():
+            path = os.path.join(directory, name)
+            if _comment(path) is None or is_stale(path, key):
+                with io.open(path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+        self.hits += 1
+        return True
+
+#------------------------------------------------------------------------------
+hdl_cache = HDLCache()
+# This *class instance* of HDLCache can be accessed in other modules using
+# from pyfda.hdl_generation.hdl_cache import hdl_cache
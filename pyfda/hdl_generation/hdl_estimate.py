@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+hdl_estimate.py
+
+Estimation of the hardware resources and the timing of the filter hardware
+descriptions in ``hdl_generation`` from the quantized (integer) coefficients
+and the word length, without converting or synthesizing any HDL. This allows
+fast iterations on word lengths and structures before running the slow
+conversion and synthesis.
+
+Multiplications with zero coefficients are omitted, multiplications with
+powers of two are counted as shifts, i.e. neither as multiplier nor as adder
+(synthesis tools remove them as well).
+
+The estimates are returned as dicts with the keys
+
+- ``'multipliers'``: number of multipliers
+- ``'adders'``: number of adders / subtractors (including the adders of
+  CSD shift-add networks and pre-adders of symmetric FIR filters)
+- ``'acc_bits'``: word length of the accumulator as declared in the
+  hardware description
+- ``'acc_bits_min'``: word length required for the accumulator without
+  internal overflows for the given coefficients
+- ``'latency'``: clock cycles from a valid input to the corresponding
+  valid output sample
+- ``'clocks_per_sample'``: min. number of clock cycles between two input
+  samples, i.e. the max. sample rate is ``f_clk / clocks_per_sample``
+
+Author: Christian Muenker
+"""
+
+from __future__ import division, unicode_literals, print_function, absolute_import
+import logging
+
+import numpy as np
+
+from .fir_arch import symmetry, fold_taps, csd_terms, tree_levels, latency
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------------------
+def _signed_bits(v_max):
+    """ Number of bits of a signed integer for magnitudes up to `v_max` """
+    return int(v_max).bit_length() + 1
+
+def is_trivial(c):
+    """ True when the multiplication with integer `c` needs no multiplier (0 or +/- 2**k) """
+    c = abs(int(c))
+    return c & (c - 1) == 0
+
+#------------------------------------------------------------------------------
+def estimate_fir(b, W, structure='direct', use_symmetry=True, csd=False):
+    """
+    Estimate the resources of ``filter_fir_hdl`` with the integer coefficients
+    `b` (scaled by ``2**(W-1)``) and word length `W` of input and output.
+    """
+    b = [int(c) for c in b]
+    N = len(b)
+    sym = symmetry(b) if use_symmetry else 0
+    taps = fold_taps(b, sym)
+
+    n_prod = len(taps)
+    if csd:
+        n_mult = 0
+        n_adders = sum(len(csd_terms(c, W-1)) - 1 for c, _, _ in taps)
+    else:
+        n_mult = sum(not is_trivial(c) for c, _, _ in taps)
+        n_adders = 0
+    if structure == 'transposed': # one adder per tap in the chain
+        n_adders += max(sum(c != 0 for c in b) - 1, 0)
+    else: # pre-adders and adder tree
+        n_adders += sum(k2 is not None for _, _, k2 in taps) + max(n_prod - 1, 0)
+
+    return {'multipliers': n_mult,
+            'adders': n_adders,
+            'acc_bits': _signed_bits(2**(2*W + tree_levels(N) + 1) - 1),
+            'acc_bits_min': _signed_bits(sum(abs(c) for c in b) * 2**(W-1)),
+            'latency': latency(structure, max(n_prod, 1)),
+            'clocks_per_sample': 1}
+
+def estimate_iir(b, a, W, shared_multiplier=False):
+    """
+    Estimate the resources of ``filter_iir_hdl`` (``filter_iir_sos_hdl`` for
+    2D arrays) with the integer coefficients `b` and `a` (scaled by
+    ``2**(W-1)``, `a[0]` is not used) and word length `W` of input and output.
+    With the shared multiplier, one multiplier per section is used
+    sequentially for all coefficients.
+    """
+    b = np.atleast_2d(np.asarray(b)).astype(np.int64)
+    a = np.atleast_2d(np.asarray(a)).astype(np.int64)
+    n_mult = n_adders = acc_bits_min = 0
+    for bs, as_ in zip(b, a):
+        coeffs = list(bs) + list(as_[1:])
+        n_terms = sum(c != 0 for c in coeffs)
+        if shared_multiplier:
+            n_mult += int(any(not is_trivial(c) for c in coeffs))
+            n_adders += 1 # accumulator
+        else:
+            n_mult += sum(not is_trivial(c) for c in coeffs)
+            n_adders += max(n_terms - 1, 0)
+        # inputs have W bits, the feedback has W + 1 bits (yacc[2W:W-1])
+        acc_max = (np.sum(np.abs(bs)) * 2**(W-1) + np.sum(np.abs(as_[1:])) * 2**W)
+        acc_bits_min = max(acc_bits_min, _signed_bits(acc_max))
+
+    n_sec = len(b)
+    # shared multiplier: stages 0 ... 6, else data valid is delayed by two registers
+    clocks = 7 if shared_multiplier else 1
+    return {'multipliers': n_mult,
+            'adders': n_adders,
+            'acc_bits': _signed_bits(2**(2*W) + 2),
+            'acc_bits_min': acc_bits_min,
+            'latency': n_sec * (7 if shared_multiplier else 2),
+            'clocks_per_sample': clocks}
+
+def format_estimate(est, f_clk=None):
+    """ Return a short multi-line text describing the estimate `est` """
+    txt = ("{multipliers} multipliers, {adders} adders\n"
+           "Accumulator: {acc_bits} bits (min. {acc_bits_min} bits)\n"
+           "Latency: {latency} clock cycles\n".format(**est))
+    if f_clk:
+        txt += "Max. sample rate: {0:.4g} (f_clk = {1:.4g})".format(
+                    f_clk / est['clocks_per_sample'], f_clk)
+    else:
+        txt += "Max. sample rate: f_clk / {0}".format(est['clocks_per_sample'])
+    return txt
+
+###############################################################################
+
+if __name__ == '__main__':
+    print(format_estimate(estimate_fir([3, -5, 7, -5, 3], 8, 'tree')))
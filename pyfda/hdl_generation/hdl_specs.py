@@ -11,7 +11,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 from ..compat import (QWidget, QLabel, QLineEdit, QComboBox, QFont, QPushButton, QFD,
-                      QVBoxLayout, QHBoxLayout, pyqtSignal, QFrame)
+                      QCheckBox, QVBoxLayout, QHBoxLayout, pyqtSignal, QFrame)
 
 import numpy as np
 
@@ -27,6 +27,8 @@ from pyfda.pyfda_lib import extract_file_ext
 from pyfda.pyfda_rc import params
 
 from pyfda.hdl_generation.filter_iir import FilterIIR # IIR filter object
+from pyfda.hdl_generation.filter_fir import FilterFIR # FIR filter object
+from pyfda.hdl_generation.hdl_estimate import format_estimate
 
 
 # see C. Feltons "FPGA IIR Lowpass Direct Form I Filter Generator"
@@ -65,9 +67,8 @@ class HDLSpecs(QWidget):
         ifont.setItalic(True)
 
         lblMsg = QLabel("Warning! This feature is only experimental, "
-        "only HDL code for second order IIR filters under the name siir_hdl.v "
-        " resp. siir_hdl.vhd are created at the moment. Files are saved "
-        " in the pyFDA root directory.", self)
+        "only HDL code for FIR filters and second order IIR filters is created "
+        "at the moment.", self)
         lblMsg.setWordWrap(True)
         layHMsg = QHBoxLayout()
         layHMsg.addWidget(lblMsg)   
@@ -289,6 +290,52 @@ class HDLSpecs(QWidget):
         self.layHButtonsHDL_oc.addWidget(self.lblQuant_o)
         self.layHButtonsHDL_oc.addWidget(self.cmbQuant_o)
 
+# -----------------------------------------------------------------------------
+# subUI -- self.layHButtonsHDL_fir -- FIR structure and multipliers
+# -----------------------------------------------------------------------------
+        self.lblFIRStruct = QLabel("FIR Structure:", self)
+        self.lblFIRStruct.setFont(bifont)
+        self.cmbFIRStruct = QComboBox(self)
+        # display text, structure of filter_fir_hdl
+        for txt, struct in (("Direct", 'direct'), ("Transposed", 'transposed'),
+                            ("Pipelined Tree", 'tree')):
+            self.cmbFIRStruct.addItem(txt, struct)
+        self.cmbFIRStruct.setToolTip("Select the FIR structure: Direct form, "
+            "transposed form or direct form with pipelined adder tree.")
+        self.cmbFIRStruct.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+
+        self.chkSymmetry = QCheckBox("Sym.", self)
+        self.chkSymmetry.setChecked(True)
+        self.chkSymmetry.setToolTip("Share multipliers of (anti)symmetric coefficients.")
+        self.chkCSD = QCheckBox("CSD", self)
+        self.chkCSD.setToolTip("Replace multipliers by CSD shift-add networks.")
+
+        self.layHButtonsHDL_fir = QHBoxLayout()
+        self.layHButtonsHDL_fir.addWidget(self.lblFIRStruct)
+        self.layHButtonsHDL_fir.addWidget(self.cmbFIRStruct)
+        self.layHButtonsHDL_fir.addStretch()
+        self.layHButtonsHDL_fir.addWidget(self.chkSymmetry)
+        self.layHButtonsHDL_fir.addWidget(self.chkCSD)
+
+        self.chkSharedMult = QCheckBox("Shared Multiplier (IIR)", self)
+        self.chkSharedMult.setToolTip("Use one multiplier per IIR section "
+                                      "sequentially, requires 7 clock cycles per sample.")
+        self.layHButtonsHDL_iir = QHBoxLayout()
+        self.layHButtonsHDL_iir.addWidget(self.chkSharedMult)
+        self.layHButtonsHDL_iir.addStretch()
+
+        # ---------- Resource estimation --------------
+        self.butEstimate = QPushButton(self)
+        self.butEstimate.setToolTip("Estimate hardware resources and latency "
+                                    "without generating HDL.")
+        self.butEstimate.setText("Estimate")
+        self.lblEstimate = QLabel("", self)
+        self.lblEstimate.setWordWrap(True)
+        self.layHButtonsHDL_est = QHBoxLayout()
+        self.layHButtonsHDL_est.addWidget(self.butEstimate)
+        self.layHButtonsHDL_est.addWidget(self.lblEstimate)
+        self.layHButtonsHDL_est.addStretch()
+
         self.butExportHDL = QPushButton(self)
         self.butExportHDL.setToolTip("Create VHDL and Verilog files.")
         self.butExportHDL.setText("Create HDL")
@@ -316,6 +363,10 @@ class HDLSpecs(QWidget):
 
         layVBtns.addLayout(self.layHButtonsHDL_o)
         layVBtns.addLayout(self.layHButtonsHDL_oc)
+
+        layVBtns.addLayout(self.layHButtonsHDL_fir)
+        layVBtns.addLayout(self.layHButtonsHDL_iir)
+        layVBtns.addLayout(self.layHButtonsHDL_est)
         
         layVBtns.addLayout(self.layHButtonsHDL_h)
 
@@ -343,6 +394,7 @@ class HDLSpecs(QWidget):
         #----------------------------------------------------------------------
         self.butExportHDL.clicked.connect(self.exportHDL)
         self.butSimFixPoint.clicked.connect(self.simFixPoint)
+        self.butEstimate.clicked.connect(self.estimateHDL)
         #----------------------------------------------------------------------
         self.update_UI()
         
@@ -352,11 +404,18 @@ class HDLSpecs(QWidget):
         Update the UI after changing the filter class
         """
         if hasattr(ff.fil_inst, 'hdl'):
-            self.butExportHDL.setEnabled('iir_sos' in ff.fil_inst.hdl)
-            self.butSimFixPoint.setEnabled('iir_sos' in ff.fil_inst.hdl)
+            is_fir = fb.fil[0]['ft'] == 'FIR' and 'df' in ff.fil_inst.hdl
+            enb = 'iir_sos' in ff.fil_inst.hdl or is_fir
         else:
-            self.butExportHDL.setEnabled(False)
-            self.butSimFixPoint.setEnabled(False)
+            is_fir = enb = False
+        self.butExportHDL.setEnabled(enb)
+        self.butSimFixPoint.setEnabled(enb)
+        self.butEstimate.setEnabled(enb)
+        self.chkSharedMult.setEnabled(enb and not is_fir)
+        self.lblEstimate.clear()
+        self.cmbFIRStruct.setEnabled(is_fir)
+        self.chkSymmetry.setEnabled(is_fir)
+        self.chkCSD.setEnabled(is_fir)
             
 #------------------------------------------------------------------------------
     def setupHDL(self, file_name = "", dir_name = ""):
@@ -389,15 +448,35 @@ class HDLSpecs(QWidget):
         print('b =', coeffs[0][0:3])
         print('a =', coeffs[1][0:3])
 
-        # =============== adapted from C. Felton's SIIR example =============
-        self.flt = FilterIIR(b=np.array(coeffs[0][0:3]),
-                             a=np.array(coeffs[1][0:3]),
-                             #sos = sos, doesn't work yet
-                             word_format=(self.W[0], 0, self.W[1]))
+        if fb.fil[0]['ft'] == 'FIR':
+            struct = self.cmbFIRStruct.itemData(self.cmbFIRStruct.currentIndex())
+            self.flt = FilterFIR(b=np.array(coeffs[0]),
+                                 word_format=(self.W[0], 0, self.W[1]),
+                                 structure=str(struct),
+                                 use_symmetry=self.chkSymmetry.isChecked(),
+                                 csd=self.chkCSD.isChecked())
+        else:
+            # =============== adapted from C. Felton's SIIR example =============
+            self.flt = FilterIIR(b=np.array(coeffs[0][0:3]),
+                                 a=np.array(coeffs[1][0:3]),
+                                 #sos = sos, doesn't work yet
+                                 word_format=(self.W[0], 0, self.W[1]))
+            self.flt.shared_multiplier = self.chkSharedMult.isChecked()
 
         self.flt.hdl_name = file_name
         self.flt.hdl_directory = dir_name
         
+#------------------------------------------------------------------------------
+    def estimateHDL(self):
+        """
+        Estimate hardware resources and latency from the quantized coefficients
+        and display them, no HDL is generated
+        """
+        self.setupHDL()
+        est = self.flt.estimate()
+        logger.info("HDL resource estimation: {0}".format(est))
+        self.lblEstimate.setText(format_estimate(est))
+
 #------------------------------------------------------------------------------
     def exportHDL(self):
         """
@@ -433,8 +512,8 @@ class HDLSpecs(QWidget):
         logger.info('Creating hdl_file "{0}"'.format(
                     os.path.join(hdl_dir_name, hdl_file_name + suffix)))
 
-        self.flt.convert()
-        logger.info("HDL conversion finished!")
+        key = self.flt.convert()
+        logger.info("HDL conversion finished (fingerprint {0})!".format(key))
 
 #------------------------------------------------------------------------------
     def simFixPoint(self):
@@ -468,16 +547,11 @@ class HDLSpecs(QWidget):
         logger.info('Creating plot file "{0}"'.format(
                     os.path.join(plt_dir_name, plt_file_name)))
 
-        logger.info("Fixpoint simulation setup")
-        tb = self.flt.simulate_freqz(num_loops=3, Nfft=1024)
-        clk = Signal(False)
-        ts  = Signal(False)
-        x   = Signal(intbv(0,min=-2**(self.W[0]-1), max=2**(self.W[0]-1)))
-        y   = Signal(intbv(0,min=-2**(self.W[0]-1), max=2**(self.W[0]-1)))
-
-        sim = Simulation(tb)
         logger.info("Fixpoint simulation started")
-        sim.run()
+        # throughput-oriented simulation: no VCD trace, max. sample rate
+        duty_cycle = 1. / self.flt.estimate()['clocks_per_sample']
+        self.flt.simulate_freqz(num_loops=params['hdl_sim_frames'], Nfft=1024,
+                                trace=False, duty_cycle=duty_cycle)
         logger.info("Fixpoint plotting started")
         self.flt.plot_response()
         logger.info("Fixpoint plotting finished")
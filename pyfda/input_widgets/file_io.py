@@ -174,10 +174,14 @@ class File_IO(QWidget):
                                 fb.fil[0][key] = a[key].tolist()
                     elif file_type == '.pkl':
                         if sys.version_info[0] < 3:
-                            fb.fil = pickle.load(f)
+                            fil = pickle.load(f)
                         else:
                         # this only works for python >= 3.3
-                            fb.fil = pickle.load(f, fix_imports = True, encoding = 'bytes')
+                            fil = pickle.load(f, fix_imports = True, encoding = 'bytes')
+                        # copy into the existing filter dict to keep track
+                        # of the changed keys
+                        fb.fil[0].clear()
+                        fb.fil[0].update(fil[0])
                     else:
                         logger.error('Unknown file type "%s"', file_type)
                         file_type_err = True
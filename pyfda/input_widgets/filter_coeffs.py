@@ -12,6 +12,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 import sys
+import re
 
 from ..compat import (Qt, QtCore, QWidget, QLabel, QLineEdit, QComboBox, QApplication,
                       QPushButton, QFrame, QSpinBox, QCheckBox, QFont, QIcon, QSize,
@@ -23,7 +24,7 @@ import numpy as np
 import pyfda.filterbroker as fb # importing filterbroker initializes all its globals
 from pyfda.pyfda_lib import fil_save, safe_eval
 from pyfda.pyfda_qt_lib import (qstyle_widget, qset_cmb_box, qget_cmb_box, qstr, 
-                                qcopy_to_clipboard, qget_selected)
+                                qcopy_to_clipboard, qcopy_from_clipboard, qget_selected)
 from pyfda.pyfda_rc import params
 import pyfda.pyfda_fix_lib as fix
 
@@ -66,6 +67,34 @@ class ItemDelegate(QStyledItemDelegate):
         """
         super(ItemDelegate, self).__init__(parent)
         self.parent = parent # instance of the parent (not the base) class
+        # cache for formatted cell texts {cell text: displayed text}, valid for
+        # the fixpoint settings in self.frmt_cache_key:
+        self.frmt_cache = {}
+        self.frmt_cache_key = None
+
+    def _q_key(self):
+        """ Return a tuple with the fixpoint settings that affect the display """
+        myQ = self.parent.myQ
+        return (myQ.frmt, myQ.W, myQ.WI, myQ.WF, myQ.quant, myQ.ovfl,
+                bool(myQ.point), myQ.places, params['FMT_ba'])
+
+    def fill_cache(self, ba):
+        """
+        Format all coefficients in `ba` (list of arrays) with the current
+        fixpoint settings in one vectorized pass per array and store the
+        results in the cache, the keys are the cell texts created by
+        `FilterCoeffs._refresh_table()`.
+        """
+        self.frmt_cache = {}
+        self.frmt_cache_key = self._q_key()
+        if self.parent.myQ.frmt == 'float':
+            return # float display is fast enough
+        for c in ba:
+            c = np.asarray(c)
+            if c.dtype.kind not in 'biuf' or len(c) == 0:
+                continue # complex / object values are formatted on demand
+            for txt, frmt in zip(c.astype(str), self.parent.myQ.float2frmt(c)):
+                self.frmt_cache[txt] = "{0:>{1}}".format(frmt, self.parent.myQ.places)
 
 
 #==============================================================================
@@ -126,12 +155,20 @@ class ItemDelegate(QStyledItemDelegate):
         """ 
         string = qstr(text) # convert to "normal" string
 
+        if self.frmt_cache_key != self._q_key(): # settings have been changed
+            self.frmt_cache = {}
+            self.frmt_cache_key = self._q_key()
+        elif string in self.frmt_cache:
+            return self.frmt_cache[string]
+
         if self.parent.myQ.frmt == 'float':
             data = safe_eval(string)
-            return "{0:.{1}g}".format(data, params['FMT_ba'])
+            disp_str = "{0:.{1}g}".format(data, params['FMT_ba'])
         else:
-            return "{0:>{1}}".format(self.parent.myQ.float2frmt(string), 
+            disp_str = "{0:>{1}}".format(self.parent.myQ.float2frmt(string), 
                                         self.parent.myQ.places)
+        self.frmt_cache[string] = disp_str
+        return disp_str
 # see: http://stackoverflow.com/questions/30615090/pyqt-using-qtextedit-as-editor-in-a-qstyleditemdelegate
 
     def createEditor(self, parent, options, index):
@@ -213,6 +250,8 @@ class FilterCoeffs(QWidget):
     Create widget for viewing / editing / entering data
     """
     sigFilterDesigned = pyqtSignal()  # emitted when coeffs have been changed
+    # keys of the filter dict the widget depends on, see filterbroker.FilterDict
+    fil_keys = ('ba', 'q_coeff', 'ft', 'fc', 'N')
 
     def __init__(self, parent):
         super(FilterCoeffs, self).__init__(parent)
@@ -311,7 +350,8 @@ class FilterCoeffs(QWidget):
 #        self.tblCoeff.QItemSelectionModel.Clear
         self.tblCoeff.setDragEnabled(True)
 #        self.tblCoeff.setDragDropMode(QAbstractItemView.InternalMove) # doesn't work like intended
-        self.tblCoeff.setItemDelegate(ItemDelegate(self))
+        self.delegate = ItemDelegate(self)
+        self.tblCoeff.setItemDelegate(self.delegate)
 
 
         butAddCells = QPushButton(self)
@@ -358,6 +398,13 @@ class FilterCoeffs(QWidget):
                             "displayed. When nothing is selected, the whole table "
                             "is copied with full precision in decimal format. </span>")
 
+        self.butFromClipboard = QPushButton(self)
+        self.butFromClipboard.setIcon(QIcon(':/upload.svg'))
+        self.butFromClipboard.setIconSize(q_icon_size)
+        self.butFromClipboard.setToolTip("<span>Import coefficients from clipboard in "
+                            "the selected format: one column (b) or two columns "
+                            "(b, a) separated by tabs, semicolons or blanks.</span>")
+
         layHButtonsCoeffs1 = QHBoxLayout()
         layHButtonsCoeffs1.addWidget(butAddCells)
         layHButtonsCoeffs1.addWidget(butDelCells)
@@ -366,6 +413,7 @@ class FilterCoeffs(QWidget):
         layHButtonsCoeffs1.addWidget(self.butSave)
         layHButtonsCoeffs1.addWidget(butLoad)
         layHButtonsCoeffs1.addWidget(self.butClipboard)
+        layHButtonsCoeffs1.addWidget(self.butFromClipboard)
         layHButtonsCoeffs1.addWidget(self.cmbFilterType)
         layHButtonsCoeffs1.addStretch()
 #---------------------------------------------------------
@@ -517,6 +565,7 @@ class FilterCoeffs(QWidget):
         self.spnRound.editingFinished.connect(self._refresh_table)
         self.chkRadixPoint.clicked.connect(self._radix_point)
         self.butClipboard.clicked.connect(self._copy_to_clipboard)
+        self.butFromClipboard.clicked.connect(self._copy_from_clipboard)
 
         self.cmbFilterType.currentIndexChanged.connect(self._filter_type)
 
@@ -671,6 +720,9 @@ class FilterCoeffs(QWidget):
             idx_str = [str(n) for n in range(self.num_rows)]
             self.tblCoeff.setVerticalHeaderLabels(idx_str)
 
+            # format all coefficients at once instead of cell by cell on each repaint
+            self.delegate.fill_cache(self.ba[:self.num_cols])
+
             self.tblCoeff.blockSignals(True)
             for col in range(self.num_cols):
                 for row in range(self.num_rows):
@@ -727,6 +779,48 @@ class FilterCoeffs(QWidget):
         
         qcopy_to_clipboard(self.tblCoeff, self.ba, self.clipboard)
 
+#------------------------------------------------------------------------------
+    def _copy_from_clipboard(self):
+        """
+        Read coefficients from the clipboard in the selected number format into
+        self.ba: Columns are separated by tabs, semicolons or blanks, the first
+        column contains b and the optional second column a. Each column is
+        converted with one call of the batch parser `frmt2float_array()`,
+        invalid entries are replaced by zeros.
+        """
+        text = qcopy_from_clipboard(self.clipboard)
+        if not text:
+            return
+        rows = [re.split(r'[\t;]+|\s+', r.strip().strip('\t;'))
+                for r in text.splitlines() if r.strip()]
+        if not rows:
+            return
+
+        ba = []
+        for col in range(min(max(len(r) for r in rows), 2)):
+            col_str = [r[col] if col < len(r) else "" for r in rows]
+            # strip parentheses and trailing empty cells of a shorter column
+            col_str = [v.strip('(),') for v in col_str]
+            while col_str and col_str[-1] == "":
+                col_str.pop()
+            y, err = self.myQ.frmt2float_array(col_str)
+            if np.any(err):
+                logger.warning("Clipboard: {0} invalid entries in column {1} "
+                    "replaced by zero.".format(np.count_nonzero(err), "ba"[col]))
+                y[err] = 0.
+            ba.append(y)
+
+        if len(ba) == 1: # only b has been pasted
+            if fb.fil[0]['ft'] == 'IIR':
+                ba.append(np.array(self.ba[1], dtype=float))
+            else:
+                ba.append(np.zeros(len(ba[0])))
+                ba[1][0] = 1.
+        self.ba = ba
+        self._equalize_ba_length()
+        qstyle_widget(self.butSave, 'changed')
+        self._refresh_table()
+
 #------------------------------------------------------------------------------
     def _store_q_settings(self):
         """
@@ -936,12 +1030,18 @@ class FilterCoeffs(QWidget):
         # -> change output format to 'float' before quantizing and storing in self.ba
         self.myQ.frmt = 'float'
 
-        idx = qget_selected(self.tblCoeff)['idx'] # get all selected indices
-        if not idx: # nothing selected, quantize all elements
-            self.ba = self.myQ.fix(self.ba, to_float=True)
-        else:
-            for i in idx:
-                self.ba[i[0]][i[1]] = self.myQ.fix(self.ba[i[0]][i[1]], to_float=True)
+        sel = qget_selected(self.tblCoeff) # get all selected indices
+        # b and a may have different lengths, quantize them separately with one
+        # vectorized call each instead of one call per coefficient
+        for c in range(2):
+            if not sel['idx']: # nothing selected, quantize all elements
+                self.ba[c] = self.myQ.fix(self.ba[c], to_float=True)
+            else:
+                rows = np.array([r for r in sel['sel'][c] if r < len(self.ba[c])],
+                                dtype=int)
+                if len(rows) > 0:
+                    self.ba[c] = np.array(self.ba[c], dtype=float) # ensure float array
+                    self.ba[c][rows] = self.myQ.fix(self.ba[c][rows], to_float=True)
 
         qstyle_widget(self.butSave, 'changed')
         self._refresh_table()
@@ -29,12 +29,15 @@ import pyfda.filterbroker as fb # importing filterbroker initializes all its glo
 import pyfda.filter_factory as ff # importing filterbroker initializes all its globals
 from pyfda.pyfda_lib import lin2unit
 from pyfda.pyfda_rc import params
+from pyfda.freq_response import freq_resp, freqz_cascade
 # TODO: Passband and stopband info should show min / max values for each band
 
 class FilterInfo(QWidget):
     """
     Create widget for displaying infos about filter and filter design method
     """
+    fil_keys = None # depends on all keys (e.g. the debug view of the filter dict)
+
     def __init__(self, parent):
         super(FilterInfo, self).__init__(parent)
         
@@ -192,10 +195,10 @@ class FilterInfo(QWidget):
             for the filter defined in the filter dict in a given frequency band
             [f_start, f_stop].
             """
-            w = np.linspace(f_start, f_stop, params['N_FFT'])*2*np.pi
-            [w, H] = sig.freqz(bb, aa)
-            f = w / (2.0 * pi) # frequency normalized to f_S
-            H_abs = abs(H)
+            resp = freq_resp.get([bb, aa], N_FFT = params['N_FFT'], whole = False,
+                                 sos = sos)
+            f = resp.W / (2.0 * pi) # frequency normalized to f_S
+            H_abs = resp.H_abs
             H_max = max(H_abs)
             H_min = min(H_abs)
             F_max = f[np.argmax(H_abs)] # find the frequency where H_abs 
@@ -211,6 +214,7 @@ class FilterInfo(QWidget):
 
             bb = fb.fil[0]['ba'][0]
             aa = fb.fil[0]['ba'][1]
+            sos = fb.fil[0]['sos'] # evaluate cascade of sections when available
     
             f_S  = fb.fil[0]['f_S']
     
@@ -282,7 +286,10 @@ class FilterInfo(QWidget):
                 logger.debug("F_test_labels = %s" %f_lbls)
                                
                 # Calculate frequency response at test frequencies
-                [w_test, a_test] = sig.freqz(bb, aa, 2.0 * pi * f_vals.astype(np.float))
+                if len(sos) > 0:
+                    [w_test, a_test] = freqz_cascade(sos, 2.0 * pi * f_vals.astype(np.float))
+                else:
+                    [w_test, a_test] = sig.freqz(bb, aa, 2.0 * pi * f_vals.astype(np.float))
                 
             
             (F_min, H_min, F_max, H_max) = _find_min_max(self, 0, 1, unit = 'V')    
@@ -356,6 +363,8 @@ class FilterInfo(QWidget):
         Print filter dict for debugging
         """
         self.txtFiltDict.setVisible(self.chkFiltDict.isChecked())
+        if not self.chkFiltDict.isChecked():
+            return # don't calculate lazy entries of the filter dict when hidden
 
         fb_sorted = [str(key) +' : '+ str(fb.fil[0][key]) for key in sorted(fb.fil[0].keys())]
         dictstr = pprint.pformat(fb_sorted)
@@ -59,6 +59,8 @@ class FilterPZ(QWidget):
 
     sigFilterDesigned = pyqtSignal()  # emitted when filter has been designed
     sigSpecsChanged = pyqtSignal()
+    # keys of the filter dict the widget depends on, see filterbroker.FilterDict
+    fil_keys = ('zpk', 'ba', 'fc', 'N')
 
     def __init__(self, parent):
         super(FilterPZ, self).__init__(parent)
@@ -12,13 +12,15 @@ logger = logging.getLogger(__name__)
 
 import numpy as np
 
-from ..compat import (QWidget, QLabel, QFrame, QPushButton, pyqtSignal, QtGui,
+from ..compat import (QWidget, QLabel, QFrame, QPushButton, pyqtSignal, QtGui, QtCore,
                       QVBoxLayout, QHBoxLayout, QSizePolicy)
 
 import pyfda.filterbroker as fb
 import pyfda.filter_factory as ff
 from pyfda.pyfda_lib import style_widget #HLine
 from pyfda.pyfda_rc import params
+from pyfda.design_cache import DesignCache
+from pyfda.design_worker import DesignWorker
 
 from pyfda.input_widgets import (select_filter, amplitude_specs,
                                  freq_specs, freq_units,
@@ -32,6 +34,7 @@ class FilterSpecs(QWidget):
     # class variables (shared between instances if more than one exists)
     sigFilterDesigned = pyqtSignal()  # emitted when filter has been designed
     sigSpecsChanged = pyqtSignal() # emitted when specs have been changed
+    fil_keys = None # keys of the filter dict the widget depends on: all
     sigViewChanged = pyqtSignal() # emitted when view has changed
     sigQuit = pyqtSignal() # emitted when >QUIT< button is clicked
 
@@ -44,6 +47,10 @@ class FilterSpecs(QWidget):
         """
         Construct User Interface from all input subwidgets
         """
+        # Cache for filter design results, identical designs are not recalculated
+        ff.fil_factory.design_cache = DesignCache(params['design_cache_size'],
+                                                  params['design_cache_dir'])
+        self.design_worker = None # design first filter in the GUI thread
         # Subwidget for selecting filter with response type rt (LP, ...),
         #    filter type ft (IIR, ...) and filter class fc (cheby1, ...)
         self.sel_fil = select_filter.SelectFilter(self)
@@ -138,6 +145,17 @@ class FilterSpecs(QWidget):
         self.update_UI() # first time initialization
         self.start_design_filt() # design first filter using default values
 
+        if params['design_in_thread']:
+            # design all further filters in a background thread
+            self.design_worker = DesignWorker(self, ff.fil_factory.design_cache)
+            self.design_worker.sigDesigned.connect(self._design_finished)
+            self.design_worker.sigFailed.connect(self._design_failed)
+            # changed specs make a running design obsolete
+            self.sigSpecsChanged.connect(self.cancel_design_filt)
+            app = QtCore.QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(self.design_worker.stop)
+
 #------------------------------------------------------------------------------
     def update_UI(self):
         """
@@ -240,6 +258,11 @@ class FilterSpecs(QWidget):
         - update the input widgets in case weights, corner frequencies etc.
           have been changed by the filter design method
         - the plots are updated via signal-slot connection
+
+        When ``params['design_in_thread'] == True``, the design is performed in
+        a background thread and the steps after the design are performed in
+        ``_design_finished()``. Starting a new design while the previous one is
+        still running makes the previous design obsolete.
         """
         logger.debug("start_design_filt - Specs:\n"
             "fb.fil[0]: %s\n"
@@ -250,6 +273,11 @@ class FilterSpecs(QWidget):
         logger.info("startDesignFilt using: %s\nmethod: %s\n",
             str(type(ff.fil_inst)), str(fb.fil[0]['fc']))
 
+        if self.design_worker is not None:
+            self.design_worker.submit(fb.fil[0])
+            self.color_design_button("pending")
+            return
+
         try:
             #----------------------------------------------------------------------
             # A globally accessible instance fb.fil_inst of selected filter class fc
@@ -272,21 +300,28 @@ class FilterSpecs(QWidget):
             if err > 0:
                 raise AttributeError("Unknown design method.")
                 self.color_design_button("error")
-            # Update filter order. weights and freq display in case they
-            # have been changed by the design algorithm
-            self.sel_fil.load_filter_order()
-            self.w_specs.load_dict()
-            self.f_specs.load_dict()
-
-            self.color_design_button("ok")
-
-            self.sigFilterDesigned.emit() # emit signal -> InputTabWidgets.update_all
+            self._update_designed()
 
         except Exception as e:
             logger.warning("start_design_filt:\n%s\n%s\n", e.__doc__, e)
             
             self.color_design_button("error")
 
+#------------------------------------------------------------------------------
+    def _update_designed(self):
+        """
+        Update the widgets after a successful design and emit sigFilterDesigned
+        """
+        # Update filter order. weights and freq display in case they
+        # have been changed by the design algorithm
+        self.sel_fil.load_filter_order()
+        self.w_specs.load_dict()
+        self.f_specs.load_dict()
+
+        self.color_design_button("ok")
+
+        self.sigFilterDesigned.emit() # emit signal -> InputTabWidgets.update_all
+
         logger.debug("start_design_filt - Results:\n"
             "F_PB = %s, F_SB = %s\n"
             "Filter order N = %s\n"
@@ -298,6 +333,59 @@ class FilterSpecs(QWidget):
                 pformat(fb.fil[0]['zpk'])
               )
 
+#------------------------------------------------------------------------------
+    def _design_finished(self, job_id, results):
+        """
+        Copy the results of the design thread to fb.fil[0] and update widgets.
+        Results of obsolete jobs are ignored.
+        """
+        if not self.design_worker.is_current(job_id):
+            return
+        for key in results:
+            fb.fil[0][key] = results[key]
+        try:
+            self._update_fil_inst()
+            self._update_designed()
+        except Exception as e:
+            logger.warning("start_design_filt:\n%s\n%s\n", e.__doc__, e)
+            self.color_design_button("error")
+
+    def _update_fil_inst(self):
+        """
+        Reload the widgets of the filter design instance ``ff.fil_inst`` from
+        fb.fil[0]: The design thread uses its own instance, settings that have
+        been changed by the design method (e.g. in fb.fil[0]['wdg_fil']) are
+        not displayed yet.
+        """
+        wdg_fil = getattr(ff.fil_inst, 'wdg_fil', None)
+        if wdg_fil is None or not hasattr(ff.fil_inst, '_load_dict'):
+            return
+        # don't emit sigFiltChanged, this would flag the design as changed
+        blocked = wdg_fil.blockSignals(True)
+        try:
+            ff.fil_inst._load_dict()
+            if hasattr(ff.fil_inst, '_update_UI'):
+                ff.fil_inst._update_UI()
+        finally:
+            wdg_fil.blockSignals(blocked)
+
+    def _design_failed(self, job_id, err_string):
+        """
+        Display an error when the current design job has failed
+        """
+        if self.design_worker.is_current(job_id):
+            logger.warning("start_design_filt:\n%s\n", err_string)
+            self.color_design_button("error")
+
+    def cancel_design_filt(self):
+        """
+        Cancel a pending filter design, e.g. when the specs have been changed.
+        """
+        if self.design_worker is not None and self.design_worker.is_pending():
+            self.design_worker.cancel()
+            self.color_design_button("changed")
+
+#------------------------------------------------------------------------------
     def color_design_button(self, state):
         fb.design_filt_state = state
         style_widget(self.butDesignFilt, state)
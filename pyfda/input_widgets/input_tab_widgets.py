@@ -32,9 +32,11 @@ class InputTabWidgets(QWidget):
     Create a tabbed widget for various input subwidgets
     """
     # class variables (shared between instances if more than one exists)
-    sigViewChanged = pyqtSignal() # emitted when view (e.g. single / double sided f) has changed
-    sigSpecsChanged = pyqtSignal()  # emitted when specs have been changed
-    sigFilterDesigned = pyqtSignal()  # emitted when filter has been designed
+    # The signals pass the set of keys of the filter dict that have been
+    # changed since the last update (see filterbroker.FilterDict):
+    sigViewChanged = pyqtSignal(object) # emitted when view (e.g. single / double sided f) has changed
+    sigSpecsChanged = pyqtSignal(object)  # emitted when specs have been changed
+    sigFilterDesigned = pyqtSignal(object)  # emitted when filter has been designed
 
 
     def __init__(self, parent):
@@ -57,6 +59,12 @@ class InputTabWidgets(QWidget):
         if fb.MYHDL:
             self.hdlSpecs = hdl_specs.HDLSpecs(self)
 
+        # hidden widgets displaying coefficients or poles / zeros are only
+        # reloaded when they are selected, e.g. to avoid calculating the roots
+        # of a long FIR filter when the P/Z tab is not shown:
+        self.lazy_widgets = (self.filter_coeffs, self.filter_pz)
+        self.stale = set() # lazy widgets that need to be reloaded
+
         self._construct_UI()
 
 
@@ -72,6 +80,7 @@ class InputTabWidgets(QWidget):
         tabWidget.addTab(self.filter_info, 'Info')
         if fb.MYHDL:
             tabWidget.addTab(self.hdlSpecs, 'HDL')
+        self.tabWidget = tabWidget
 
         layVMain = QVBoxLayout()
 
@@ -118,8 +127,21 @@ class InputTabWidgets(QWidget):
         self.filter_coeffs.sigFilterDesigned.connect(self.load_all)
         self.filter_pz.sigFilterDesigned.connect(self.load_all)
         self.file_io.sigFilterLoaded.connect(self.load_all)
+
+        # reload a stale widget when its tab has been selected
+        self.tabWidget.currentChanged.connect(self._load_stale)
         #----------------------------------------------------------------------
 
+    def _load_stale(self):
+        """
+        Reload the current input widget when it has been marked as stale
+        by update_all()
+        """
+        wdg = self.tabWidget.currentWidget()
+        if wdg in self.stale:
+            self.stale.discard(wdg)
+            wdg.load_dict()
+
     def update_view(self):
         """
         Slot for InputSpecs.sigViewChanged
@@ -129,9 +151,11 @@ class InputTabWidgets(QWidget):
         Update plot widgets via sigSpecsChanged signal that need new
             specs, e.g. plotHf widget for the filter regions
         """
-        self.filter_info.load_dict() # update frequency unit of info widget
-        logger.debug("Emit sigViewChanged!")
-        self.sigViewChanged.emit() # pyFDA -> PlotTabWidgets.update_specs
+        changed = fb.fil[0].pop_changes()
+        if fb.is_affected(self.filter_info.fil_keys, changed):
+            self.filter_info.load_dict() # update frequency unit of info widget
+        logger.debug("Emit sigViewChanged with %s!", sorted(changed))
+        self.sigViewChanged.emit(changed) # pyFDA -> PlotTabWidgets.update_specs
 
 
     def update_specs(self):
@@ -147,12 +171,14 @@ class InputTabWidgets(QWidget):
             specs, e.g. plotHf widget for the filter regions
         """
 
+        changed = fb.fil[0].pop_changes()
         self.filter_specs.color_design_button("changed")
-        self.filter_info.load_dict()
+        if fb.is_affected(self.filter_info.fil_keys, changed):
+            self.filter_info.load_dict()
         if fb.MYHDL:
             self.hdlSpecs.update_UI()
-        logger.debug("Emit sigSpecsChanged!")
-        self.sigSpecsChanged.emit() # pyFDA -> PlotTabWidgets.update_specs
+        logger.debug("Emit sigSpecsChanged with %s!", sorted(changed))
+        self.sigSpecsChanged.emit(changed) # pyFDA -> PlotTabWidgets.update_specs
 
     def load_all(self):
         """
@@ -176,19 +202,28 @@ class InputTabWidgets(QWidget):
         - Update the input widgets that can / need to display filter data
         - Update all plot widgets via the signal sigFilterDesigned
 
+        Only widgets that depend on keys of the filter dict that have been
+        changed since the last update are reloaded, the set of changed keys
+        is passed on with sigFilterDesigned.
         """
         sender_name = ""
         if self.sender(): # origin of signal that triggered the slot
             sender_name = self.sender().objectName()
-        logger.debug("updateAll called by %s", sender_name)
-
-        self.filter_specs.load_dict()
-        self.filter_info.load_dict()
-        self.filter_coeffs.load_dict()
-        self.filter_pz.load_dict()
+        changed = fb.fil[0].pop_changes()
+        logger.debug("updateAll called by %s, changed keys: %s",
+                     sender_name, sorted(changed))
+
+        for wdg in (self.filter_specs, self.filter_info, self.filter_coeffs,
+                    self.filter_pz):
+            if fb.is_affected(wdg.fil_keys, changed):
+                if wdg in self.lazy_widgets and not wdg.isVisible():
+                    self.stale.add(wdg) # reload when the tab is selected
+                else:
+                    self.stale.discard(wdg)
+                    wdg.load_dict()
 
         logger.debug("Emit sigFilterDesigned!")
-        self.sigFilterDesigned.emit() # pyFDA -> PlotTabWidgets.update_data
+        self.sigFilterDesigned.emit(changed) # pyFDA -> PlotTabWidgets.update_data
 
 
 #------------------------------------------------------------------------
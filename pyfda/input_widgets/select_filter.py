@@ -439,7 +439,8 @@ class SelectFilter(QWidget):
             except AttributeError as e:
                 print("Could not destruct_UI!\n", e)
 
-            ff.fil_inst.deleteLater() # delete QWidget when scope has been left
+            if hasattr(ff.fil_inst, 'deleteLater'):
+                ff.fil_inst.deleteLater() # delete QWidget when scope has been left
 
 
 #------------------------------------------------------------------------------
@@ -17,7 +17,9 @@ import scipy.signal as sig
 
 import pyfda.filterbroker as fb
 from pyfda.pyfda_rc import params
-from pyfda.pyfda_lib import H_mag
+from pyfda.pyfda_lib import H_mag_zpk, log_H_zpk
+from pyfda.design_cache import canonical_hash
+from pyfda.freq_response import freq_resp
 from pyfda.plot_widgets.plot_utils import MplWidget
 
 from mpl_toolkits.mplot3d.axes3d import Axes3D
@@ -43,6 +45,8 @@ class Plot3D(QWidget):
     - lin / log surf plot of H(z)
     - optional display of poles / zeros
     """
+    # keys of the filter dict the widget depends on, see filterbroker.FilterDict
+    fil_keys = ('ba', 'sos', 'zpk', 'f_S', 'freqSpecsRangeType', 'plt_fLabel')
 
     def __init__(self, parent):
         super(Plot3D, self).__init__(parent)
@@ -238,7 +242,7 @@ class Plot3D(QWidget):
         phi_UC = np.linspace(0, 2*pi, 400, endpoint=True) # angles for unit circle
         self.xy_UC = np.exp(1j * phi_UC) # x,y coordinates of unity circle
 
-        steps = 100              # number of steps for x, y, r, phi
+        steps = int(params['N_3D']) # number of steps for x, y, r, phi
         #
         self.xmin = -1.5; self.xmax = 1.5  # cartesian range limits
         self.ymin = -1.5; self.ymax = 1.5
@@ -260,9 +264,26 @@ class Plot3D(QWidget):
                                             np.arange(self.ymin, self.ymax, dy))
 
         self.z = self.x + 1j*self.y # create coordinate grid for complex plane
+        self._log_H_key = None # log10|H(z)| has to be recalculated for the new grid
 
         self.draw() # initial plot
 
+#------------------------------------------------------------------------------
+    def _calc_log_H(self, zpk):
+        """
+        Return log10|H(z)| on the grid self.z, calculated from poles, zeros and
+        gain. The result is only recalculated when the filter, the grid or the
+        precision have changed, not for view options like colormap, alpha or
+        stride. Scaling (lin / dB) and clipping are performed by the caller.
+        """
+        dtype = np.float32 if params['F32_3D'] else np.float64
+        key = canonical_hash([zpk, self.z.shape, self.chkPolar.isChecked(),
+                              np.dtype(dtype).str])
+        if key != self._log_H_key:
+            self._log_H = log_H_zpk(zpk, self.z, dtype=dtype)
+            self._log_H_key = key
+        return self._log_H
+
 #------------------------------------------------------------------------------
     def _init_axes(self):
         """
@@ -387,7 +408,7 @@ class Plot3D(QWidget):
         #-----------------------------------------------------------------------------
 
 
-        [w, H] = sig.freqz(bb, aa, worN=N_FFT, whole=True)
+        H = freq_resp.get([bb, aa], N_FFT=N_FFT, whole=True, sos=fb.fil[0]['sos']).H
         H = np.nan_to_num(H) # replace nans and inf by finite numbers
        
         H_abs = abs(H)
@@ -433,8 +454,10 @@ class Plot3D(QWidget):
                 
         # calculate H(jw)| along the unity circle and |H(z)|, each clipped
         # between bottom and top
-        H_UC = H_mag(bb, aa, self.xy_UC, top, H_min=bottom, log=self.chkLog.isChecked())
-        Hmag = H_mag(bb, aa, self.z, top, H_min=bottom, log=self.chkLog.isChecked())
+        zpk = fb.fil[0]['zpk']
+        H_UC = H_mag_zpk(zpk, self.xy_UC, top, H_min=bottom, log=self.chkLog.isChecked())
+        Hmag = H_mag_zpk(zpk, self.z, top, H_min=bottom, log=self.chkLog.isChecked(),
+                         log_H=self._calc_log_H(zpk))
 
 
         #===============================================================
@@ -506,7 +529,7 @@ class Plot3D(QWidget):
         elif self.cmbMode3D.currentText() == 'Surf':
             if MLAB:
                 ## Mayavi
-                surf = mlab.surf(self.x, self.y, H_mag, colormap='RdYlBu', warp_scale='auto')
+                surf = mlab.surf(self.x, self.y, Hmag, colormap='RdYlBu', warp_scale='auto')
                 # Change the visualization parameters.
                 surf.actor.property.interpolation = 'phong'
                 surf.actor.property.specular = 0.1
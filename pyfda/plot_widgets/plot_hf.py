@@ -16,6 +16,7 @@ from matplotlib import rcParams
 
 import pyfda.filterbroker as fb
 from pyfda.pyfda_rc import params
+from pyfda.freq_response import freq_resp
 from pyfda.plot_widgets.plot_utils import MplWidget
 
 class PlotHf(QWidget):
@@ -24,6 +25,11 @@ class PlotHf(QWidget):
 #       stop band or pass band should be selectable as well as lin / log scale
 # TODO: position and size of inset plot should be selectable
 
+    # keys of the filter dict the widget depends on, see filterbroker.FilterDict
+    fil_keys = ('ba', 'sos', 'N', 'rt', 'ft', 'fc', 'fo', 'f_S',
+                'A_PB', 'A_PB2', 'A_SB', 'A_SB2', 'F_PB', 'F_PB2', 'F_SB', 'F_SB2',
+                'amp_specs_unit', 'freqSpecsRange', 'freqSpecsRangeType',
+                'plt_fLabel', 'plt_phiUnit')
 
     def __init__(self, parent): 
         super(PlotHf, self).__init__(parent)
@@ -114,6 +120,8 @@ class PlotHf(QWidget):
 
         self.chkSpecs.clicked.connect(self.draw)
         self.chkPhase.clicked.connect(self.draw)
+        # recalculate H(f) for the visible frequency range after zooming:
+        self.mplwidget.mplToolbar.sigZoomChanged.connect(self.zoom_changed)
         
         
 #------------------------------------------------------------------------------
@@ -417,9 +425,10 @@ class PlotHf(QWidget):
 
 #        whole = fb.fil[0]['freqSpecsRangeType'] != 'half'
 
-        # calculate H_cplx(W) (complex) for W = 0 ... 2 pi:
-        [self.W, self.H_cplx] = sig.freqz(fb.fil[0]['ba'][0], fb.fil[0]['ba'][1],
-            worN = params['N_FFT'], whole = True) # bb, aa, N_FFT, 0 ... 2 pi
+        # calculate H_cplx(W) (complex) for W = 0 ... 2 pi (read-only arrays):
+        resp = freq_resp.get(fb.fil[0]['ba'], N_FFT = params['N_FFT'], whole = True,
+                             sos = fb.fil[0]['sos'])
+        self.W, self.H_cplx = resp.W, resp.H
 
 #------------------------------------------------------------------------------
     def draw(self):
@@ -519,20 +528,18 @@ class PlotHf(QWidget):
                                                 
             if self.unitA == 'dB':
                 A_lim = [20*np.log10(A_min) -10, 20*np.log10(1+A_max) +1]
-                self.H_plt = 20*np.log10(abs(H))
                 H_str += ' in dB ' + r'$\rightarrow$'
             elif self.unitA == 'V': #  'lin'
                 A_lim = [0, (1.05 + A_max)]
-                self.H_plt = H
                 H_str +=' in V ' + r'$\rightarrow $'
                 self.ax.axhline(linewidth=1, color='k') # horizontal line at 0
             else: # unit is W
                 A_lim = [0, (1.03 + A_max)**2.]
-                self.H_plt = H * H.conj()
                 H_str += ' in W ' + r'$\rightarrow $'
+            self.H_plt = self._H_unit(H)
 
             #-----------------------------------------------------------
-            self.ax.plot(self.F, self.H_plt, label = 'H(f)')
+            self.line_H, = self.ax.plot(self.F, self.H_plt, label = 'H(f)')
             self.draw_phase(self.ax)
             #-----------------------------------------------------------
 
@@ -547,6 +554,53 @@ class PlotHf(QWidget):
             self.ax.set_ylabel(H_str)
 
         self.redraw()
+        if self.mplwidget.mplToolbar.lock_zoom:
+            self.zoom_changed() # zoomed view has been restored
+
+#------------------------------------------------------------------------------
+    def _H_unit(self, H):
+        """
+        Convert magnitude / real / imaginary part of H to the selected unit
+        """
+        if self.unitA == 'dB':
+            return 20*np.log10(abs(H))
+        elif self.unitA == 'V':
+            return H
+        else: # unit is W
+            return H * H.conj()
+
+#------------------------------------------------------------------------------
+    def zoom_changed(self):
+        """
+        Update |H(f)| when the view has been zoomed: When the visible frequency
+        range contains less than params['N_FFT_zoom'] points of the N_FFT grid,
+        H(f) is recalculated at params['N_FFT_zoom'] points in the visible range
+        only (chirp-Z transform). Responses are cached per view, navigating back
+        and forth doesn't recalculate them.
+        """
+        if not self.mplwidget.mplToolbar.enabled or not hasattr(self, 'line_H'):
+            return
+        F_lo, F_hi = self.ax.get_xlim()
+
+        if (F_hi - F_lo) / self.f_S * params['N_FFT'] >= params['N_FFT_zoom']:
+            self.line_H.set_data(self.F, self.H_plt) # resolution of N_FFT grid is ok
+        else:
+            resp = freq_resp.get(fb.fil[0]['ba'], N_FFT = params['N_FFT_zoom'],
+                                 sos = fb.fil[0]['sos'],
+                                 span = (2 * np.pi * F_lo / self.f_S,
+                                         2 * np.pi * F_hi / self.f_S))
+            H_c = resp.H
+            if self.linphase: # remove the linear phase
+                H_c = H_c * np.exp(1j * resp.W * fb.fil[0]["N"]/2.)
+            if self.cmbShowH.currentIndex() == 0: # magnitude
+                H = abs(H_c)
+            elif self.cmbShowH.currentIndex() == 1: # real part
+                H = H_c.real
+            else: # imag. part
+                H = H_c.imag
+            self.line_H.set_data(resp.W / (2 * np.pi) * self.f_S, self._H_unit(H))
+
+        self.mplwidget.pltCanv.draw()
         
 #------------------------------------------------------------------------------
     def redraw(self):
@@ -16,12 +16,15 @@ import scipy.signal as sig
 
 import pyfda.filterbroker as fb
 from pyfda.pyfda_lib import expand_lim, rt_label, safe_eval
+from pyfda.stream_filter import StreamFilter
 from pyfda.pyfda_rc import params # FMT string for QLineEdit fields, e.g. '{:.3g}'
 from pyfda.plot_widgets.plot_utils import MplWidget
 #from mpl_toolkits.mplot3d.axes3d import Axes3D
 
 
 class PlotImpz(QWidget):
+    # keys of the filter dict the widget depends on, see filterbroker.FilterDict
+    fil_keys = ('ba', 'sos', 'ft', 'f_S', 'freq_specs_unit', 'plt_tLabel')
 
     def __init__(self, parent):
         super(PlotImpz, self).__init__(parent)
@@ -301,12 +304,10 @@ class PlotImpz(QWidget):
             logger.error('Unknown stimulus "{0}"'.format(stim))
             return
 
-        if len(sos) > 0: # has second order sections        
-            h = sig.sosfilt(sos, x)
-            dc = sig.freqz(self.bb, self.aa, [0])
-        else: # no second order sections for current filter 
-            h = sig.lfilter(self.bb, self.aa, x)
-            dc = sig.freqz(self.bb, self.aa, [0])
+        # uses second order sections if available, same code path as for
+        # filtering long signals block by block
+        h = StreamFilter(ba=(self.bb, self.aa), sos=sos).process(x)
+        dc = sig.freqz(self.bb, self.aa, [0])
         
         if stim == "StepErr":
             h = h - abs(dc[1]) # subtract DC value from response
@@ -14,10 +14,14 @@ import scipy.signal as sig
 
 import pyfda.filterbroker as fb
 from pyfda.pyfda_rc import params
+from pyfda.freq_response import freq_resp
 from pyfda.plot_widgets.plot_utils import MplWidget
 
 
 class PlotPhi(QWidget):
+    # keys of the filter dict the widget depends on, see filterbroker.FilterDict
+    fil_keys = ('ba', 'sos', 'f_S', 'freqSpecsRange', 'freqSpecsRangeType',
+                'plt_fLabel', 'plt_phiLabel', 'plt_phiUnit')
 
     def __init__(self, parent):
         super(PlotPhi, self).__init__(parent)
@@ -95,10 +99,11 @@ class PlotPhi(QWidget):
         wholeF = fb.fil[0]['freqSpecsRangeType'] != 'half'
         f_S = fb.fil[0]['f_S']
 
-        [W,H] = sig.freqz(self.bb, self.aa, worN = params['N_FFT'],
-                        whole = wholeF)
+        resp = freq_resp.get(fb.fil[0]['ba'], N_FFT = params['N_FFT'],
+                             whole = wholeF, sos = fb.fil[0]['sos'])
+        H = resp.H
 
-        F = W / (2 * np.pi) * f_S
+        F = resp.W / (2 * np.pi) * f_S
 
         if fb.fil[0]['freqSpecsRangeType'] == 'sym':
             H = np.fft.fftshift(H)
@@ -119,11 +124,12 @@ class PlotPhi(QWidget):
         
         # replace nan and inf by finite values, otherwise np.unwrap yields
         # an array full of nans
-        H = np.nan_to_num(H) 
         if self.chkWrap.isChecked():
-            phi_plt = np.angle(H) * scale
+            phi_plt = np.angle(np.nan_to_num(H)) * scale
+        elif fb.fil[0]['freqSpecsRangeType'] == 'sym':
+            phi_plt = np.unwrap(np.angle(np.nan_to_num(H))) * scale
         else:
-            phi_plt = np.unwrap(np.angle(H)) * scale
+            phi_plt = resp.phi * scale # unwrapped phase, calculated only once
 
         self.ax.clear() # need to clear, doesn't overwrite 
         #---------------------------------------------------------
@@ -24,6 +24,8 @@ from  matplotlib import patches # TODO: should not be imported here?!
 
 
 class PlotPZ(QWidget):
+    # keys of the filter dict the widget depends on, see filterbroker.FilterDict
+    fil_keys = ('zpk',)
 
     def __init__(self, parent): 
         super(PlotPZ, self).__init__(parent)
@@ -11,6 +11,7 @@ logger = logging.getLogger(__name__)
 
 from ..compat import QTabWidget, QVBoxLayout, QEvent, QtCore
 
+import pyfda.filterbroker as fb
 from pyfda.pyfda_rc import params
 
 from pyfda.plot_widgets import (plot_hf, plot_phi, plot_pz, plot_tau_g, plot_impz,
@@ -28,6 +29,11 @@ class PlotTabWidgets(QTabWidget):
         self.pltImpz = plot_impz.PlotImpz(self)
         self.plt3D = plot_3d.Plot3D(self)
 
+        # Hidden tabs are not updated immediately but marked as stale, they are
+        # updated when they become visible: {widget: 'draw' | 'update_view'}
+        self.stale = {}
+        self.tab_history = [] # recently visited tabs, most recent last
+
         self._construct_UI()
 
 #------------------------------------------------------------------------------
@@ -52,6 +58,11 @@ class PlotTabWidgets(QTabWidget):
         # redraw current widget at timeout (timer was triggered by resize event):
         self.timer_id.timeout.connect(self.current_tab_redraw)
 
+        # update stale tabs in the background when the GUI is idle:
+        self.timer_precompute = QtCore.QTimer()
+        self.timer_precompute.setSingleShot(True)
+        self.timer_precompute.timeout.connect(self.precompute_next)
+
         # When user has selected a different tab, call self.tab_changed for a redraw
         self.tabWidget.currentChanged.connect(self.current_tab_redraw)
         # The following does not work: maybe current scope must be left?
@@ -64,8 +75,77 @@ class PlotTabWidgets(QTabWidget):
 #    @QtCore.pyqtSlot(int)
 #    def tab_changed(self,argTabIndex):
     def current_tab_redraw(self):
-        self.tabWidget.currentWidget().redraw()
-            
+        """
+        Redraw the current tab, called when the tab has been changed or resized.
+        A stale tab is updated first.
+        """
+        wdg = self.tabWidget.currentWidget()
+        if wdg in self.tab_history:
+            self.tab_history.remove(wdg)
+        self.tab_history.append(wdg)
+
+        if not self._update_stale(wdg):
+            wdg.redraw()
+        self._start_precompute()
+
+    def _update_stale(self, wdg):
+        """
+        Perform the pending update of the widget `wdg` if it is stale, return
+        True when it has been updated.
+        """
+        action = self.stale.pop(wdg, None)
+        if action is None:
+            return False
+        logger.debug("Updating stale tab %s (%s)", type(wdg).__name__, action)
+        getattr(wdg, action)()
+        return True
+
+    def _update_or_mark(self, wdg, action):
+        """
+        Update the current tab with `wdg.action()` immediately, mark other tabs
+        as stale. A pending 'draw' is not replaced by 'update_view' as drawing
+        also updates the view.
+        """
+        if wdg is self.tabWidget.currentWidget():
+            self.stale.pop(wdg, None)
+            getattr(wdg, action)()
+        elif self.stale.get(wdg) != 'draw':
+            self.stale[wdg] = action
+
+    def _start_precompute(self):
+        """
+        (Re-)start the timer for updating the next likely tab in the background
+        when this option is selected in params['plt_precompute'].
+        """
+        if params['plt_precompute'] and self._precompute_candidate() is not None:
+            self.timer_precompute.start(params['plt_precompute_delay'])
+
+    def _precompute_candidate(self):
+        """
+        Return the stale tab that is most likely to be shown next, i.e. the
+        most recently visited tab or the tab to the right of the current one,
+        or None. The 3D plot is too expensive, it is only updated when shown.
+        """
+        for wdg in reversed(self.tab_history):
+            if wdg in self.stale and wdg is not self.plt3D:
+                return wdg
+        idx = self.tabWidget.currentIndex()
+        for i in range(1, self.tabWidget.count()):
+            wdg = self.tabWidget.widget((idx + i) % self.tabWidget.count())
+            if wdg in self.stale and wdg is not self.plt3D:
+                return wdg
+        return None
+
+    def precompute_next(self):
+        """
+        Update the single stale tab that is most likely to be shown next,
+        triggered by self.timer_precompute. Other stale tabs are updated when
+        they are shown.
+        """
+        wdg = self._precompute_candidate()
+        if wdg is not None:
+            self._update_stale(wdg)
+
 #------------------------------------------------------------------------------
     def eventFilter(self, source, event):
         """
@@ -86,30 +166,35 @@ class PlotTabWidgets(QTabWidget):
         return super(PlotTabWidgets, self).eventFilter(source, event)
 
 #------------------------------------------------------------------------------
-    def update_data(self):
+    def update_data(self, changed=None):
         """
         Calculate subplots with new filter DATA and redraw them,
         triggered by self.inputTabWidgets.sigFilterDesigned.
+
+        Only subplots depending on the keys of the filter dict in the set
+        `changed` are redrawn, `changed = None` redraws all subplots. Only the
+        visible subplot is redrawn immediately, the others when they are shown
+        (or in the background, see `precompute_next()`).
         """
         logger.debug("update_data (filter designed)")
-        self.pltHf.draw()
-        self.pltPhi.draw()
-        self.pltPZ.draw()
-        self.pltTauG.draw()
-        self.pltImpz.draw()
-        self.plt3D.draw()
+        for plt in (self.pltHf, self.pltPhi, self.pltPZ, self.pltTauG,
+                    self.pltImpz, self.plt3D):
+            if fb.is_affected(plt.fil_keys, changed):
+                self._update_or_mark(plt, 'draw')
+        self._start_precompute()
 
 #------------------------------------------------------------------------------
-    def update_view(self):
+    def update_view(self, changed=None):
         """
         Update plot limits with new filter SPECS and redraw all subplots,
-        triggered by self.inputTabWidgets.sigSpecsChanged.
+        triggered by self.inputTabWidgets.sigSpecsChanged. Subplots that don't
+        depend on the keys in the set `changed` are skipped.
         """
         logger.debug("update_view (specs changed)")
-        self.pltHf.update_view()
-        self.pltPhi.update_view()
-        self.pltTauG.update_view()
-        self.pltImpz.update_view()
+        for plt in (self.pltHf, self.pltPhi, self.pltTauG, self.pltImpz):
+            if fb.is_affected(plt.fil_keys, changed):
+                self._update_or_mark(plt, 'update_view')
+        self._start_precompute()
 #        self.pltPZ.draw()
 #        self.plt3D.draw()
         
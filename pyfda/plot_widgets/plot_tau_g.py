@@ -12,11 +12,14 @@ import numpy as np
 
 import pyfda.filterbroker as fb
 from pyfda.pyfda_rc import params
-from pyfda.pyfda_lib import grpdelay
+from pyfda.freq_response import freq_resp
 from pyfda.plot_widgets.plot_utils import MplWidget
 
 
 class PlotTauG(QWidget):
+    # keys of the filter dict the widget depends on, see filterbroker.FilterDict
+    fil_keys = ('ba', 'sos', 'f_S', 'freqSpecsRange', 'freqSpecsRangeType',
+                'freq_specs_unit', 'plt_fLabel', 'plt_tUnit')
 
     def __init__(self, parent):
         super(PlotTauG, self).__init__(parent)
@@ -74,10 +77,12 @@ class PlotTauG(QWidget):
         wholeF = fb.fil[0]['freqSpecsRangeType'] != 'half'
         f_S = fb.fil[0]['f_S']
 
-        [w, tau_g] = grpdelay(bb,aa, params['N_FFT'], whole = wholeF, 
-            verbose = self.chkWarnings.isChecked())
+        resp = freq_resp.get([bb, aa], N_FFT = params['N_FFT'], whole = wholeF,
+                             sos = fb.fil[0]['sos'],
+                             verbose = self.chkWarnings.isChecked())
+        tau_g = resp.tau_g
 
-        F = w / (2 * np.pi) * fb.fil[0]['f_S']
+        F = resp.W / (2 * np.pi) * fb.fil[0]['f_S']
 
         if fb.fil[0]['freqSpecsRangeType'] == 'sym':
             tau_g = np.fft.fftshift(tau_g)
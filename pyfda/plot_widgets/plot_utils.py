@@ -9,7 +9,7 @@ http://stackoverflow.com/questions/17973177/matplotlib-and-pyqt-dynamic-figure-r
 """
 from __future__ import print_function, division, unicode_literals
 
-from ..compat import (QtCore, QApplication, QWidget, QLabel,
+from ..compat import (QtCore, QApplication, QWidget, QLabel, pyqtSignal,
                       QSizePolicy, QIcon, QImage, QVBoxLayout,
                       QInputDialog, FigureCanvas, NavigationToolbar)
 
@@ -133,6 +133,7 @@ class MplWidget(QWidget):
             if ax.get_navigate():
                 ax.autoscale()
         self.redraw()
+        self.mplToolbar.sigZoomChanged.emit()
 
 #------------------------------------------------------------------------------
     def get_full_extent(self, ax, pad=0.0):
@@ -172,7 +173,12 @@ class MyMplToolbar(NavigationToolbar):
 
     Changing the info:
     http://stackoverflow.com/questions/15876011/add-information-to-matplotlib-navigation-toolbar-status-bar
+
+    The signal ``sigZoomChanged`` is emitted when the view limits have been
+    changed by zooming, panning or navigating the view history, allowing plot
+    widgets to recalculate their data for the visible range.
     """
+    sigZoomChanged = pyqtSignal() # view limits have been changed by the toolbar
 
 #    toolitems = (
 #        ('Home', 'Reset original view', 'home', 'home'),
@@ -371,6 +377,29 @@ class MyMplToolbar(NavigationToolbar):
 #                    self.set_message(s)
 #        else: self.set_message(self.mode)
 
+#------------------------------------------------------------------------------
+    def release_zoom(self, event):
+        """ Zoom rectangle has been released: emit sigZoomChanged """
+        NavigationToolbar.release_zoom(self, event)
+        self.sigZoomChanged.emit()
+
+    def release_pan(self, event):
+        """ Panning has finished: emit sigZoomChanged """
+        NavigationToolbar.release_pan(self, event)
+        self.sigZoomChanged.emit()
+
+    def home(self, *args):
+        NavigationToolbar.home(self, *args)
+        self.sigZoomChanged.emit()
+
+    def back(self, *args):
+        NavigationToolbar.back(self, *args)
+        self.sigZoomChanged.emit()
+
+    def forward(self, *args):
+        NavigationToolbar.forward(self, *args)
+        self.sigZoomChanged.emit()
+
 #------------------------------------------------------------------------------
     def toggle_grid(self):
         """Toggle the grid and redraw the figure."""
@@ -13,7 +13,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 import numpy as np
-from .pyfda_qt_lib import qstr
+from .pyfda_lib import qstr # Qt-free, fixpoint arithmetics can run headless
 import pyfda.filterbroker as fb
 
 # TODO: Scaling parameter is not used yet
@@ -25,6 +25,10 @@ import pyfda.filterbroker as fb
 
 __version__ = 0.5
 
+# Number of array elements processed at once by Fixed.fix(), this limits the
+# size of temporary arrays:
+FIX_CHUNK = 1 << 16
+
 def bin2hex(bin_str, frac=False):
     """
     Convert number `bin_str` in binary format to hex formatted string.
@@ -64,7 +68,9 @@ def bin2hex(bin_str, frac=False):
         hex_str = hex_str + wmap[bin_str[i:i + 4]]
         i = i + 4
 
-    hex_str = hex_str.strip("0")
+    # strip leading zeros of the integer part resp. trailing zeros of the
+    # fractional part
+    hex_str = hex_str.rstrip("0") if frac else hex_str.lstrip("0")
     hex_str = "0" if len(hex_str) == 0 else hex_str
 
     return hex_str
@@ -119,10 +125,10 @@ def dec2csd(dec_val, WF=0):
     # figure out binary range, special case for 0
     if dec_val == 0 :
         return '0'
-    if np.fabs(dec_val) < 1.0 :
-        k = 0
-    else:
-        k = int(np.ceil(np.log2(np.abs(dec_val) * 1.5)))
+    # the first digit has the exponent k-1 with 2**k >= 1.5 * |dec_val|, i.e.
+    # values in the range 2/3 ... 1 also need a digit before the point
+    k = max(int(np.ceil(np.log2(np.abs(dec_val) * 1.5))), 0)
+    k_start = k
 
     logger.debug("to {0:d}.{1:d} format".format(k, WF))
 
@@ -166,7 +172,7 @@ def dec2csd(dec_val, WF=0):
         logger.debug(csd_digits)
 
     # Always have something before the point
-    if np.fabs(dec_val) < 1.0:
+    if k_start == 0:
         csd_digits.insert(0, '0')
 
     csd_str = "".join(csd_digits)
@@ -237,6 +243,88 @@ def csd2dec(csd_str, int_places=0):
     return dec_val
 
 
+#==============================================================================
+# Vectorized conversion of integer arrays to strings, these functions are used
+# by Fixed.float2frmt() for array-like arguments. Characters are calculated
+# with integer bit operations and lookup tables as uint8 arrays with one row
+# per element and converted to a string array in one pass.
+#==============================================================================
+_HEX_LC = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+_HEX_UC = np.frombuffer(b'0123456789ABCDEF', dtype=np.uint8)
+_CSD_CHARS = np.frombuffer(b'-0+', dtype=np.uint8) # index = CSD digit + 1
+
+def _chars2str(chars):
+    """
+    Convert the 2D array `chars` of ASCII codes (one row per element) to a
+    1D array of unicode strings.
+    """
+    chars = np.ascontiguousarray(chars, dtype=np.uint8)
+    n = chars.shape[1]
+    if n == 0:
+        return np.zeros(chars.shape[0], dtype='U1')
+    return chars.view('S{0}'.format(n)).ravel().astype('U{0}'.format(n))
+
+def _bits(y_int, nbits):
+    """
+    Return the `nbits` least significant bits (MSB first) of the two's
+    complement representation of the 1D integer array `y_int` as a 2D uint8 array.
+    """
+    shifts = np.arange(nbits - 1, -1, -1, dtype=np.int64)
+    return ((y_int[:, None] >> shifts) & 1).astype(np.uint8)
+
+def bits2hex_array(bits, frac=False, upper=True):
+    """
+    Convert the 2D array `bits` (one row of bits per element, MSB first) to an
+    array of hex strings, this is the vectorized version of `bin2hex()`:
+    When `frac=False` (default), zeros are prepended until the number of bits is
+    a multiple of 4 and leading zeros are removed from the result. For a
+    fractional part (`frac = True`), zeros are appended resp. removed.
+    """
+    pad = -bits.shape[1] % 4
+    if pad:
+        zeros = np.zeros((bits.shape[0], pad), dtype=np.uint8)
+        bits = np.hstack((bits, zeros) if frac else (zeros, bits))
+    nibbles = bits.reshape(bits.shape[0], -1, 4).dot(np.array([8, 4, 2, 1], dtype=np.uint8))
+    hex_str = _chars2str((_HEX_UC if upper else _HEX_LC)[nibbles])
+    hex_str = np.char.rstrip(hex_str, '0') if frac else np.char.lstrip(hex_str, '0')
+    return np.where(np.char.str_len(hex_str) == 0, '0', hex_str)
+
+def dec2csd_array(y_int, WF=0):
+    """
+    Convert the 1D integer array `y_int` to an array of strings in CSD format,
+    this is the vectorized version of `dec2csd(y_int * 2**-WF, WF)`. The CSD
+    digits are calculated for all elements at once in the integer domain.
+    """
+    y_int = np.asarray(y_int, dtype=np.int64)
+    y_abs = np.abs(y_int) * 2. ** -WF
+    # binary range of each element, see dec2csd()
+    with np.errstate(divide='ignore'):
+        k = np.maximum(np.ceil(np.log2(y_abs * 1.5)), 0).astype(int)
+    K = int(k.max()) if len(k) else 0
+
+    exps = range(K - 1, -WF - 1, -1) # exponents of all CSD digits
+    digits = np.zeros((len(y_int), len(exps)), dtype=np.int8)
+    rem = y_int.copy() # remainder, scaled with 2**WF
+    prev_non_zero = np.zeros(len(y_int), dtype=bool)
+    for j, e in enumerate(exps):
+        w = 1 << (e + WF) # weight of the current digit, scaled with 2**WF
+        # compare remainder with limit = 2**(e+1) / 3 in the integer domain
+        pos = np.logical_and(~prev_non_zero, 3 * rem > 2 * w)
+        neg = np.logical_and(~prev_non_zero, 3 * rem < -2 * w)
+        digits[pos, j] = 1
+        digits[neg, j] = -1
+        rem -= w * (pos.astype(np.int64) - neg)
+        prev_non_zero = pos | neg
+
+    chars = _CSD_CHARS[digits + 1]
+    if WF > 0: # insert the radix point before the digit with exponent -1
+        chars = np.insert(chars, K, ord('.'), axis=1)
+    # Digits for exponents >= k are '0', the first digit for k > 0 is not
+    csd_str = np.char.lstrip(_chars2str(chars), '0')
+    # Always have something before the point
+    csd_str = np.where(k == 0, np.char.add('0', csd_str), csd_str)
+    return np.where(y_int == 0, '0', csd_str)
+
 #==============================================================================
 # Define ufuncs using numpys automatic type casting
 #==============================================================================
@@ -434,11 +522,15 @@ class Fixed(object):
             raise Exception(u'Unknown format "%s"!'%(self.frmt))
 
 #------------------------------------------------------------------------------
-    def fix(self, y, from_float=True, to_float=False):
+    def fix(self, y, from_float=True, to_float=False, out=None):
         """
         Return fixed-point integer representation `yq` of `y` (scalar or array-like),
         `yq.shape = y.shape`.
 
+        Real-valued numeric arrays are processed by `_fix_array()` in chunks of
+        `FIX_CHUNK` elements with in-place operations, the only full-size array
+        allocated is the result.
+
         `y` is multiplied by `self.MSB` before requantizing and 
 
         Saturation / two's complement wrapping happens outside the range +/- MSB,  
@@ -458,6 +550,11 @@ class Fixed(object):
             When `False` (default), fix() returns an integer that is scaled
             with `1<<(W-1)`. When `True`, a Float is returned. 
 
+        out: ndarray (optional)
+            Preallocated array for the result with the shape of `y` and
+            `dtype = np.int64` (`to_float = False`) or `np.float64`
+            (`to_float = True`), only used for array-like `y`.
+
 
         Returns
         -------
@@ -490,6 +587,9 @@ class Fixed(object):
             # create empty arrays for result and overflows with same shape as y for speedup
             SCALAR = False
             y = np.asarray(y) # convert lists / tuples / ... to numpy arrays
+            if (y.dtype.kind in 'biuf' or (y.dtype.kind == 'c' and
+                    not np.any(np.iscomplex(y)))) and self.W < 64:
+                return self._fix_array(y, from_float, to_float, out)
             if y.dtype.type is np.string_:
                 np.char.replace(y, ' ', '') # remove all whitespace
                 y = y.astype(complex) # ensure that is y is a numeric type
@@ -503,7 +603,7 @@ class Fixed(object):
             # If y is not a number, convert to string, remove whitespace and convert
             # to complex format:
             elif not np.issubdtype(type(y), np.number):
-                y = qstr(y)
+                y = str(qstr(y))
                 y = y.replace(' ','') # whitespace is not allowed in complex number
                 try:
                     y = complex(y)
@@ -557,7 +657,7 @@ class Fixed(object):
             # Replace overflows by two's complement wraparound (wrap)
             elif self.ovfl == 'wrap':
                 yq = np.where(over_pos | over_neg,
-                    yq - 2. * MSB*np.fix((np.sign(yq) * MSB+yq)/(2*MSB)), yq)
+                    np.mod(yq + MSB, 2. * MSB) - MSB, yq)
             else:
                 raise Exception('Unknown overflow type "%s"!'%(self.ovfl))
                 return None
@@ -572,6 +672,86 @@ class Fixed(object):
 
         return yq
 
+#------------------------------------------------------------------------------
+    def _fix_array(self, y, from_float, to_float, out=None, chunk_size=None):
+        """
+        Fast path of `fix()` for real-valued numeric arrays `y`: The array is
+        processed in chunks of `chunk_size` (default: `FIX_CHUNK`) elements
+        using preallocated buffers and in-place ufuncs. Two's complement
+        wrapping is performed in the integer domain with a bit mask.
+
+        Memory requirements are the result `out` plus buffers of the chunk
+        size, independent of the size of `y`.
+        """
+        chunk_size = int(chunk_size or FIX_CHUNK)
+        dtype = np.float64 if to_float else np.int64
+        if out is None:
+            out = np.empty(y.shape, dtype=dtype)
+        elif out.shape != y.shape or out.dtype != dtype or not out.flags.c_contiguous:
+            raise ValueError("'out' must be a contiguous {0} array with shape {1}!"
+                             .format(np.dtype(dtype).name, y.shape))
+        y_flat = np.ravel(y.real if y.dtype.kind == 'c' else y) # no copy when contiguous
+        out_flat = out.reshape(-1)
+
+        MSB = 1 << (self.W - 1)
+        mask = (MSB << 1) - 1 # all W bits set
+        quant = {'floor': np.floor, 'round': np.around, 'fix': np.trunc,
+                 'ceil': np.ceil, 'rint': np.rint, 'none': None}
+        if self.quant not in quant:
+            raise Exception('Unknown Requantization type "%s"!'%(self.quant))
+        if self.ovfl not in {'none', 'sat', 'wrap'}:
+            raise Exception('Unknown overflow type "%s"!'%(self.ovfl))
+        f_quant = quant[self.quant]
+
+        N = min(chunk_size, y_flat.size)
+        buf = np.empty(N) # float buffer
+        ibuf = np.empty(N, dtype=np.int64) # integer buffer
+        over = np.empty(N, dtype=bool)
+
+        for i in range(0, y_flat.size, chunk_size):
+            yc = y_flat[i:i + chunk_size]
+            n = len(yc)
+            b, ib, ov = buf[:n], ibuf[:n], over[:n]
+            if from_float:  # y is a float, scale with MSB
+                np.multiply(yc, MSB, out=b)
+            else:
+                np.copyto(b, yc, casting='unsafe')
+            if f_quant is not None: # quantize in relation to LSB
+                f_quant(b, out=b)
+
+            N_wrap = 0
+            if self.ovfl != 'none':
+                # count negative and positive overflows:
+                N_neg = np.count_nonzero(np.less(b, -MSB, out=ov))
+                N_pos = np.count_nonzero(np.greater_equal(b, MSB, out=ov))
+                self.N_over_neg += N_neg
+                self.N_over_pos += N_pos
+                if self.ovfl == 'sat': # ov is the mask for positive overflows
+                    np.putmask(b, ov, MSB - 1)
+                    np.maximum(b, -MSB, out=b)
+                elif N_neg + N_pos > 0:
+                    N_wrap = N_neg + N_pos
+                    if f_quant is None: # non-integer values, wrap in float domain
+                        np.logical_or(np.less(b, -MSB), ov, out=ov)
+                        b[ov] = np.mod(b[ov] + MSB, 2. * MSB) - MSB
+                        N_wrap = 0
+
+            if to_float and not N_wrap:
+                np.divide(b, MSB, out=out_flat[i:i + n])
+            else:
+                np.copyto(ib, b, casting='unsafe') # float -> int64
+                if N_wrap: # two's complement wrap-around via bit mask
+                    ib += MSB
+                    ib &= mask
+                    ib -= MSB
+                if to_float:
+                    np.divide(ib, MSB, out=out_flat[i:i + n])
+                else:
+                    out_flat[i:i + n] = ib
+
+        self.N_over = self.N_over_neg + self.N_over_pos
+        return out
+
 #------------------------------------------------------------------------------
     def resetN(self):
         """ Reset overflow-counters of Fixed object"""
@@ -617,7 +797,7 @@ class Fixed(object):
         else:
          # Find the number of places before the first radix point (if there is one)
          # and join integer and fractional parts:
-            val_str = qstr(y).replace(' ','') # just to be sure ...
+            val_str = str(qstr(y)).replace(' ','') # just to be sure ...
             val_str = val_str.replace(',','.') # ',' -> '.' for German-style numbers
 
             if val_str[0] == '.': # prepend '0' when the number starts with '.'
@@ -637,8 +817,8 @@ class Fixed(object):
             int_places = len(re.findall(regex[frmt], int_str)) - 1
             raw_str = val_str.replace('.','') # join integer and fractional part  
             
-            logger.debug("frmt, int_places", frmt, int_places)
-            logger.debug("y, raw_str = ", y, val_str)
+            logger.debug("frmt = %s, int_places = %d", frmt, int_places)
+            logger.debug("y = %s, raw_str = %s", y, val_str)
             # (1) calculate the decimal value of the input string without dot
             # (2) scale the integer depending the number of places and the base
 
@@ -668,7 +848,7 @@ class Fixed(object):
                 y_int = None
                 y_float = None
 
-            print("MSB = {0} |  LSB = {1} | scale = {2}\n"
+            logger.debug("MSB = {0} |  LSB = {1} | scale = {2}\n"
               "y = {3} | y_int = {4} | y_float = {5}".format(self.MSB, self.LSB, self.scale, y, y_int, y_float))
 
             if y_float is not None:
@@ -689,6 +869,101 @@ class Fixed(object):
             raise Exception('Unknown output format "%s"!'%(frmt))
             return None
 
+#------------------------------------------------------------------------------
+    def frmt2float_array(self, y, frmt=None):
+        """
+        Batch version of `frmt2float()`: Return the floating point representation
+        of all strings in the array-like `y` given in format `frmt`, together with
+        a mask that flags invalid strings.
+
+        All strings are validated and converted in one vectorized pass: the
+        characters are converted to an array of ASCII codes (one row per string),
+        digits are looked up in a table and accumulated column by column.
+        Radix points, blanks and decimal commas are accepted as in `frmt2float()`,
+        strings with more than 62 significant bits are flagged as invalid.
+
+        Parameters
+        ----------
+        y: array-like of strings (or numbers)
+            to be converted with the numeric base specified by `frmt`.
+
+        frmt: string (optional)
+            any of the formats `float`, `dec`, `bin`, `hex`, `csd`)
+            When `frmt` is unspecified, the instance parameter `self.frmt` is used
+
+        Returns
+        -------
+        yq: ndarray of float with the shape of `y`, invalid entries are `nan`
+
+        err: ndarray of bool with the shape of `y`, `True` for invalid entries
+        """
+        if frmt is None:
+            frmt = self.frmt
+        frmt = frmt.lower()
+        if frmt not in {'float', 'dec', 'bin', 'hex', 'csd'}:
+            raise Exception('Unknown output format "%s"!'%(frmt))
+
+        y_str = np.asarray(y).astype(str)
+        shape = y_str.shape
+        y_str = y_str.ravel()
+        y_str = np.char.replace(np.char.replace(y_str, ' ', ''), ',', '.')
+        y_float = np.full(y_str.shape, np.nan)
+
+        if frmt in {'float', 'dec'}:
+            try:
+                y_float = y_str.astype(float)
+            except ValueError: # convert element-wise to find the invalid entries
+                for i, v in enumerate(y_str):
+                    try:
+                        y_float[i] = float(v)
+                    except ValueError:
+                        pass
+            err = ~np.isfinite(y_float)
+            if frmt == 'dec' and not self.point:
+                y_float = y_float / self.MSB
+        else:
+            chars = np.char.encode(y_str, 'ascii', 'replace')
+            L = max(chars.dtype.itemsize, 1)
+            chars = np.frombuffer(chars.astype('S{0}'.format(L)).tobytes(),
+                                  dtype=np.uint8).reshape(len(y_str), L)
+            skip = (chars == 0) | (chars == ord('.')) # padding and radix points
+            err = (np.count_nonzero(chars == ord('.'), axis=1) > 1)
+            if frmt == 'csd':
+                base, bits = 2, 1
+                digit_lut = np.full(256, -2, dtype=np.int64)
+                digit_lut[[ord('-'), ord('0'), ord('+')]] = [-1, 0, 1]
+            else:
+                base, bits = (2, 1) if frmt == 'bin' else (16, 4)
+                digit_lut = np.full(256, -2, dtype=np.int64)
+                for d in range(base):
+                    digit_lut[ord("{0:x}".format(d))] = d
+                    digit_lut[ord("{0:X}".format(d))] = d
+            digits = digit_lut[chars]
+            err |= np.any((digits == -2) & ~skip, axis=1) # invalid characters
+            err |= np.all(skip, axis=1) # no digits at all
+            # number of significant digits (without leading zeros), more than
+            # 62 bits cannot be represented with int64:
+            first = np.argmax(~skip & (digits != 0), axis=1)
+            n_sig = np.count_nonzero(~skip & (np.arange(L) >= first[:, None]), axis=1)
+            err |= (n_sig * bits > 62)
+
+            y_int = np.zeros(len(y_str), dtype=np.int64)
+            for j in range(L): # Horner scheme, skipping padding and radix points
+                y_int = np.where(skip[:, j], y_int, y_int * base + digits[:, j])
+
+            if frmt == 'csd':
+                y_float = y_int / 2.**(self.W-1)
+            else:
+                # two's complement formats need to be treated separately
+                y_int = np.where(y_int >= (1 << (self.W-1)), y_int - (1 << self.W), y_int)
+                if self.point:
+                    y_float = self.fix(y_int * self.LSB) * self.LSB
+                else:
+                    y_float = self.fix(y_int, from_float = False) / self.MSB
+            y_float = np.where(err, np.nan, y_float)
+
+        return y_float.reshape(shape), err.reshape(shape)
+
 #------------------------------------------------------------------------------
     def float2frmt(self, y):
         """
@@ -714,11 +989,16 @@ class Fixed(object):
         -------
         yf: string, float or ndarray of float or string
             with the same shape as `y`.
-            `yf` is formatted as set in `self.frmt` with `self.W` digits
+            `yf` is formatted as set in `self.frmt` with `self.W` digits.
+            For array-like `y`, a numpy array of strings is returned that is
+            formatted in one vectorized pass by `_float2frmt_array()`.
         """
         if self.frmt == 'float': # return float input value
             return y
 
+        elif np.shape(y):
+            return self._float2frmt_array(y)
+
         else:
             # quantize & treat overflows of y (float), returning an integer in
             # the range -2**(W-1) ... 2**(W-1)
@@ -761,6 +1041,48 @@ class Fixed(object):
                 return None
 
 
+#------------------------------------------------------------------------------
+    def _float2frmt_array(self, y):
+        """
+        Vectorized version of `float2frmt()` for array-like `y`, returning
+        a numpy array of strings with the shape of `y`.
+        """
+        if self.frmt not in {'hex', 'bin', 'dec', 'csd'}:
+            raise Exception('Unknown output format "%s"!'%(self.frmt))
+
+        y_fix = np.asarray(self.fix(y), dtype=np.int64)
+        shape = y_fix.shape
+        y_fix = y_fix.ravel()
+
+        if self.frmt == 'dec':
+            y_str = (y_fix * self.LSB).astype(str) # same as str() of the elements
+
+        elif self.frmt == 'csd':
+            if self.W > 60: # integer arithmetics might overflow
+                y_str = np.array([dec2csd(v * self.LSB, self.WF if self.point else 0)
+                                  for v in y_fix])
+            elif self.point:
+                y_str = dec2csd_array(y_fix, self.WF) # yes, use fractional bits WF
+            else:
+                y_str = dec2csd_array(y_fix, 0) # no, treat as integer
+
+        else:
+            bits = _bits(y_fix, self.W) # two's complement bits, MSB first
+            if self.frmt == 'hex':
+                if self.point and self.WF > 0:
+                    y_str = np.char.add(np.char.add(
+                                bits2hex_array(bits[:, :self.WI+1]), '.'),
+                                bits2hex_array(bits[:, self.WI+1:], frac=True))
+                else:
+                    y_str = bits2hex_array(bits, upper=False) # same as dec2hex()
+            else: # self.frmt == 'bin'
+                chars = bits + np.uint8(ord('0'))
+                if self.point and self.WF > 0: # insert the radix point
+                    chars = np.insert(chars, self.WI+1, ord('.'), axis=1)
+                y_str = _chars2str(chars)
+
+        return y_str.reshape(shape)
+
 ########################################
 # If called directly, do some examples #
 ########################################
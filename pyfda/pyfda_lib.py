@@ -34,6 +34,7 @@ from numpy import pi, log10, arctan
 #matplotlib.use("Qt4Agg")
 
 import scipy.signal as sig
+from scipy.spatial import cKDTree
 from scipy import __version__ as _scipy_version
 
 #import logging
@@ -239,6 +240,7 @@ def style_widget(widget, state):
     - "changed": yellow, filter specs have been changed
     - "error" : red, an error has occurred during filter design
     - "failed" : orange, filter fails to meet target specs
+    - "pending" : blue, filter is being designed in the background
     - "unused": grey
     """
     state = str(state)
@@ -406,6 +408,87 @@ def H_mag(num, den, z, H_max, H_min = None, log = False, div_by_0 = 'ignore'):
     # clip result to H_min / H_max
     return np.clip(H_val, H_min, H_max)
 
+#------------------------------------------------------------------------------
+def log_H_zpk(zpk, z, chunk_size = 65536, dtype = np.float64):
+    r"""
+    Calculate `log10(|H(z)|)` at the complex frequencies `z` from the product
+    form of `H(z)` given by zeros, poles and gain:
+
+    .. math::
+
+        \log_{10}|H(z)| = \log_{10}|k| + \sum_i \log_{10}|z - z_i|
+                        - \sum_i \log_{10}|z - p_i|
+
+    In contrast to evaluating the polynomials b(z) and a(z), this doesn't
+    overflow or lose precision for high filter orders. The grid `z` is
+    processed in chunks of `chunk_size` points to keep the temporary arrays
+    small (cache-friendly) independent of the number of grid points.
+
+    Parameters
+    ----------
+    zpk : list or tuple
+        [z, p, k] with the arrays of zeros and poles and the gain k
+    z : array-like
+        The complex frequency(ies) where `H(z)` is to be evaluated
+    chunk_size : int, optional
+        Number of grid points processed at once (default: 65536)
+    dtype : numpy dtype, optional
+        np.float64 (default) or np.float32 for the calculation and the result,
+        np.float32 halves the memory requirements.
+
+    Returns
+    -------
+    log_H : ndarray
+        `log10(|H(z)|)` with the same shape as `z`, -inf at zeros and +inf at
+        poles of H(z).
+    """
+    dtype = np.dtype(dtype)
+    cdtype = np.result_type(dtype, np.complex64)
+    z = np.asarray(z)
+    zz = np.atleast_1d(zpk[0]).astype(cdtype)
+    pp = np.atleast_1d(zpk[1]).astype(cdtype)
+    z_flat = z.ravel()
+    log_H = np.empty(z_flat.shape, dtype = dtype)
+
+    olderr = np.seterr(divide = 'ignore', invalid = 'ignore')
+    log_k = np.log10(np.abs(zpk[2]))
+    for i in range(0, len(z_flat), chunk_size):
+        zc = z_flat[i:i + chunk_size].astype(cdtype)
+        acc = np.full(zc.shape, log_k, dtype = dtype)
+        for root in zz:
+            acc += np.log10(np.abs(zc - root))
+        for root in pp:
+            acc -= np.log10(np.abs(zc - root))
+        log_H[i:i + chunk_size] = acc
+    np.seterr(**olderr)
+
+    return log_H.reshape(z.shape)
+
+def H_mag_zpk(zpk, z, H_max, H_min = None, log = False, chunk_size = 65536,
+              dtype = np.float64, log_H = None):
+    """
+    Calculate `|H(z)|` at the complex frequency(ies) `z` like `H_mag()`, but
+    from the product form `[z, p, k]` of `H(z)` using `log_H_zpk()`.
+
+    When `log_H`, the result of a previous call of `log_H_zpk()` for the same
+    filter and grid, is passed, only the scaling and clipping is performed.
+
+    The result is clipped at H_min, H_max; when log = True,
+    `20 log_10 (|H(z)|)` is returned and the limits have to be given in dB.
+    """
+    if log_H is None:
+        log_H = log_H_zpk(zpk, z, chunk_size = chunk_size, dtype = dtype)
+    olderr = np.seterr(over = 'ignore', invalid = 'ignore')
+    if log:
+        H_val = 20 * log_H
+    else:
+        H_val = np.power(log_H.dtype.type(10), log_H)
+    np.seterr(**olderr)
+    H_val = np.nan_to_num(H_val) # points at both a pole and a zero
+
+    # clip result to H_min / H_max
+    return np.clip(H_val, H_min, H_max)
+
 #----------------------------------------------
 # from scipy.sig.signaltools.py:
 def cmplx_sort(p):
@@ -459,6 +542,9 @@ def unique_roots(p, tol=1e-3, magsort = False, rtype='min', rdist='euclidian'):
     This utility function is not specific to roots but can be used for any
     sequence of values for which uniqueness and multiplicity has to be
     determined. For a more general routine, see `numpy.unique`.
+
+    For complex values, neighbours within the tolerance are found with a
+    KD-tree (`scipy.spatial.cKDTree`), the run time grows with O(n log n).
     
     Examples
     --------
@@ -528,14 +614,40 @@ def unique_roots(p, tol=1e-3, magsort = False, rtype='min', rdist='euclidian'):
             pass
 
         elif (np.iscomplexobj(p) and not magsort):
-            while len(p):
-                # calculate distance of first root against all others and itself
-                # -> multiplicity is at least 1, first root is always deleted
-                tolarr = np.less(dist_roots(p[0], p), tol)                               # assure multiplicity is at least one
-                mult.append(np.sum(tolarr)) # multiplicity = number of "hits"
-                pout.append(comproot(p[tolarr])) # pick the roots within the tolerance
-
-                p = p[~tolarr]  # and delete them
+            # The first remaining root is combined with all remaining roots
+            # within the tolerance, this is repeated until no roots are left.
+            # Candidate pairs of roots within the tolerance are found with a
+            # KD-tree over (re, im) in O(n log n), roots without a neighbour
+            # are unique and don't need to be processed one by one.
+            xy = np.column_stack((p.real, p.imag))
+            pairs = np.array(sorted(cKDTree(xy).query_pairs(
+                            tol, p=1 if dist_roots is manhattan else 2)),
+                            dtype=int).reshape(-1, 2)
+            # query_pairs includes the distance tol, use the exact criterion:
+            pairs = pairs[np.less(dist_roots(p[pairs[:,0]], p[pairs[:,1]]), tol)]
+
+            # neighbours of each root as slices of the sorted index array nbrs
+            nbrs = np.concatenate((pairs, pairs[:,::-1]))
+            nbrs = nbrs[np.lexsort((nbrs[:,1], nbrs[:,0]))]
+            start = np.searchsorted(nbrs[:,0], np.arange(len(p) + 1))
+
+            u_val = p.tolist() # roots without neighbours are kept unchanged
+            u_mult = np.ones(len(p), dtype=int)
+            alive = np.ones(len(p), dtype=bool) # root has not been combined yet
+            seed = np.ones(len(p), dtype=bool)  # root represents a group
+            for i in np.unique(pairs): # roots with neighbours in ascending order
+                if not alive[i]:
+                    seed[i] = False
+                    continue
+                # all remaining neighbours have indices larger than i
+                idx = nbrs[start[i]:start[i+1], 1]
+                idx = np.concatenate(([i], idx[alive[idx]]))
+                alive[idx] = False
+                u_mult[i] = len(idx) # multiplicity = number of "hits"
+                u_val[i] = comproot(p[idx]) # pick the roots within the tolerance
+
+            pout += [u_val[i] for i in np.nonzero(seed)[0]]
+            mult += u_mult[seed].tolist()
 
         else:
             sameroots = [] # temporary list for roots within the tolerance
@@ -616,6 +728,9 @@ Returns
 hn : ndarray with length N (see above)
 td : ndarray containing the time steps with same
 
+See also
+--------
+stream_filter.StreamFilter : filter long signals block by block
 
 Examples
 --------
@@ -658,7 +773,8 @@ Examples
     return hn, td
 
 #==================================================================
-def grpdelay(b, a=1, nfft=512, whole=False, analog=False, verbose=True, fs=2.*pi, use_scipy = True):
+def grpdelay(b, a=1, nfft=512, whole=False, analog=False, verbose=True, fs=2.*pi,
+             use_scipy = True, method = 'auto'):
 #==================================================================
     """
 Calculate group delay of a discrete time filter, specified by
@@ -689,6 +805,18 @@ nfft :  integer (optional, default: 512)
 fs : float (optional, default: fs = 2*pi)
      Sampling frequency.
 
+method : string (optional, default: 'auto')
+     Evaluation of the polynomials on the frequency grid:
+
+     'polyval' : direct evaluation with `np.polyval`, costs O(L * nfft) for
+                 a polynomial with L coefficients
+
+     'fft' : FFT of the coefficients, folded to nfft points, costs
+             O(nfft log nfft + L). Only possible for `fs = 2*pi`.
+
+     'auto' : use the FFT when the polynomial is longer than log2(nfft) / 2 and
+              `fs = 2*pi`, else use `np.polyval`
+
 
 Returns
 -------
@@ -913,9 +1041,25 @@ Examples
     b, a = map(np.atleast_1d, (b, a))
     c = np.convolve(b, a[::-1])
     cr = c * np.arange(c.size)
-    z = np.exp(-1j * w)
-    num = np.polyval(cr[::-1], z)
-    den = np.polyval(c[::-1], z)
+
+    if method == 'auto':
+        method = 'fft' if c.size > np.log2(nfft) / 2 else 'polyval'
+    if method == 'fft' and not np.isclose(fs, 2 * pi):
+        method = 'polyval' # frequency grid doesn't match the FFT bins
+
+    if method == 'fft':
+        # w = 2 pi k / nfft: the polynomials in z = exp(-jw) are the DFTs of
+        # the coefficients. z^nfft = 1 on the grid, so coefficients with index
+        # n >= nfft are added to the coefficient with index n mod nfft.
+        def _fold(x):
+            x = np.concatenate((x, np.zeros(-x.size % nfft)))
+            return x.reshape(-1, nfft).sum(axis=0)
+        num = np.fft.fft(_fold(cr))
+        den = np.fft.fft(_fold(c))
+    else:
+        z = np.exp(-1j * w)
+        num = np.polyval(cr[::-1], z)
+        den = np.polyval(c[::-1], z)
     singular = np.absolute(den) < 10 * minmag
     if np.any(singular) and verbose:
         singularity_list = ", ".join("{0:.3f}".format(ws/(2*pi)) for ws in w[singular])
@@ -1117,12 +1261,96 @@ def fil_save(fil_dict, arg, format_in, sender, convert = True):
         fil_convert(fil_dict, format_in)
 
 #==============================================================================
+def _convert_format(fmt, format_in, src):
+    """
+    Convert the filter design given in the format(s) ``format_in`` by the
+    entries of the dict ``src`` to the format ``fmt`` and return it.
+    Exceptions of the scipy conversion routines are passed on.
+    """
+    if 'sos' in format_in:
+        if fmt == 'zpk':
+            zpk = list(sig.sos2zpk(src['sos']))
+            # check whether sos conversion has created a additional (superfluous)
+            # pole and zero at the origin and delete them:
+            z_0 = np.where(zpk[0] == 0)[0]
+            p_0 = np.where(zpk[1] == 0)[0]
+            if len(p_0) > 0 and len(z_0) > 0: # eliminate z = 0 and p = 0 from list:
+                zpk[0] = np.delete(zpk[0],z_0)
+                zpk[1] = np.delete(zpk[1],p_0)
+            return zpk
+        elif fmt == 'ba':
+            ba = list(sig.sos2tf(src['sos']))
+            # check whether sos conversion has created additional (superfluous)
+            # highest order polynomial with coefficient 0 and delete them
+            if ba[0][-1] == 0 and ba[1][-1] == 0:
+                ba[0] = np.delete(ba[0],-1)
+                ba[1] = np.delete(ba[1],-1)
+            return ba
+
+    elif 'zpk' in format_in: # z, p, k have been generated,convert to other formats
+        if fmt == 'ba':
+            zpk = src['zpk']
+            return sig.zpk2tf(zpk[0], zpk[1], zpk[2])
+        elif fmt == 'sos':
+            return [] # don't convert zpk -> SOS due to numerical inaccuracies
+#            try:
+#                fil_dict['sos'] = sig.zpk2sos(zpk[0], zpk[1], zpk[2])
+#            except ValueError:
+#                fil_dict['sos'] = []
+#                print("WARN (pyfda_lib): Complex-valued coefficients, could not convert to SOS.")
+
+    elif 'ba' in format_in: # arg = [b,a]
+        if fmt == 'zpk':
+            return list(sig.tf2zpk(src['ba'][0], src['ba'][1]))
+        elif fmt == 'sos':
+            return [] # don't convert ba -> SOS due to numerical inaccuracies
+#        if SOS_AVAIL:
+#            try:
+#                fil_dict['sos'] = sig.tf2sos(b,a)
+#            except ValueError:
+#                fil_dict['sos'] = []
+#                print("WARN (pyfda_lib): Complex-valued coefficients, could not convert to SOS.")
+
+    raise ValueError("Cannot convert format {0} to {1}".format(format_in, fmt))
+
+
+class FilterState(object):
+    """
+    Filter design in the format(s) ``format_in``, taken from the dict
+    ``fil_dict``. The other formats are calculated on first access with
+    ``get()`` and memoized. When the source is changed with ``set_source()``,
+    the memoized formats are invalidated.
+    """
+    def __init__(self, fil_dict, format_in):
+        self.format_in = format_in
+        self.src = dict((f, fil_dict[f]) for f in ('ba', 'zpk', 'sos') if f in format_in)
+        self.memo = {}
+
+    def get(self, fmt):
+        """ Return the filter design in the format ``fmt`` """
+        if fmt in self.src:
+            return self.src[fmt]
+        if fmt not in self.memo:
+            self.memo[fmt] = _convert_format(fmt, self.format_in, self.src)
+        return self.memo[fmt]
+
+    def set_source(self, fmt, value):
+        """ Replace the source format ``fmt`` and invalidate the conversions """
+        self.src[fmt] = value
+        self.memo.clear()
+
+
 def fil_convert(fil_dict, format_in):
     """
     Convert between poles / zeros / gain, filter coefficients (polynomes)
     and second-order sections and store all formats not generated by the filter
     design routine in the passed dictionary 'fil_dict'.
 
+    When 'fil_dict' supports lazy entries (``filterbroker.FilterDict``, i.e.
+    ``fb.fil[0]``), the conversions are only performed when the converted
+    formats are accessed the first time, e.g. the zeros of a long FIR filter
+    are only calculated when they are displayed.
+
     Parameters
     ----------
     fil_dict :  dictionary
@@ -1138,63 +1366,26 @@ def fil_convert(fil_dict, format_in):
          'ba' : [b, a] where b and a are the polynomial coefficients - finding
                    the roots of the a and b polynomes may fail for higher orders
     """
-    
     if 'sos' in format_in:
-        if 'zpk' not in format_in:
-            try:
-                fil_dict['zpk'] = list(sig.sos2zpk(fil_dict['sos']))
-            except Exception as e:
-                logger.error(e)
-            # check whether sos conversion has created a additional (superfluous)
-            # pole and zero at the origin and delete them:
-            z_0 = np.where(fil_dict['zpk'][0] == 0)[0]
-            p_0 = np.where(fil_dict['zpk'][1] == 0)[0]
-            if p_0 and z_0: # eliminate z = 0 and p = 0 from list:
-                fil_dict['zpk'][0] = np.delete(fil_dict['zpk'][0],z_0)
-                fil_dict['zpk'][1] = np.delete(fil_dict['zpk'][1],p_0)
-
-        if 'ba' not in format_in:
-            try:
-                fil_dict['ba'] = list(sig.sos2tf(fil_dict['sos']))
-            except Exception as e:
-                logger.error(e)
-            # check whether sos conversion has created additional (superfluous)
-            # highest order polynomial with coefficient 0 and delete them
-            if fil_dict['ba'][0][-1] == 0 and fil_dict['ba'][1][-1] == 0:
-                fil_dict['ba'][0] = np.delete(fil_dict['ba'][0],-1) 
-                fil_dict['ba'][1] = np.delete(fil_dict['ba'][1],-1) 
+        formats = ['zpk', 'ba']
+    elif 'zpk' in format_in:
+        formats = ['ba', 'sos']
+    elif 'ba' in format_in:
+        formats = ['zpk', 'sos']
+    else:
+        raise ValueError("Unknown input format {0:s}".format(format_in))
 
-    elif 'zpk' in format_in: # z, p, k have been generated,convert to other formats
-        zpk = fil_dict['zpk']
-        if 'ba' not in format_in:
+    state = FilterState(fil_dict, format_in)
+    for fmt in formats:
+        if fmt in format_in:
+            continue
+        if fmt != 'sos' and hasattr(fil_dict, 'set_lazy'):
+            fil_dict.set_lazy(fmt, state) # convert on first access
+        else:
             try:
-                fil_dict['ba'] = sig.zpk2tf(zpk[0], zpk[1], zpk[2])
+                fil_dict[fmt] = state.get(fmt)
             except Exception as e:
                 logger.error(e)
-        if 'sos' not in format_in:
-            fil_dict['sos'] = [] # don't convert zpk -> SOS due to numerical inaccuracies
-#            try:
-#                fil_dict['sos'] = sig.zpk2sos(zpk[0], zpk[1], zpk[2])
-#            except ValueError:
-#                fil_dict['sos'] = []
-#                print("WARN (pyfda_lib): Complex-valued coefficients, could not convert to SOS.")
-                
-    elif 'ba' in format_in: # arg = [b,a]
-        b, a = fil_dict['ba'][0], fil_dict['ba'][1]
-        try:
-            fil_dict['zpk'] = list(sig.tf2zpk(b,a))
-        except Exception as e:
-            logger.error(e)
-        fil_dict['sos'] = [] # don't convert ba -> SOS due to numerical inaccuracies
-#        if SOS_AVAIL:
-#            try:
-#                fil_dict['sos'] = sig.tf2sos(b,a)
-#            except ValueError:
-#                fil_dict['sos'] = []
-#                print("WARN (pyfda_lib): Complex-valued coefficients, could not convert to SOS.")
-
-    else:
-        raise ValueError("Unknown input format {0:s}".format(format_in))
 
         
 def sos2zpk(sos):
@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
 import csv
 import numpy as np
 
-from .compat import Qt, QtCore, QFrame, QFont, QEvent, QSysInfo
+from .compat import Qt, QtCore, QFrame, QFont, QEvent, QSysInfo, QWidget, pyqtSignal
 
 #import pyfda.simpleeval as se
 
@@ -149,6 +149,22 @@ def qhline(widget):
     line.setFrameShadow(QFrame.Sunken)
     return line
     
+#------------------------------------------------------------------------------
+class QDynWidget(QWidget):
+    """
+    Container for the dynamic subwidgets of a filter design class (`wdg_fil`).
+
+    The filter design classes themselves are plain Python objects without
+    any Qt dependency. When the GUI is running, ``construct_UI()`` creates an
+    instance of this class which provides the signal ``sigFiltChanged`` that
+    is connected to ``select_filter.SelectFilter``.
+    """
+    sigFiltChanged = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super(QDynWidget, self).__init__(parent)
+        self.setObjectName('wdg_fil')
+
 #------------------------------------------------------------------------------
 
 def qget_selected(table, reverse=True):
@@ -270,13 +286,7 @@ def qcopy_from_clipboard(source):
     """
     source_type = str(source.__class__.__name__)
     if "clipboard" in source_type.lower() :
-        text = source.text()
-        
-        dialect = csv.Sniffer.sniff(text)
-        print("header:",dialect.has_header)
-        print("delimiter:", dialect.delimiter)
-        print("terminator:", dialect.lineterminator)
-        return source.text() # read from clipboard
+        return qstr(source.text()) # read from clipboard
     else:
         logger.error("Unknown object {0}, cannot copy data.".format(source_type))
 
@@ -49,13 +49,22 @@ THEME = 'light' # select 'dark' or 'light' theme or 'none' or use one of the
 mpl_ms = 8 # base size for matplotlib markers
 # Various parameters for calculation and plotting
 params = {'N_FFT':  2048,   # number of FFT points for plot commands (freqz etc.)
+          'N_FFT_zoom': 1024, # number of points for H(f) in zoomed views
           'FMT': '{:.3g}',  # format string for QLineEdit fields
           'FMT_ba': 4,      # number of digits for coefficient table
           'FMT_pz': 5,      # number of digits for Pole/Zero table
           'P_Marker': [mpl_ms, 'r'], # size and color for poles' marker
           'Z_Marker': [mpl_ms, 'b'], # size and color for zeros' marker
           'wdg_margins' : (2,1,2,0),  # R, T, L, B widget margins
-          'mpl_hatch_border': {'linewidth':1.0, 'color':'blue', 'linestyle':'--'}     
+          'mpl_hatch_border': {'linewidth':1.0, 'color':'blue', 'linestyle':'--'},
+          'design_cache_size': 64,   # max. number of cached filter designs, 0 = off
+          'design_cache_dir': None,  # directory for persistent design cache or None
+          'design_in_thread': True,  # design filters in a background thread
+          'N_3D': 100,      # number of grid steps in x, y (r, phi) for 3D plots
+          'F32_3D': False,  # calculate |H(z)| for 3D plots with float32
+          'plt_precompute': False, # update the next likely hidden plot tab when the GUI is idle
+          'plt_precompute_delay': 300, # idle time in ms before updating a hidden tab
+          'hdl_sim_frames': 3 # number of FFT frames for the HDL simulation
           }
 mpl_params_dark = {
             'mpl_hatch': {                          # hatched area for specs
@@ -430,6 +439,9 @@ qss_common = """
                         stop: 0 #cccccc, stop: 0.1 red, stop: 1.0 #444444);
                                 color: white;}
                 QPushButton[state="failed"]{background-color:orange; color:white}
+                QPushButton[state="pending"]{background-color: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                        stop: 0 #cccccc, stop: 0.1 #6495ED, stop: 1.0 #444444);
+                                color: white;}
                 QPushButton[state="ok"]{background-color: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
                         stop: 0 #cccccc, stop: 0.1 green, stop: 1.0 #444444);
                                 color: white;}
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+stream_filter.py
+
+Block-wise filtering of arbitrarily long signals: Instead of building the
+whole signal in memory and filtering it with one call of ``sig.lfilter`` or
+``sig.sosfilt``, the signal is passed as an iterator of blocks (e.g. read
+from a file) and the filtered blocks are yielded one by one. The filter state
+is kept between the blocks, the concatenated output is identical bit by bit
+to filtering the concatenated input in one call:
+
+- IIR filters in ``ba`` format and second-order sections pass the final
+  state ``zf`` of each block as the initial state ``zi`` of the next block.
+- FIR filters (``len(a) == 1``) are evaluated by scipy with ``np.convolve``,
+  the final state of a block is rounded differently. Instead, the last
+  ``len(b) - 1`` input samples are kept and prepended to the next block.
+  Only for signals shorter than the filter, the results may differ in the
+  last bit from a single call of ``sig.lfilter``.
+
+The arithmetics use the same data type as scipy, i.e. ``np.result_type`` of
+coefficients and signal: float32 and integer input is filtered with float64,
+complex input with complex128 precision.
+
+Example
+-------
+
+>>> from pyfda.stream_filter import stream_filter, iter_blocks
+>>> for y in stream_filter(iter_blocks(x, 4096), sos=fb.fil[0]['sos']):
+...     f_out.write(y.tobytes())
+
+Author: Christian Muenker
+"""
+
+from __future__ import division, unicode_literals, print_function, absolute_import
+import logging
+
+import numpy as np
+import scipy.signal as sig
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------------------
+def _slice(x, start, stop, axis):
+    """ Return ``x[..., start:stop, ...]`` along `axis` """
+    ind = [slice(None)] * x.ndim
+    ind[axis] = slice(start, stop)
+    return x[tuple(ind)]
+
+def iter_blocks(x, block_len, axis=-1):
+    """
+    Yield consecutive blocks with `block_len` samples (views) of the array `x`
+    along `axis`, the last block may be shorter.
+    """
+    x = np.asarray(x)
+    N = x.shape[axis]
+    for start in range(0, N, block_len):
+        yield _slice(x, start, min(start + block_len, N), axis)
+
+#------------------------------------------------------------------------------
+class StreamFilter(object):
+    """
+    Filter consecutive blocks of a signal with persistent state, see the
+    module docstring.
+
+    Parameters
+    ----------
+
+    ba : list or tuple of array_like (optional, default: None)
+        numerator and denominator coefficients [b, a]
+
+    sos : array_like (optional, default: None)
+        second-order sections with shape (n_sections, 6); when not empty,
+        the filter is evaluated as a cascade of sections and `ba` is not used
+
+    axis : int (optional, default: -1)
+        axis of the blocks along which the filter is applied
+    """
+    def __init__(self, ba=None, sos=None, axis=-1):
+        self.axis = axis
+        if sos is not None and len(sos) > 0:
+            self.sos = np.atleast_2d(sos)
+            self.mode = 'sos'
+        elif ba is not None:
+            self.b = np.atleast_1d(ba[0])
+            self.a = np.atleast_1d(ba[1])
+            self.mode = 'fir' if self.a.size == 1 else 'iir'
+        else:
+            raise ValueError("Either 'ba' or 'sos' coefficients are required.")
+        self.reset()
+
+    def reset(self):
+        """ Reset the filter state and the sample counter """
+        self.zi = None # filter state or input history (FIR)
+        self.n_samples = 0
+
+    def _init_state(self, x):
+        shape = list(x.shape)
+        if self.mode == 'sos':
+            shape[self.axis] = 2
+            shape = [len(self.sos)] + shape
+            dtype = np.result_type(self.sos, x)
+        else:
+            dtype = np.result_type(self.b, self.a, x)
+            if self.mode == 'iir':
+                shape[self.axis] = max(self.a.size, self.b.size) - 1
+            else: # empty history
+                shape[self.axis] = 0
+        return np.zeros(shape, dtype=dtype)
+
+    def process(self, x):
+        """
+        Filter the block `x`, the filter state is updated for the next block.
+
+        Returns
+        -------
+
+        y : ndarray
+            filtered block with the same shape as `x`
+        """
+        x = np.asarray(x)
+        if self.zi is None:
+            self.zi = self._init_state(x)
+        if x.shape[self.axis] == 0: # scipy doesn't pass on the state of empty blocks
+            return x.astype(np.result_type(self.zi, x))
+        if self.mode == 'sos':
+            y, self.zi = sig.sosfilt(self.sos, x, axis=self.axis, zi=self.zi)
+        elif self.mode == 'iir':
+            y, self.zi = sig.lfilter(self.b, self.a, x, axis=self.axis, zi=self.zi)
+        else:
+            y = self._process_fir(x)
+        self.n_samples += x.shape[self.axis]
+        return y
+
+    def _process_fir(self, x):
+        """
+        FIR filtering with the same operations as ``sig.lfilter``: The history
+        of the last input samples is prepended to the block and convolved with
+        the normalized coefficients.
+        """
+        axis = self.axis
+        dtype = np.result_type(self.b, self.a, x, self.zi)
+        b = np.array(self.b, dtype=dtype)
+        b /= np.asarray(self.a, dtype=dtype)[0]
+
+        n_hist = self.zi.shape[axis]
+        xc = np.concatenate((self.zi.astype(dtype), x.astype(dtype)), axis=axis)
+        n = xc.shape[axis]
+        # copy, a view would keep the whole block in memory
+        self.zi = _slice(xc, max(n - (len(b) - 1), 0), n, axis).copy()
+        if n <= len(b):
+            # np.convolve swaps its arguments when the signal is longer than the
+            # filter, this changes the order of summation. Append zeros to
+            # reproduce the summation order of one long signal.
+            pad = list(xc.shape)
+            pad[axis] = len(b) + 1 - n
+            xc = np.concatenate((xc, np.zeros(pad, dtype=dtype)), axis=axis)
+        y = np.apply_along_axis(lambda v: np.convolve(b, v), axis, xc)
+        return _slice(y, n_hist, n, axis)
+
+    def filter_blocks(self, blocks):
+        """ Generator that filters an iterable of blocks and yields the results """
+        for x in blocks:
+            yield self.process(x)
+
+#------------------------------------------------------------------------------
+def stream_filter(blocks, ba=None, sos=None, axis=-1):
+    """
+    Filter the blocks of the iterable `blocks` with the coefficients `ba` or
+    the second-order sections `sos` and yield the filtered blocks, see
+    ``StreamFilter``.
+    """
+    return StreamFilter(ba=ba, sos=sos, axis=axis).filter_blocks(blocks)
+
+###############################################################################
+
+if __name__ == '__main__':
+    x = np.random.randn(10000)
+    b, a = sig.ellip(6, 0.5, 40, 0.2)
+    y = np.concatenate(list(stream_filter(iter_blocks(x, 999), ba=(b, a))))
+    print(np.array_equal(y, sig.lfilter(b, a, x)))
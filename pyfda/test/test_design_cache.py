@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#===========================================================================
+#  unittest for the cache of filter design results in design_cache.py
+#
+# (c) 2017 Christian Muenker
+#===========================================================================
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+if __name__ == "__main__":
+    import sys, os
+    __cwd__ = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(os.path.dirname(__cwd__)))
+
+import shutil
+import tempfile
+import threading
+import unittest
+import numpy as np
+
+from pyfda.design_cache import DesignCache, canonical_hash
+from pyfda.design_engine import DesignEngine
+
+
+class TestDesignCache(unittest.TestCase):
+
+    def setUp(self):
+        self.specs = {'rt':'BS', 'fo':'min', 'F_PB':0.1, 'F_SB':0.15,
+                      'F_SB2':0.25, 'F_PB2':0.3}
+
+    def test_hash(self):
+        """ hash doesn't depend on key order but on values and types """
+        self.assertEqual(canonical_hash({'a':1, 'b':[0.5, 'x']}),
+                         canonical_hash({'b':[0.5, 'x'], 'a':1}))
+        self.assertNotEqual(canonical_hash({'a':1}), canonical_hash({'a':1.}))
+        self.assertNotEqual(canonical_hash(np.zeros(3)), canonical_hash(np.zeros(4)))
+
+    def test_hit(self):
+        """ second design is taken from the cache with identical results """
+        engine = DesignEngine(DesignCache(size=4))
+        ref = DesignEngine().design(self.specs, 'Ellip')
+        engine.design(self.specs, 'Ellip')
+        fil_dict = engine.design(self.specs, 'Ellip')
+        self.assertEqual(engine.design_cache.hits, 1)
+        self.assertEqual(fil_dict['N'], ref['N'])
+        np.testing.assert_array_equal(fil_dict['sos'], ref['sos'])
+        np.testing.assert_array_equal(fil_dict['ba'][0], ref['ba'][0])
+        self.assertEqual(fil_dict['F_C'], ref['F_C'])
+
+    def test_same_dict(self):
+        """ results of previous designs in the filter dict don't affect the key """
+        from pyfda.filter_design.butter import Butter
+        from pyfda.design_engine import fil_dict_from_specs
+        cache = DesignCache(size=4)
+        fil_dict = fil_dict_from_specs({'rt':'LP', 'fo':'man'})
+        for N in (3, 5, 3):
+            fil_dict['N'] = N
+            cache.call(Butter(), 'LPman', fil_dict)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(len(fil_dict['ba'][0]), 4)
+
+    def test_irrelevant_keys(self):
+        """ keys not read by the design method don't invalidate the cache """
+        engine = DesignEngine(DesignCache(size=4))
+        engine.design(self.specs, 'Ellip')
+        specs = dict(self.specs, f_S=48000., W_PB=3)
+        engine.design(specs, 'Ellip')
+        self.assertEqual(engine.design_cache.hits, 1)
+        specs['A_SB'] = 1e-4 # relevant key
+        engine.design(specs, 'Ellip')
+        self.assertEqual(engine.design_cache.hits, 1)
+
+    def test_lru(self):
+        """ the least recently used entry is removed """
+        engine = DesignEngine(DesignCache(size=2))
+        for N in (2, 3, 2, 4, 2, 3):
+            engine.design({'rt':'LP', 'fo':'man', 'N':N}, 'Butter')
+        self.assertEqual(engine.design_cache.hits, 2)
+        self.assertEqual(len(engine.design_cache.entries), 2)
+
+    def test_threads(self):
+        """ a cache shared between threads stays consistent """
+        cache = DesignCache(size=3)
+        errors = []
+        def run():
+            try:
+                engine = DesignEngine(cache)
+                for N in (2, 3, 4, 5) * 5:
+                    fil_dict = engine.design({'rt':'LP', 'fo':'man', 'N':N}, 'Butter')
+                    self.assertEqual(len(fil_dict['ba'][0]), N + 1)
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=run) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(cache.hits + cache.misses, 80)
+        self.assertEqual(len(cache.entries), 3)
+
+    def test_disk(self):
+        """ results are found on disk by a new cache instance """
+        tmp = tempfile.mkdtemp()
+        try:
+            DesignEngine(DesignCache(cache_dir=tmp)).design(self.specs, 'Ellip')
+            engine = DesignEngine(DesignCache(cache_dir=tmp))
+            engine.design(self.specs, 'Ellip')
+            self.assertEqual(engine.design_cache.hits, 1)
+        finally:
+            shutil.rmtree(tmp)
+
+#==============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
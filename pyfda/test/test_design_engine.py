@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#===========================================================================
+#  unittest for the headless filter design engine in design_engine.py
+#
+# (c) 2017 Christian Muenker
+#===========================================================================
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+if __name__ == "__main__":
+    import sys, os
+    __cwd__ = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(os.path.dirname(__cwd__)))
+
+import sys
+import unittest
+import numpy as np
+import scipy.signal as sig
+
+import pyfda.filterbroker as fb
+from pyfda.design_engine import design, fil_dict_from_specs
+
+
+class TestDesignEngine(unittest.TestCase):
+
+    def test_no_qt(self):
+        """ designing a filter must not import Qt """
+        design({'rt':'LP', 'fo':'man', 'N':4, 'F_C':0.1}, 'Butter')
+        self.assertFalse('PyQt4' in sys.modules or 'PyQt5' in sys.modules)
+
+    def test_man(self):
+        """ manual order design yields the same coefficients as scipy """
+        fil_dict = design({'rt':'LP', 'fo':'man', 'N':4, 'F_C':0.1}, 'Butter')
+        sos = sig.butter(4, 0.2, output='sos')
+        np.testing.assert_array_almost_equal(fil_dict['sos'], sos)
+        self.assertEqual(fil_dict['ft'], 'IIR')
+        self.assertEqual(fil_dict['fc'], 'Butter')
+
+    def test_min(self):
+        """ minimum order design writes back order and corner frequency """
+        fil_dict = design({'rt':'LP', 'fo':'min', 'F_PB':0.1, 'F_SB':0.15,
+                           'A_PB':0.1, 'A_SB':0.01}, 'cheby1')
+        N, F_C = sig.cheb1ord(0.2, 0.3, 20*np.log10(1/(1-0.1)), 40)
+        self.assertEqual(fil_dict['N'], N)
+        self.assertAlmostEqual(fil_dict['F_C'], F_C / 2.)
+
+    def test_globals_untouched(self):
+        """ neither fb.fil[0] nor the passed specs are modified """
+        specs = {'rt':'HP', 'fo':'min'}
+        N = fb.fil[0]['N']
+        design(specs, 'Ellip')
+        self.assertEqual(specs, {'rt':'HP', 'fo':'min'})
+        self.assertEqual(fb.fil[0]['N'], N)
+
+    def test_defaults(self):
+        """ missing specs are taken from fb.fil_init """
+        fil_dict = fil_dict_from_specs({'N':3})
+        self.assertEqual(fil_dict['N'], 3)
+        self.assertEqual(fil_dict['F_SB2'], fb.fil_init['F_SB2'])
+
+    def test_unsupported(self):
+        """ unknown classes and response types raise a ValueError """
+        self.assertRaises(ValueError, design, {'rt':'LP'}, 'NoSuchFilter')
+        self.assertRaises(ValueError, design, {'rt':'DIFF', 'fo':'man'}, 'Butter')
+
+#==============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#===========================================================================
+#  unittest for the parameter sweeps in design_sweep.py
+#
+# (c) 2017 Christian Muenker
+#===========================================================================
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+if __name__ == "__main__":
+    import sys, os
+    __cwd__ = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(os.path.dirname(__cwd__)))
+
+import unittest
+import numpy as np
+import scipy.signal as sig
+
+from pyfda.design_sweep import (sweep_params, set_spec, design_metrics,
+                                run_sweep, _parse_sweep, _parse_value)
+
+
+class TestDesignSweep(unittest.TestCase):
+
+    def test_sweep_params(self):
+        """ cartesian product of the swept parameters, sorted by key """
+        params = sweep_params({'win': ['hann', 'hamming'], 'N': [10, 20, 30]})
+        self.assertEqual(len(params), 6)
+        self.assertEqual(params[0], {'N': 10, 'win': 'hann'})
+        self.assertEqual(params[1], {'N': 10, 'win': 'hamming'})
+        self.assertEqual(params[-1], {'N': 30, 'win': 'hamming'})
+        self.assertEqual(sweep_params({}), [{}])
+
+    def test_set_spec(self):
+        """ aliases and dotted paths create nested dicts """
+        specs = {'wdg_fil': {'firwin': {'alg': 'ichige'}}}
+        set_spec(specs, 'win', 'hann')
+        set_spec(specs, 'wdg_fil.ma.stages', 2)
+        set_spec(specs, 'N', 10)
+        self.assertEqual(specs, {'N': 10, 'wdg_fil': {'firwin': {'alg': 'ichige',
+                                 'win': 'hann'}, 'ma': {'stages': 2}}})
+
+    def test_parse(self):
+        """ command line syntax for swept parameters """
+        self.assertEqual(_parse_value('12'), 12)
+        self.assertEqual(_parse_value('0.25'), 0.25)
+        self.assertEqual(_parse_value('hann'), 'hann')
+        self.assertEqual(_parse_sweep('win=hann, hamming'), ('win', ['hann', 'hamming']))
+        self.assertEqual(_parse_sweep(' N =10:50:10'), ('N', [10, 20, 30, 40, 50]))
+        key, vals = _parse_sweep('F_SB=0.15:0.3:0.05')
+        self.assertEqual(key, 'F_SB')
+        np.testing.assert_allclose(vals, [0.15, 0.2, 0.25, 0.3])
+
+    def test_metrics(self):
+        """ order, pass band ripple and stop band attenuation of a Chebychev LP """
+        sos = sig.cheby1(6, 1., 0.2, output='sos')
+        fil_dict = {'rt': 'LP', 'N': 6, 'F_PB': 0.1, 'F_SB': 0.2, 'sos': sos,
+                    'ba': sig.sos2tf(sos)}
+        m = design_metrics(fil_dict, N_FFT=8192)
+        self.assertEqual(m['N'], 6)
+        self.assertAlmostEqual(m['A_PB_dB'], 1., places=2)
+        w, H = sig.sosfreqz(sos, worN=[0.4 * np.pi])
+        self.assertAlmostEqual(m['A_SB_dB'], -20 * np.log10(abs(H[0])), places=2)
+        # unknown response type
+        fil_dict['rt'] = 'DIFF'
+        m = design_metrics(fil_dict)
+        self.assertTrue(np.isnan(m['A_PB_dB']) and np.isnan(m['A_SB_dB']))
+
+    def test_run_sweep(self):
+        """ designs in the current process, results in order of the parameters """
+        base_specs = {'rt': 'LP', 'fo': 'man', 'F_C': 0.1, 'F_PB': 0.05, 'F_SB': 0.2}
+        res = list(run_sweep(base_specs, 'Butter', {'N': [2, 4, 6]},
+                             max_workers=1, chunksize=2))
+        self.assertEqual([r['idx'] for r in res], [0, 1, 2])
+        self.assertEqual([r['params'] for r in res], [{'N': 2}, {'N': 4}, {'N': 6}])
+        for r in res:
+            self.assertIsNone(r['err'])
+            self.assertEqual(r['N'], r['params']['N'])
+            np.testing.assert_array_almost_equal(r['sos'],
+                sig.butter(r['N'], 0.2, output='sos'))
+        A_SB = [r['A_SB_dB'] for r in res]
+        self.assertTrue(A_SB[0] < A_SB[1] < A_SB[2])
+        # failed designs return an error message
+        res = list(run_sweep(base_specs, 'Unknown', {'N': [2]}, max_workers=1))
+        self.assertTrue(res[0]['err'].startswith('ValueError'))
+
+#==============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#===========================================================================
+#  unittest for the change tracking filter dict in filterbroker.py
+#
+# (c) 2017 Christian Muenker
+#===========================================================================
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+if __name__ == "__main__":
+    import sys, os
+    __cwd__ = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(os.path.dirname(__cwd__)))
+
+import copy
+import pickle
+import unittest
+import numpy as np
+import scipy.signal as sig
+
+import pyfda.filterbroker as fb
+from pyfda.filterbroker import FilterDict, fil_default, is_affected
+from pyfda.pyfda_lib import fil_save
+
+
+class TestFilterDict(unittest.TestCase):
+
+    def setUp(self):
+        self.fil = FilterDict(fil_default, {'N':10, 'ba':([1, 1], [1, 0]), 'f_S':1})
+        self.fil.pop_changes()
+
+    def test_changes(self):
+        """ only keys with new values are recorded """
+        self.fil['N'] = 10
+        self.fil.update({'ba':([1, 1], [1, 0]), 'f_S':2})
+        self.fil['ba'] = (np.array([1, 2]), np.array([1, 0]))
+        self.assertEqual(self.fil.pop_changes(), {'ba', 'f_S'})
+        self.assertEqual(self.fil.pop_changes(), set())
+
+    def test_default_del(self):
+        """ creating keys with the default factory and deleting keys """
+        self.assertEqual(self.fil['new'], fil_default())
+        del self.fil['N']
+        self.fil.mark_changed('q_coeff')
+        self.assertEqual(self.fil.pop_changes(), {'new', 'N', 'q_coeff'})
+
+    def test_pickle(self):
+        """ filter dict can be pickled """
+        fil = pickle.loads(pickle.dumps(self.fil))
+        self.assertIsInstance(fil, FilterDict)
+        self.assertEqual(dict(fil), dict(self.fil))
+        self.assertIsInstance(fb.fil[0], FilterDict)
+
+    def test_lazy_convert(self):
+        """ zpk is only calculated on first access, follows changes of ba """
+        b = sig.firwin(21, 0.2)
+        fil_save(self.fil, b, 'ba', __name__)
+        self.assertEqual(self.fil.pending_keys(), {'zpk'})
+        self.assertEqual(self.fil['sos'], [])
+        self.assertTrue({'ba', 'zpk'} <= self.fil.pop_changes())
+        b2 = sig.firwin(11, 0.2)
+        a2 = np.r_[1, np.zeros(len(b2) - 1)]
+        self.fil['ba'] = [b2, a2]
+        np.testing.assert_array_equal(self.fil['zpk'][0], sig.tf2zpk(b2, a2)[0])
+        self.assertEqual(self.fil.pending_keys(), set())
+
+    def test_lazy_copy(self):
+        """ copies contain the calculated entries """
+        fil_save(self.fil, sig.butter(4, 0.2, output='sos'), 'sos', __name__)
+        self.assertEqual(self.fil.pending_keys(), {'zpk', 'ba'})
+        for d in (dict(self.fil), copy.deepcopy(self.fil)):
+            np.testing.assert_allclose(d['ba'][1], sig.butter(4, 0.2)[1])
+            self.assertEqual(len(d['zpk'][1]), 4)
+
+    def test_affected(self):
+        self.assertTrue(is_affected(('ba', 'sos'), {'sos', 'N'}))
+        self.assertFalse(is_affected(('ba', 'sos'), {'f_S'}))
+        self.assertTrue(is_affected(None, set()))
+        self.assertTrue(is_affected(('zpk',), None))
+
+#==============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
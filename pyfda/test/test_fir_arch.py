@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#===========================================================================
+#  unittest for the FIR architecture helpers in hdl_generation/fir_arch.py
+#
+# (c) 2017 Christian Muenker
+#===========================================================================
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+if __name__ == "__main__":
+    import sys, os
+    __cwd__ = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(os.path.dirname(__cwd__)))
+
+import unittest
+import numpy as np
+import scipy.signal as sig
+
+from pyfda.hdl_generation.fir_arch import (symmetry, fold_taps, csd_terms,
+                                           adder_tree, latency)
+from pyfda.hdl_generation.hdl_estimate import estimate_fir, estimate_iir
+from pyfda.fixpoint_sim import FixFIR, hdl_fir_q
+
+
+class TestFIRArch(unittest.TestCase):
+
+    def test_csd_terms(self):
+        """ shift-add terms reproduce the coefficients """
+        for c in range(-300, 301):
+            terms = csd_terms(c, 7)
+            self.assertEqual(sum(s << sh for sh, s in terms), c)
+            # no adjacent non-zero digits
+            shifts = sorted(sh for sh, _ in terms)
+            self.assertTrue(all(np.diff(shifts) > 1))
+        self.assertEqual(csd_terms(127, 7), [(0, -1), (7, 1)])
+
+    def test_fold_taps(self):
+        """ folded taps of (anti)symmetric filters give the same response """
+        x = np.random.RandomState(0).randint(-100, 100, 50)
+        for c in ([3, -5, 7, -5, 3], [3, -5, 0, 5, -3], [1, 2, 2, 1], [1, 2, 3]):
+            sym = symmetry(c)
+            taps = fold_taps(c, sym)
+            xd = np.array([np.r_[np.zeros(k, int), x[:len(x)-k]] for k in range(len(c))])
+            y = sum(ci * (xd[k1] + (sym * xd[k2] if k2 is not None else 0))
+                    for ci, k1, k2 in taps)
+            np.testing.assert_array_equal(y, np.convolve(x, c)[:len(x)])
+            self.assertEqual(len(taps), (len(c) + (sym > 0)) // 2 if sym else len(c))
+
+    def test_adder_tree(self):
+        """ adder tree uses n-1 adders, latency of the pipelined structure """
+        for n in range(1, 20):
+            levels = adder_tree(n)
+            self.assertEqual(sum(len(p) == 2 for l in levels for p in l), n - 1)
+            self.assertEqual(latency('tree', n), len(levels) + 2)
+        self.assertRaises(ValueError, latency, 'lattice', 3)
+
+    def test_hdl_fir_q(self):
+        """ bit-true model of the FIR hardware description """
+        W = 12
+        b = sig.remez(31, [0, 0.2, 0.3, 0.5], [1, 0])
+        x = np.random.RandomState(1).uniform(-1, 1, 500)
+        flt = FixFIR(b, **hdl_fir_q(W))
+        y = flt.process(x, to_float=False)
+        b_int = np.round(b * 2**(W-1)).astype(np.int64)
+        x_int = np.fix(x * 2**(W-1)).astype(np.int64)
+        acc = np.convolve(x_int, b_int)[:len(x)] >> (W-1)
+        np.testing.assert_array_equal(y, (acc + 2**(W-1)) % 2**W - 2**(W-1))
+
+
+class TestEstimate(unittest.TestCase):
+
+    def test_fir(self):
+        """ multipliers and adders of the FIR structures """
+        b = [3, -5, 0, 16, 7, 16, 0, -5, 3] # symmetric, zeros and powers of two
+        est = estimate_fir(b, 8, 'direct')
+        self.assertEqual((est['multipliers'], est['adders']), (3, 3 + 3))
+        est = estimate_fir(b, 8, 'direct', use_symmetry=False)
+        self.assertEqual((est['multipliers'], est['adders']), (5, 6))
+        est = estimate_fir(b, 8, 'transposed')
+        self.assertEqual((est['multipliers'], est['adders'], est['latency']), (3, 6, 1))
+        est = estimate_fir(b, 8, 'tree', csd=True) # 3 = 4-1, -5 = -4-1, 7 = 8-1
+        self.assertEqual((est['multipliers'], est['adders'], est['latency']), (0, 3 + 6, 4))
+        self.assertEqual(est['acc_bits_min'], 14) # sum(|b|) = 55 < 2**6
+        self.assertLessEqual(est['acc_bits_min'], est['acc_bits'])
+
+    def test_iir(self):
+        """ shared multiplier needs one multiplier and 7 clocks per section """
+        b, a = [[64, 128, 64], [64, 0, -64]], [[128, -100, 40], [128, 32, 20]]
+        est = estimate_iir(b, a, 8)
+        self.assertEqual((est['multipliers'], est['adders']), (2 + 1, 4 + 3))
+        self.assertEqual((est['latency'], est['clocks_per_sample']), (4, 1))
+        est = estimate_iir(b, a, 8, shared_multiplier=True)
+        self.assertEqual((est['multipliers'], est['adders']), (2, 2))
+        self.assertEqual((est['latency'], est['clocks_per_sample']), (14, 7))
+
+#==============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
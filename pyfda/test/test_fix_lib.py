@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#===========================================================================
+#  unittest for the vectorized fixpoint quantization Fixed.fix() in
+#  pyfda_fix_lib.py
+#
+# (c) 2017 Christian Muenker
+#===========================================================================
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+if __name__ == "__main__":
+    import sys, os
+    __cwd__ = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(os.path.dirname(__cwd__)))
+
+import unittest
+import numpy as np
+
+import pyfda.pyfda_fix_lib as fix
+from pyfda.pyfda_fix_lib import Fixed
+
+
+class TestFix(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(42)
+        # values within and outside of the range -1 ... 1, including the limits
+        self.y = np.r_[np.random.uniform(-3.3, 3.3, 997), -3, -2, -1, 1, 2, 3]
+
+    def _compare(self, q_obj, y, from_float=True, to_float=False):
+        """
+        Compare the array fast path with element-wise calls of fix(), which
+        use the scalar code path.
+        """
+        Q = Fixed(dict(q_obj))
+        yq = Q.fix(y, from_float=from_float, to_float=to_float)
+        Q_ref = Fixed(dict(q_obj))
+        yq_ref = [Q_ref.fix(v, from_float=from_float, to_float=to_float)
+                  for v in y.ravel()]
+        np.testing.assert_array_equal(yq.ravel(), yq_ref)
+        self.assertEqual(yq.shape, y.shape)
+        self.assertEqual((Q.N_over_neg, Q.N_over_pos), (Q_ref.N_over_neg, Q_ref.N_over_pos))
+        return Q
+
+    def test_modes(self):
+        """ all quantization and overflow modes give the same results """
+        for quant in ('floor', 'round', 'fix', 'ceil', 'rint', 'none'):
+            for ovfl in ('none', 'sat', 'wrap'):
+                for to_float in (False, True):
+                    q_obj = {'WI':0, 'WF':7, 'quant':quant, 'ovfl':ovfl}
+                    self._compare(q_obj, self.y, to_float=to_float)
+
+    def test_integer_input(self):
+        """ integer input with from_float = False """
+        y = np.arange(-300, 300).reshape(20, 30)
+        Q = self._compare({'WI':0, 'WF':7, 'ovfl':'wrap'}, y, from_float=False)
+        self.assertEqual(Q.N_over, 600 - 256)
+
+    def test_wrap(self):
+        """ two's complement wrap-around """
+        Q = Fixed({'WI':0, 'WF':3, 'quant':'floor', 'ovfl':'wrap'})
+        np.testing.assert_array_equal(Q.fix(np.array([1., 1.125, -1.125, -3, 2.])),
+                                      [-8, -7, 7, -8, 0])
+
+    def test_chunks(self):
+        """ results don't depend on the chunk size, 'out' is filled in place """
+        y = np.random.uniform(-2, 2, 10001)
+        Q = Fixed({'WI':1, 'WF':10, 'quant':'round', 'ovfl':'wrap'})
+        yq = Q.fix(y)
+        out = np.empty(y.shape, dtype=np.int64)
+        yq_chunks = Q._fix_array(y, True, False, out=out, chunk_size=1000)
+        self.assertIs(yq_chunks, out)
+        np.testing.assert_array_equal(yq, out)
+        self.assertRaises(ValueError, Q.fix, y, out=np.empty(5, dtype=np.int64))
+
+
+class TestFloat2Frmt(unittest.TestCase):
+
+    def test_array(self):
+        """ array formatting yields the same strings as scalar formatting """
+        np.random.seed(1)
+        y = np.r_[np.random.uniform(-1.2, 1.2, 200), 0, -1, 1, 0.5, -0.5, 0.7]
+        for frmt in ('dec', 'bin', 'hex', 'csd'):
+            for point in (False, True):
+                for WI, WF in ((0, 7), (2, 5), (3, 0), (4, 11)):
+                    Q = Fixed({'WI':WI, 'WF':WF, 'quant':'round', 'ovfl':'wrap',
+                               'frmt':frmt, 'point':point})
+                    y_str = Q.float2frmt(y.reshape(2, -1))
+                    self.assertEqual(y_str.shape, (2, len(y) // 2))
+                    self.assertEqual(y_str.ravel().tolist(),
+                                     [Q.float2frmt(v) for v in y])
+
+    def test_csd(self):
+        """ CSD strings represent the quantized values """
+        Q = Fixed({'WI':0, 'WF':7, 'quant':'round', 'ovfl':'sat', 'frmt':'csd',
+                   'point':True})
+        y = np.linspace(-1, 1, 257)
+        y_csd = Q.float2frmt(y)
+        np.testing.assert_array_equal([fix.csd2dec(c) for c in y_csd],
+                                      Q.fix(y) * Q.LSB)
+        self.assertEqual(fix.dec2csd(0.75, 3), '+.0-0')
+
+
+class TestFrmt2Float(unittest.TestCase):
+
+    def test_roundtrip(self):
+        """ batch parsing yields the same values as scalar parsing """
+        np.random.seed(3)
+        y = np.random.uniform(-1, 1, 300)
+        for frmt in ('dec', 'bin', 'hex', 'csd'):
+            for point in (False, True):
+                Q = Fixed({'WI':0, 'WF':11, 'quant':'round', 'ovfl':'sat',
+                           'frmt':frmt, 'point':point})
+                y_str = Q.float2frmt(y)
+                y_float, err = Q.frmt2float_array(y_str)
+                self.assertFalse(np.any(err))
+                np.testing.assert_array_equal(y_float,
+                                              [Q.frmt2float(v) for v in y_str])
+
+    def test_errors(self):
+        """ invalid strings are flagged in the error mask """
+        Q = Fixed({'WI':0, 'WF':7, 'quant':'round', 'ovfl':'sat', 'frmt':'hex',
+                   'point':False})
+        y_float, err = Q.frmt2float_array(['7f', 'zz', '1.2.3', '', ' 8 0',
+                                           '1' * 20, '0' * 30 + '7f'])
+        np.testing.assert_array_equal(err, [0, 1, 1, 1, 0, 1, 0])
+        np.testing.assert_array_equal(y_float[~err], [127/128., -1., 127/128.])
+        self.assertTrue(np.all(np.isnan(y_float[err])))
+        y_float, err = Q.frmt2float_array(['0.5', '1e-2', 'x'], frmt='float')
+        np.testing.assert_array_equal(err, [0, 0, 1])
+
+#==============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
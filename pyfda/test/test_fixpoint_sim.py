@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#===========================================================================
+#  unittest for the bit-true fixpoint filter simulation in fixpoint_sim.py
+#
+# (c) 2017 Christian Muenker
+#===========================================================================
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+if __name__ == "__main__":
+    import sys, os
+    __cwd__ = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(os.path.dirname(__cwd__)))
+
+import unittest
+import numpy as np
+import scipy.signal as sig
+
+from pyfda.pyfda_fix_lib import Fixed
+from pyfda.fixpoint_sim import (FixFIR, FixIIR, FixSOS, requant, quantize,
+                                hdl_df1_q, verify_sos)
+
+
+def df1_hdl_reference(b, a, x, W):
+    """
+    Sample by sample model of the equations in filter_iir_hdl: full precision
+    accumulator, output = yacc[2W:W-1].signed()
+    """
+    b0, b1, b2 = b
+    _, a1, a2 = a
+    x1 = x2 = y1 = y2 = 0
+    y = []
+    for xn in x:
+        yacc = b0*xn + b1*x1 + b2*x2 - a1*y1 - a2*y2
+        yn = ((yacc >> (W-1)) + (1 << W)) % (1 << (W+1)) - (1 << W)
+        x2, x1 = x1, xn
+        y2, y1 = y1, yn
+        y.append(yn)
+    return np.array(y)
+
+
+class TestFixpointSim(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(7)
+        self.x = np.random.uniform(-0.9, 0.9, 2000)
+
+    def test_requant(self):
+        """ integer requantization matches Fixed.fix() for all modes """
+        x = np.random.randint(-5000, 5000, 1000)
+        for quant in ('floor', 'round', 'fix', 'ceil', 'rint'):
+            for ovfl in ('none', 'sat', 'wrap'):
+                Q = Fixed({'WI':0, 'WF':5, 'quant':quant, 'ovfl':ovfl})
+                Q_ref = Fixed({'WI':0, 'WF':5, 'quant':quant, 'ovfl':ovfl})
+                np.testing.assert_array_equal(requant(x, 8, Q),
+                        Q_ref.fix(x * 2.**(5-8), from_float=False))
+                self.assertEqual(Q.N_over, Q_ref.N_over)
+
+    def test_hdl_df1(self):
+        """ DF-I section is bit-true to the equations of the HDL """
+        W = 16
+        b, a = sig.ellip(2, 0.5, 40, 0.2)
+        flt = FixIIR(b, a, **hdl_df1_q(W))
+        y = flt.process(self.x, to_float=False)
+        # coefficients as in FilterIIR._convert_coefficients()
+        max_int = 2**(W-1)
+        b_int = [int(v) for v in np.round(b * max_int)]
+        a_int = [int(v) for v in np.floor(a * max_int)]
+        x_int = [int(max_int * v) for v in self.x] # as in the testbench
+        np.testing.assert_array_equal(y, df1_hdl_reference(b_int, a_int, x_int, W))
+        np.testing.assert_array_equal(flt.b_int, b_int)
+
+    def test_blocks(self):
+        """ processing in blocks yields the same result as in one go """
+        sos = sig.ellip(6, 0.5, 50, 0.3, output='sos')
+        q = {'q_coeff':{'WI':1, 'WF':14, 'quant':'round', 'ovfl':'sat'},
+             'q_in':{'WI':0, 'WF':15}, 'q_out':{'WI':2, 'WF':15, 'quant':'round', 'ovfl':'sat'},
+             'q_mul':{'WI':2, 'WF':20, 'quant':'floor', 'ovfl':'wrap'},
+             'q_acc':{'WI':3, 'WF':20, 'quant':'floor', 'ovfl':'wrap'}}
+        flt = FixSOS(sos, **q)
+        y = flt.process(self.x)
+        flt.reset()
+        y_blocks = np.concatenate([flt.process(xb) for xb in np.split(self.x, [7, 500, 501])])
+        np.testing.assert_array_equal(y, y_blocks)
+        # quantization noise is small
+        self.assertLess(np.std(y - sig.sosfilt(sos, self.x)), 1e-3)
+
+    def test_fir(self):
+        """ FIR output matches sample-by-sample calculation """
+        b = sig.firwin(31, 0.2)
+        q_coeff = {'WI':0, 'WF':15, 'quant':'round', 'ovfl':'sat'}
+        q_out = {'WI':0, 'WF':12, 'quant':'round', 'ovfl':'sat'}
+        flt = FixFIR(b, q_coeff, {'WI':0, 'WF':15}, q_out,
+                     q_mul={'WI':0, 'WF':20, 'quant':'floor', 'ovfl':'wrap'})
+        y = flt.process(self.x, to_float=False)
+        x_int = quantize(self.x, Fixed({'WI':0, 'WF':15}))
+        b_int = flt.b_int
+        y_ref = []
+        for n in range(len(x_int)):
+            acc = sum(((int(b_int[k]) * int(x_int[n-k])) >> 10)
+                      for k in range(len(b_int)) if n - k >= 0)
+            y_ref.append(min(max(int(np.round(acc / 2.**8)), -2**12), 2**12 - 1))
+        np.testing.assert_array_equal(y, y_ref)
+
+    def test_overflow(self):
+        """ saturation of the output is counted """
+        flt = FixFIR([0.9, 0.9], {'WI':0, 'WF':15}, {'WI':0, 'WF':15},
+                     {'WI':0, 'WF':15, 'ovfl':'sat'})
+        y = flt.process(np.full(10, 0.9))
+        self.assertEqual(flt.overflows()['out'], 9)
+        self.assertEqual(y.max(), 1 - 2.**-15)
+        self.assertRaises(ValueError, FixFIR, [0.5], {'WI':0, 'WF':40},
+                          {'WI':0, 'WF':40}, {'WI':0, 'WF':15})
+
+    def test_verify_sos(self):
+        """ section by section verification in worker processes """
+        sos = sig.ellip(8, 0.5, 50, 0.3, output='sos')
+        q = hdl_df1_q(16)
+        res = verify_sos(sos, q, self.x, max_workers=2)
+        self.assertEqual([r['idx'] for r in res], list(range(len(sos))))
+        self.assertTrue(all(r['SNR_dB'] > 40 for r in res))
+        self.assertTrue(all(r['overflows']['out'] == 0 for r in res))
+        # same results in the current process
+        res_1 = verify_sos(sos, q, self.x, max_workers=1)
+        self.assertEqual([r['SNR_dB'] for r in res], [r['SNR_dB'] for r in res_1])
+        # first section is bit-true to FixIIR
+        flt = FixIIR(sos[0, :3], sos[0, 3:], **q)
+        np.testing.assert_array_equal(flt.b_q, res[0]['b_q'])
+
+#==============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
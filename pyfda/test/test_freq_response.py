@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#===========================================================================
+#  unittest for the shared frequency response in freq_response.py
+#
+# (c) 2017 Christian Muenker
+#===========================================================================
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+if __name__ == "__main__":
+    import sys, os
+    __cwd__ = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(os.path.dirname(__cwd__)))
+
+import unittest
+import numpy as np
+import scipy.signal as sig
+
+from pyfda.freq_response import FreqResponse, czt_poly
+
+
+class TestFreqResponse(unittest.TestCase):
+
+    def setUp(self):
+        self.ba = sig.cheby1(5, 1, 0.3)
+        self.fr = FreqResponse(size=2)
+
+    def test_values(self):
+        """ response, phase and group delay match scipy """
+        for whole in (True, False):
+            resp = self.fr.get(self.ba, N_FFT=256, whole=whole)
+            w, H = sig.freqz(self.ba[0], self.ba[1], worN=256, whole=whole)
+            np.testing.assert_array_almost_equal(resp.W, w)
+            np.testing.assert_array_almost_equal(resp.H, H)
+            np.testing.assert_array_almost_equal(resp.H_abs, abs(H))
+            np.testing.assert_array_almost_equal(resp.phi, np.unwrap(np.angle(H)))
+            w, gd = sig.group_delay(self.ba, w=256, whole=whole)
+            ok = abs(H) > 1e-6 # group delay is set to zero at zeros of H
+            np.testing.assert_array_almost_equal(resp.tau_g[ok], gd[ok], decimal=4)
+
+    def test_sos(self):
+        """ cascade evaluation is accurate for an order 60 elliptic bandstop """
+        z, p, k = sig.ellip(30, 0.1, 60, [0.2, 0.3], btype='bandstop', output='zpk')
+        sos = sig.zpk2sos(z, p, k)
+        resp = self.fr.get(sig.zpk2tf(z, p, k), N_FFT=1024, whole=False, sos=sos)
+        # reference: evaluate the product of the pole / zero terms
+        e = np.exp(1j * resp.W)[:, np.newaxis]
+        H = k * np.prod(e - z, axis=1) / np.prod(e - p, axis=1)
+        np.testing.assert_allclose(resp.H, H, rtol=1e-6, atol=1e-9)
+        # group delay: -d phi / dW
+        gd = -np.diff(resp.phi) / np.diff(resp.W)
+        pb = (resp.W[:-1] < 0.1 * np.pi) # smooth region in the first pass band
+        np.testing.assert_allclose(resp.tau_g[:-1][pb], gd[pb], rtol=1e-2)
+
+    def test_span(self):
+        """ chirp-Z evaluation of a zoomed frequency range """
+        b = sig.firwin(4001, 0.01)
+        W, P = czt_poly(b, 0.001, 0.05, 1000)
+        np.testing.assert_allclose(P, sig.freqz(b, 1, W)[1], atol=1e-12)
+        resp = self.fr.get(self.ba, N_FFT=500, span=(0.1, 0.8))
+        self.assertAlmostEqual(resp.W[-1], 0.8)
+        np.testing.assert_allclose(resp.H, sig.freqz(self.ba[0], self.ba[1], resp.W)[1])
+        np.testing.assert_allclose(resp.tau_g, sig.group_delay(self.ba, resp.W)[1])
+
+    def test_cache(self):
+        """ identical coefficients return the same read-only response """
+        resp = self.fr.get(self.ba, N_FFT=256)
+        self.assertIs(self.fr.get([np.array(self.ba[0]), list(self.ba[1])], 256), resp)
+        self.assertIsNot(self.fr.get(self.ba, N_FFT=256, whole=False), resp)
+        resp_v = self.fr.get(self.ba, N_FFT=256, verbose=True)
+        self.assertIsNot(resp_v, resp)
+        self.assertTrue(resp_v.verbose and not resp.verbose)
+        self.assertRaises(ValueError, resp.H_abs.__setitem__, 0, 1.)
+        self.fr.get(self.ba, N_FFT=512)
+        self.assertEqual(len(self.fr.responses), 2)
+
+#==============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
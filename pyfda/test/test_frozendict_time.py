@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#===========================================================================
+# FrozenDict in frozendict.py:
+# - unittest for lookups, hashing and immutability
+# - speed comparison of the lookup with the previous, set based lookup
+#   when run as a script:
+#
+#       python test_frozendict_time.py
+#
+# (c) 2017 Christian Muenker
+#===========================================================================
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+if __name__ == "__main__":
+    import sys, os
+    __cwd__ = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(os.path.dirname(__cwd__)))
+
+import copy
+import pickle
+import timeit
+import unittest
+
+from pyfda.frozendict import FrozenDict, freeze_hierarchical, _rebuild_class
+import pyfda.filterbroker as fb
+
+
+def getitem_set(fd, key):
+    """ previous implementation of FrozenDict.__getitem__ for comparison """
+    if key not in fd:
+        raise KeyError(key)
+    diff = frozenset.difference
+    item = diff(fd, diff(fd, {key}))
+    return set(item).pop()[1]
+
+
+class TestFrozenDict(unittest.TestCase):
+
+    def setUp(self):
+        self.d = {'x':3, 'y':4, 'z':{'a':[1, 2]}}
+        self.fd = freeze_hierarchical(copy.deepcopy(self.d))
+
+    def test_lookup(self):
+        self.assertEqual(self.fd['x'], 3)
+        self.assertEqual(self.fd['z']['a'], [1, 2])
+        self.assertEqual(self.fd.get('w', 5), 5)
+        self.assertRaises(KeyError, lambda: self.fd['w'])
+        self.assertEqual(sorted(self.fd.keys()), ['x', 'y', 'z'])
+        self.assertEqual(dict(self.fd.items())['y'], 4)
+        self.assertEqual(getitem_set(self.fd, 'y'), self.fd['y'])
+
+    def test_hash_eq(self):
+        f1 = FrozenDict(x=3, y=4)
+        f2 = FrozenDict({'y':4, 'x':3})
+        self.assertEqual(f1, f2)
+        self.assertEqual(hash(f1), hash(f2))
+        self.assertNotEqual(f1, FrozenDict(x=3, y=5))
+        self.assertEqual(f1, {'x':3, 'y':4})
+        self.assertRaises(TypeError, hash, FrozenDict(x=[]))
+
+    def test_immutable(self):
+        def set_item():
+            self.fd['x'] = 1
+        def set_attr():
+            self.fd._d = {}
+        self.assertRaises(TypeError, set_item)
+        self.assertRaises(AttributeError, set_attr)
+
+    def test_copy_pickle(self):
+        for fd in (self.fd.copy(), copy.deepcopy(self.fd),
+                   pickle.loads(pickle.dumps(self.fd))):
+            self.assertEqual(fd, self.fd)
+            self.assertEqual(fd['z']['a'], [1, 2])
+
+    def test_rebuild_py2(self):
+        """ class rebuild of the Python 2 branch with the slot '_d' """
+        class Python2(FrozenDict):
+            def has_key(self, key):
+                return key in self._d
+        FD = _rebuild_class(FrozenDict, Python2)
+        self.assertEqual(FD.__name__, 'FrozenDict')
+        self.assertEqual(FD.__bases__, (frozenset,))
+        fd = FD(x=3, y=4)
+        self.assertTrue(fd.has_key('x'))
+        self.assertEqual(fd['y'], 4)
+        self.assertEqual(fd, FrozenDict(x=3, y=4))
+        self.assertFalse(hasattr(fd, '__dict__'))
+        self.assertRaises(AttributeError, setattr, fd, '_d', {})
+
+#==============================================================================
+
+def benchmark(N=10000):
+    """ Print the time per lookup in the filter tree for both implementations """
+    tree = fb.fil_tree
+    path = ['LP', 'IIR', 'Cheby1', 'man', 'tspecs']
+    def lookup(getitem):
+        d = tree
+        for k in path:
+            d = getitem(d, k)
+        return d
+    t_set = timeit.timeit(lambda: lookup(getitem_set), number=N) / N
+    t_dict = timeit.timeit(lambda: lookup(FrozenDict.__getitem__), number=N) / N
+    print("fil_tree{0}: set based {1:.3e} s, hash table {2:.3e} s (x {3:.1f})"
+          .format(path, t_set, t_dict, t_set / t_dict))
+
+if __name__ == '__main__':
+    benchmark()
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#===========================================================================
+# Group delay calculation in pyfda_lib.grpdelay():
+# - unittest comparing the FFT based and the polyval based evaluation
+# - speed comparison of both methods when run as a script:
+#
+#       python test_grpdelay_time.py
+#
+# (c) 2017 Christian Muenker
+#===========================================================================
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+if __name__ == "__main__":
+    import sys, os
+    __cwd__ = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(os.path.dirname(__cwd__)))
+
+import timeit
+import unittest
+import numpy as np
+import scipy.signal as sig
+
+from pyfda.pyfda_lib import grpdelay
+
+
+class TestGrpdelay(unittest.TestCase):
+
+    def _compare(self, b, a, nfft, whole):
+        w1, gd1 = grpdelay(b, a, nfft, whole=whole, verbose=False, method='polyval')
+        w2, gd2 = grpdelay(b, a, nfft, whole=whole, verbose=False, method='fft')
+        np.testing.assert_array_equal(w1, w2)
+        # group delay is ill-conditioned where |H| is small, only compare the
+        # results where |H| > 1e-3 max(|H|)
+        H = abs(sig.freqz(b, a, w1)[1])
+        ok = H > 1e-3 * H.max()
+        np.testing.assert_allclose(gd1[ok], gd2[ok], rtol=1e-6, atol=1e-6)
+
+    def test_fir(self):
+        """ FIR filter longer than the frequency grid (folding) """
+        b = sig.firwin(4096, 0.2)
+        self._compare(b, 1, 2048, True)
+        self._compare(b, 1, 512, False)
+
+    def test_iir(self):
+        """ IIR filter, short polynomials """
+        b, a = sig.cheby1(6, 1, 0.3)
+        self._compare(b, a, 2048, True)
+        self._compare(b, a, 100, False)
+
+    def test_singular(self):
+        """ singularities are masked with both methods """
+        b = [1, 0, 0, 0, 1] # zeros on the unit circle at pi/4 + k pi/2
+        for method in ('polyval', 'fft'):
+            w, gd = grpdelay(b, 1, 16, whole=True, verbose=False, method=method)
+            self.assertTrue(np.all(gd[2::4] == 0))
+            self.assertTrue(np.all(gd[::4] == 2))
+
+    def test_auto(self):
+        """ FFT is not used when the grid doesn't match the FFT bins """
+        b = np.ones(100)
+        w1, gd1 = grpdelay(b, 1, 256, whole=True, verbose=False, fs=1.)
+        w2, gd2 = grpdelay(b, 1, 256, whole=True, verbose=False, fs=1., method='fft')
+        np.testing.assert_allclose(gd1, gd2)
+
+#==============================================================================
+def benchmark(N_avg=10):
+    """ Print the run times of both methods for various filter lengths """
+    print("{0:>6s} {1:>6s} {2:>12s} {3:>12s} {4:>8s}"
+          .format("L", "nfft", "polyval / s", "fft / s", "auto"))
+    for nfft in (512, 2048, 8192):
+        for L in (3, 5, 11, 21, 51, 256, 1024, 4096):
+            b = sig.firwin(L, 0.2)
+            t = [timeit.timeit(lambda: grpdelay(b, 1, nfft, whole=True,
+                    verbose=False, method=m), number=N_avg) / N_avg
+                 for m in ('polyval', 'fft')]
+            auto = 'fft' if L > np.log2(nfft) / 2 else 'polyval'
+            print("{0:6d} {1:6d} {2:12.3e} {3:12.3e} {4:>8s}"
+                  .format(L, nfft, t[0], t[1], auto))
+
+if __name__ == '__main__':
+    benchmark()
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#===========================================================================
+#  unittest for |H(z)| calculated from poles and zeros in pyfda_lib.py
+#
+# (c) 2017 Christian Muenker
+#===========================================================================
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+if __name__ == "__main__":
+    import sys, os
+    __cwd__ = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(os.path.dirname(__cwd__)))
+
+import unittest
+import numpy as np
+import scipy.signal as sig
+
+from pyfda.pyfda_lib import H_mag, H_mag_zpk, log_H_zpk
+
+
+class TestHMagZpk(unittest.TestCase):
+
+    def setUp(self):
+        self.zpk = sig.cheby1(6, 1, 0.3, output='zpk')
+        self.ba = sig.zpk2tf(*self.zpk)
+        x, y = np.meshgrid(np.linspace(-1.5, 1.5, 101), np.linspace(-1.5, 1.5, 101))
+        self.z = x + 1j * y
+
+    def test_lin_log(self):
+        """ same results as the polynomial form for linear and log. scale """
+        for log, top, bottom in [(False, 4, 0), (True, 20, -80)]:
+            H1 = H_mag(self.ba[0], self.ba[1], self.z, top, H_min=bottom, log=log)
+            H2 = H_mag_zpk(self.zpk, self.z, top, H_min=bottom, log=log)
+            np.testing.assert_allclose(H1, H2, atol=1e-9)
+
+    def test_chunks_f32(self):
+        """ chunking doesn't change the result, float32 is close """
+        log_H = log_H_zpk(self.zpk, self.z)
+        np.testing.assert_array_equal(log_H, log_H_zpk(self.zpk, self.z, chunk_size=1000))
+        log_H32 = log_H_zpk(self.zpk, self.z, dtype=np.float32)
+        self.assertEqual(log_H32.dtype, np.float32)
+        np.testing.assert_allclose(log_H32, log_H, atol=1e-4)
+
+    def test_singular(self):
+        """ zeros and poles of H(z) give -inf / +inf """
+        log_H = log_H_zpk(([1], [0.5], 1), np.array([1, 0.5, 0]))
+        self.assertEqual(log_H[0], -np.inf)
+        self.assertEqual(log_H[1], np.inf)
+        self.assertAlmostEqual(log_H[2], np.log10(2))
+
+#==============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
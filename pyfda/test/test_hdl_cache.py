@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#===========================================================================
+#  unittest for the cache of generated HDL files in hdl_generation/hdl_cache.py
+#
+# (c) 2017 Christian Muenker
+#===========================================================================
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+if __name__ == "__main__":
+    import sys, os
+    __cwd__ = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(os.path.dirname(__cwd__)))
+
+import os
+import io
+import shutil
+import tempfile
+import unittest
+
+from pyfda.hdl_generation.hdl_cache import (HDLCache, add_fingerprint,
+    read_fingerprint, is_stale, snapshot, changed_files)
+
+
+class TestHDLCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = HDLCache(size=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _write(self, name, txt):
+        path = os.path.join(self.dir, name)
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write(txt)
+        return path
+
+    def _read(self, path):
+        with io.open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_fingerprint(self):
+        """ fingerprint header in Verilog and VHDL files """
+        key = self.cache.fingerprint((3, -5, 3), (16, 0, 15), {'csd': True}, 'vhdl')
+        self.assertEqual(key, self.cache.fingerprint((3, -5, 3), (16, 0, 15),
+                                                     {'csd': True}, 'vhdl'))
+        self.assertNotEqual(key, self.cache.fingerprint((3, -5, 3), (16, 0, 15),
+                                                        {'csd': False}, 'vhdl'))
+        path_v = self._write('flt.v', "module flt;\nendmodule\n")
+        path_vhd = self._write('flt.vhd', "entity flt is\nend entity;\n")
+        path_txt = self._write('flt.txt', "log")
+        self.assertIsNone(read_fingerprint(path_v))
+        for path in (path_v, path_vhd, path_txt):
+            add_fingerprint(path, key)
+        self.assertTrue(self._read(path_v).startswith("// pyfda fingerprint: " + key))
+        self.assertTrue(self._read(path_vhd).startswith("-- pyfda fingerprint: " + key))
+        self.assertEqual(self._read(path_txt), "log")
+        self.assertFalse(is_stale(path_vhd, key))
+        self.assertTrue(is_stale(path_vhd, 'other'))
+
+    def test_restore(self):
+        """ generated files are restored, up to date files are not rewritten """
+        before = snapshot(self.dir)
+        self.assertFalse(self.cache.restore('k1', self.dir))
+        path = self._write('flt.v', "module flt;\nendmodule\n")
+        files = changed_files(self.dir, before)
+        self.assertEqual(files, [path])
+        add_fingerprint(path, 'k1')
+        self.cache.store('k1', files)
+        txt = self._read(path)
+
+        self._write('flt.v', "// pyfda fingerprint: k2\nmodule other;\n") # stale
+        self.assertTrue(self.cache.restore('k1', self.dir))
+        self.assertEqual(self._read(path), txt)
+        before = snapshot(self.dir)
+        self.assertTrue(self.cache.restore('k1', self.dir))
+        self.assertEqual(changed_files(self.dir, before), [])
+
+        # LRU: 'k1' is removed as the oldest entry
+        self.cache.store('k2', files)
+        self.cache.store('k3', files)
+        self.assertFalse(self.cache.restore('k1', self.dir))
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 2))
+
+#==============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
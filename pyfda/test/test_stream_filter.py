@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#===========================================================================
+#  unittest for the block-wise filtering in stream_filter.py
+#
+# (c) 2017 Christian Muenker
+#===========================================================================
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+if __name__ == "__main__":
+    import sys, os
+    __cwd__ = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(os.path.dirname(__cwd__)))
+
+import unittest
+import numpy as np
+import scipy.signal as sig
+
+from pyfda.stream_filter import StreamFilter, stream_filter, iter_blocks
+
+
+class TestStreamFilter(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        x = rng.randn(5003)
+        # float32 and complex input signals
+        self.signals = [x.astype(np.float32), x + 1j * rng.randn(len(x))]
+
+    def _compare(self, ref, **kwargs):
+        """ blocks of different lengths give the same result as one call """
+        for x in self.signals:
+            y_ref = ref(x)
+            for block_len in (1, 7, 100, 1024, 6000):
+                y = np.concatenate(list(stream_filter(iter_blocks(x, block_len),
+                                                      **kwargs)))
+                self.assertEqual(y.dtype, y_ref.dtype)
+                np.testing.assert_array_equal(y, y_ref)
+
+    def test_iir(self):
+        """ IIR filter in ba and sos format """
+        b, a = sig.ellip(6, 0.5, 50, 0.2)
+        self._compare(lambda x: sig.lfilter(b, a, x), ba=(b, a))
+        sos = sig.ellip(12, 0.5, 60, 0.2, output='sos')
+        self._compare(lambda x: sig.sosfilt(sos, x), sos=sos)
+
+    def test_fir(self):
+        """ FIR filters, scipy filters them with np.convolve """
+        b = sig.remez(101, [0, 0.2, 0.3, 0.5], [1, 0])
+        self._compare(lambda x: sig.lfilter(b, 2., x), ba=(b, 2.))
+        self._compare(lambda x: sig.lfilter([0.5], [1], x), ba=([0.5], [1]))
+
+    def test_state(self):
+        """ multi-channel blocks, empty blocks and reset """
+        x = self.signals[0].reshape(1, -1).repeat(2, axis=0)
+        for kwargs in ({'ba': sig.butter(3, 0.1)}, {'ba': ([1, 2, 1], [4])},
+                       {'sos': sig.butter(3, 0.1, output='sos')}):
+            flt = StreamFilter(axis=1, **kwargs)
+            y = np.concatenate([flt.process(x[:, :100]), flt.process(x[:, 100:100]),
+                                flt.process(x[:, 100:])], axis=1)
+            self.assertEqual(flt.n_samples, x.shape[1])
+            flt.reset()
+            np.testing.assert_array_equal(flt.process(x), y)
+        self.assertRaises(ValueError, StreamFilter)
+
+#==============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,74 +1,96 @@
 #!/usr/bin/env python
 # -*- coding: iso-8859-15 -*-
 #===========================================================================
-# Speed comparison for unique_roots from scipy.signal against
-# new implementation 
+# unique_roots in pyfda_lib:
+# - unittest comparing the KD-tree based implementation against the previous
+#   O(n^2) implementation (unique_roots_loop below) for complex roots
+# - speed comparison of both implementations and of
+#   scipy.signal.unique_roots when run as a script:
+#
+#       python test_uniqueroots_time.py
 #
 # (c) 2015 Christian Muenker
 #===========================================================================
-from __future__ import division, print_function, unicode_literals # v3line15
+from __future__ import (division, print_function, unicode_literals,
+                        absolute_import)
+if __name__ == "__main__":
+    import sys, os
+    __cwd__ = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(os.path.dirname(__cwd__)))
 
+import timeit
+import unittest
 import numpy as np
 import numpy.random as rnd
+from numpy import ones
 
 import scipy.signal as sig
 
-import time
-if __name__ == "__main__":
-    import sys, os
-    __cwd__ = os.path.dirname(os.path.abspath(__file__))
-    sys.path.append(os.path.join('..',os.path.dirname(__cwd__)))
+from pyfda.pyfda_lib import unique_roots
 
-import pyfda_lib as dsp
-#import my_dsp_lib_v6a as dsp
 
-## scalar inputs - IndexError with scipy implementation
-#vals = 1 # real root
-#vals = 1j # imag. root
-#vals = 1j + 1  # complex root
+def unique_roots_loop(p, tol=1e-3, rtype='min', rdist='euclidian'):
+    """
+    Previous implementation of unique_roots for complex roots: Combine the
+    first root with all roots within the tolerance and delete them, repeat
+    until no roots are left - O(n^2).
+    """
+    comproot = {'min':np.min, 'max':np.max, 'avg':np.mean, 'median':np.median}[rtype]
+    if rdist in ['euclid', 'euclidian']:
+        dist_roots = lambda a, b: np.abs(a - b)
+    else:
+        dist_roots = lambda a, b: np.abs(a.real - b.real) + np.abs(a.imag - b.imag)
+    p = np.atleast_1d(p)
+    pout = p[np.isnan(p)].tolist()
+    mult = len(pout) * [1]
+    p = p[~np.isnan(p)]
+    while len(p):
+        tolarr = np.less(dist_roots(p[0], p), tol)
+        mult.append(np.sum(tolarr))
+        pout.append(comproot(p[tolarr]))
+        p = p[~tolarr]
+    return np.array(pout), np.array(mult)
 
-## multiple & single real roots 
-#vals = np.convolve(ones(13),ones(13)) # 12 double, one single real root
-#vals = np.convolve(ones(1000),ones(1000))
-#vals = [1,2,-1] # different unique real roots
+# Test cases {name: roots}, the roots of long FIR filters are the typical
+# use case in the P/Z plot:
+ROOTS = {
+    'random (1000)': rnd.RandomState(0).randn(1000) + 1j * rnd.RandomState(1).randn(1000),
+    'FIR, L = 1001': np.roots(sig.firwin(1001, 0.2)),
+    '500 double + 400 single': np.roots(np.convolve(ones(500), ones(100))),
+    'mult. 5 at j': ones(5) * 1j,
+    }
 
-## multiple & single imag. roots on the unit circle
-vals =[1j, 1j]
-vals = rnd.randn(1000)
-vals = rnd.randn(100) + 1j * rnd.randn(100)
-#vals = ones(5) * 1j # root at j with multiplicity 5
-#vals = np.append(vals, ones(5))
-#vals = ones(5)
-#np.sort_complex()
-#vals = np.roots(np.convolve(ones(5),ones(5))) # 4 double complex roots
-#vals = np.roots(np.convolve(ones(500),ones(100))) # 100 double and 400 single complex roots,
-#vals = np.roots(np.convolve(ones(500),ones(500))) # 500 double complex roots
 
-#vals = np.roots(np.convolve(ones(5),ones(7))) # 4 double complex roots
+class TestUniqueRootsLoop(unittest.TestCase):
 
-## tests with nans 
-#vals = list(ones(5) * 1j); vals.append(np.nan); vals.append(np.nan)
-#vals = []
-#print(vals)
+    def test_compare(self):
+        """ same results as the previous implementation """
+        rs = rnd.RandomState(42)
+        # clusters of close roots plus single roots:
+        clustered = np.repeat(rs.randn(50) + 1j * rs.randn(50), 3) \
+            + 5e-4 * (rs.randn(150) + 1j * rs.randn(150))
+        cases = list(ROOTS.values()) + [clustered,
+                np.concatenate((clustered, [np.nan, np.nan]))]
+        for p in cases:
+            for rtype in ('min', 'max', 'avg', 'median'):
+                for rdist in ('euclid', 'manhattan'):
+                    u1, m1 = unique_roots_loop(p, rtype=rtype, rdist=rdist)
+                    u2, m2 = unique_roots(p, rtype=rtype, rdist=rdist)
+                    np.testing.assert_array_equal(m1, m2)
+                    np.testing.assert_array_equal(u1, u2)
 
-Navg = 1000
-rtype = 'min'
-print('============ dsp.unique_roots() ================================')
-t1 = time.clock()
-for i in range(Navg):
-    roots, mult = dsp.unique_roots(vals, rtype = rtype, rdist='manhattan')
-t2 = time.clock()
-T_dsp = (t2 - t1)/Navg
-print (mult)
+#==============================================================================
 
-print('============ signal.unique_roots() =============================')
-t1 = time.clock()
-for i in range(Navg):
-    roots, mult = sig.unique_roots(vals, rtype = rtype)
-t2 = time.clock()
-T_sig = (t2 - t1)/Navg
-print (mult)
+def benchmark(N_avg=3):
+    """ Print the run times of the implementations for the test cases """
+    print("{0:>26s} {1:>12s} {2:>12s} {3:>12s}".format("roots", "KD-tree / s",
+          "loop / s", "scipy / s"))
+    for name in sorted(ROOTS):
+        p = ROOTS[name]
+        t = [timeit.timeit(lambda: f(p, rtype='min'), number=N_avg) / N_avg
+             for f in (unique_roots, unique_roots_loop, sig.unique_roots)]
+        print("{0:>26s} {1:12.3e} {2:12.3e} {3:12.3e}".format(name, *t))
 
-print("T_dsp = ",T_dsp, " s")
-print("T_sig = ",T_sig, " s")
-print("T_dsp / T_sig = ", T_dsp / T_sig)
+if __name__ == '__main__':
+    benchmark()
+    unittest.main()